@@ -1,5 +1,8 @@
 from pathlib import Path
+import argparse
 import csv
+import datetime
+import sqlite3
 import sys
 
 
@@ -27,7 +30,7 @@ def write_rows(path: Path, header, rows):
 			writer.writerow(r)
 
 
-def unify_by_key(files, key_column, out_path: Path):
+def unify_by_key(files, key_column, out_path: Path = None):
 	seen = {}
 	header_union = None
 	for p in files:
@@ -47,11 +50,13 @@ def unify_by_key(files, key_column, out_path: Path):
 	if header_union is None:
 		header_union = [key_column]
 	out_rows = list(seen.values())
-	write_rows(out_path, header_union, out_rows)
-	print(f"Wrote {len(out_rows)} rows to {out_path}")
+	if out_path is not None:
+		write_rows(out_path, header_union, out_rows)
+		print(f"Wrote {len(out_rows)} rows to {out_path}")
+	return header_union, out_rows
 
 
-def unify_by_row(files, out_path: Path):
+def unify_by_row(files, out_path: Path = None):
 	header_union = None
 	seen = set()
 	out_rows = []
@@ -76,12 +81,171 @@ def unify_by_row(files, out_path: Path):
 				out_rows.append(normalized)
 	if header_union is None:
 		header_union = []
-	write_rows(out_path, header_union, out_rows)
-	print(f"Wrote {len(out_rows)} rows to {out_path}")
+	if out_path is not None:
+		write_rows(out_path, header_union, out_rows)
+		print(f"Wrote {len(out_rows)} rows to {out_path}")
+	return header_union, out_rows
 
 
-def main():
-	dirs = find_facultad_dirs(ROOT)
+# Unified tables from the SQLite backend: (table, output file, SQL query)
+SQL_UNIFIED = [
+	('Asignaturas', 'unified_Asignaturas.csv',
+	 'SELECT "Codigo de asignatura", "Nombre de asignatura", "Numero de creditos" FROM "Asignaturas" '
+	 'WHERE rowid IN (SELECT MIN(rowid) FROM "Asignaturas" WHERE TRIM("Codigo de asignatura") != \'\' '
+	 'GROUP BY TRIM("Codigo de asignatura")) ORDER BY rowid'),
+	('AsignaturasCarrera', 'unified_AsignaturasCarrera.csv',
+	 'SELECT DISTINCT "Codigo de asignatura", "Nombre de asignatura", "Carrera", "Tipologia de asignatura" '
+	 'FROM "AsignaturasCarrera" ORDER BY rowid'),
+	('Horarios', 'unified_Horarios.csv',
+	 'SELECT DISTINCT "Codigo de asignatura", "Nombre de asignatura", "Grupo", "Profesor", "Dia", '
+	 '"Hora inicio", "Hora fin", "Salon" FROM "Horarios" ORDER BY rowid'),
+	('Prerrequisitos', 'unified_Prerrequisitos.csv',
+	 'SELECT DISTINCT "Codigo asignatura", "Nombre asignatura", "Carrera", "Prerrequisito", '
+	 '"Grupo prerrequisito" FROM "Prerrequisitos" ORDER BY rowid'),
+]
+
+
+def unify_from_db(db_path: Path, root: Path = ROOT, write_csv=True):
+	tables = {}
+	conn = sqlite3.connect(str(db_path))
+	try:
+		for table, out_name, query in SQL_UNIFIED:
+			print(f'\nUnifying {table} from {db_path.name}...')
+			cur = conn.execute(query)
+			header = [d[0] for d in cur.description]
+			rows = [dict(zip(header, r)) for r in cur]
+			if write_csv:
+				write_rows(root / out_name, header, rows)
+				print(f"Wrote {len(rows)} rows to {root / out_name}")
+			tables[table] = (header, rows)
+	finally:
+		conn.close()
+	return tables
+
+
+# Columnar output (optional, needs pyarrow): column types of the unified tables.
+# Columns not listed here (e.g. extra columns of old files) are kept as strings.
+FORMATS = ('csv', 'parquet', 'feather')
+COLUMNAR_EXT = {'parquet': '.parquet', 'feather': '.feather'}
+COLUMN_TYPES = {
+	'Asignaturas': {'Numero de creditos': 'int'},
+	'AsignaturasCarrera': {'Carrera': 'category', 'Tipologia de asignatura': 'category'},
+	'Horarios': {'Dia': 'category', 'Hora inicio': 'time', 'Hora fin': 'time'},
+	'Prerrequisitos': {'Carrera': 'category', 'Grupo prerrequisito': 'int'},
+}
+
+
+def _import_pyarrow():
+	try:
+		import pyarrow
+	except ImportError:
+		raise ImportError('pyarrow is required for the parquet/feather formats (pip install pyarrow)') from None
+	return pyarrow
+
+
+def parse_int(value):
+	value = '' if value is None else str(value).strip()
+	try:
+		return int(value)
+	except ValueError:
+		return None
+
+
+def parse_hora(value):
+	# 'HH:MM' or 'HH:MM:SS' -> datetime.time (None if empty or malformed)
+	parts = ('' if value is None else str(value)).strip().split(':')
+	try:
+		return datetime.time(*(int(p) for p in parts))
+	except (TypeError, ValueError):
+		return None
+
+
+def to_arrow_table(table, header, rows):
+	pa = _import_pyarrow()
+	types = COLUMN_TYPES.get(table, {})
+	arrays = []
+	for col in header:
+		values = [r.get(col) for r in rows]
+		kind = types.get(col)
+		if kind == 'int':
+			arrays.append(pa.array([parse_int(v) for v in values], type=pa.int16()))
+		elif kind == 'time':
+			arrays.append(pa.array([parse_hora(v) for v in values], type=pa.time32('s')))
+		elif kind == 'category':
+			arrays.append(pa.array(['' if v is None else v for v in values], type=pa.string()).dictionary_encode())
+		else:
+			arrays.append(pa.array(['' if v is None else v for v in values], type=pa.string()))
+	return pa.Table.from_arrays(arrays, names=list(header))
+
+
+def write_columnar(root: Path, tables, fmt):
+	"""Writes unified_<table>.parquet / .feather for every (header, rows) table"""
+	_import_pyarrow()
+	for table, (header, rows) in tables.items():
+		out_path = root / f'unified_{table}{COLUMNAR_EXT[fmt]}'
+		arrow_table = to_arrow_table(table, header, rows)
+		if fmt == 'parquet':
+			import pyarrow.parquet as pq
+			pq.write_table(arrow_table, str(out_path), compression='zstd')
+		else:
+			import pyarrow.feather as feather
+			feather.write_feather(arrow_table, str(out_path), compression='zstd')
+		print(f"Wrote {arrow_table.num_rows} rows to {out_path}")
+
+
+def read_unified(table, root=ROOT, fmt=None, columns=None, filters=None):
+	"""
+	Loads a unified table as a pandas DataFrame, from unified_<table>.parquet,
+	.feather or .csv (the first one found, or the given fmt). The columnar formats
+	keep their types: int créditos, datetime.time hours and categorical Dia/Tipología.
+	`filters` (parquet only) is pushed down to the reader, e.g. [('Dia', '=', 'LUNES')].
+
+	Example (from the repository root):
+		from Data.unifier import read_unified
+		lunes = read_unified('Horarios', filters=[('Dia', '=', 'LUNES')])
+	"""
+	root = Path(root)
+	if fmt is None:
+		fmt = next((f for f in ('parquet', 'feather') if (root / f'unified_{table}{COLUMNAR_EXT[f]}').exists()), 'csv')
+	if filters and fmt != 'parquet':
+		raise ValueError('filters are only supported for the parquet format')
+	if fmt == 'csv':
+		import pandas as pd
+		return pd.read_csv(root / f'unified_{table}.csv', dtype=str, keep_default_na=False, usecols=columns)
+	_import_pyarrow()
+	path = str(root / f'unified_{table}{COLUMNAR_EXT[fmt]}')
+	if fmt == 'parquet':
+		import pyarrow.parquet as pq
+		return pq.read_table(path, columns=columns, filters=filters).to_pandas()
+	import pyarrow.feather as feather
+	return feather.read_table(path, columns=columns).to_pandas()
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Unify the Facultad_* data into unified_*.csv')
+	parser.add_argument('--db', default=None, help='Unify from the SQLite backend instead of the CSV folders')
+	parser.add_argument('--root', default=None, help='Folder with the Facultad_* folders and unified outputs (default: Data/)')
+	parser.add_argument('--format', nargs='+', choices=FORMATS, default=['csv'], dest='formats',
+						help='Output formats: csv and/or the typed columnar parquet/feather (need pyarrow)')
+	args = parser.parse_args(argv)
+	root = Path(args.root).resolve() if args.root else ROOT
+	write_csv = 'csv' in args.formats
+	columnar = [f for f in args.formats if f != 'csv']
+	if columnar:
+		# fail before unifying if pyarrow is missing
+		_import_pyarrow()
+
+	if args.db:
+		db_path = Path(args.db)
+		if not db_path.exists():
+			raise FileNotFoundError(f"database not found {db_path}")
+		tables = unify_from_db(db_path, root, write_csv)
+		for fmt in columnar:
+			write_columnar(root, tables, fmt)
+		print('\nDone.')
+		return
+
+	dirs = find_facultad_dirs(root)
 	print(f"Found {len(dirs)} Facultad_ directories: {[d.name for d in dirs]}")
 
 	# Prepare file lists
@@ -90,27 +254,31 @@ def main():
 	horarios_files = [d / 'Horarios.csv' for d in dirs]
 	prereq_files = [d / 'Prerrequisitos.csv' for d in dirs]
 
-	# Outputs
-	out_asign = ROOT / 'unified_Asignaturas.csv'
-	out_asig_carr = ROOT / 'unified_AsignaturasCarrera.csv'
-	out_hor = ROOT / 'unified_Horarios.csv'
-	out_pr = ROOT / 'unified_Prerrequisitos.csv'
+	# Outputs (CSV only if requested)
+	out_asign = root / 'unified_Asignaturas.csv' if write_csv else None
+	out_asig_carr = root / 'unified_AsignaturasCarrera.csv' if write_csv else None
+	out_hor = root / 'unified_Horarios.csv' if write_csv else None
+	out_pr = root / 'unified_Prerrequisitos.csv' if write_csv else None
+	tables = {}
 
 	# 1: Asignaturas - dedupe por Codigo de asignatura
 	print('\nUnifying Asignaturas by Codigo de asignatura...')
-	unify_by_key(asignaturas_files, 'Codigo de asignatura', out_asign)
+	tables['Asignaturas'] = unify_by_key(asignaturas_files, 'Codigo de asignatura', out_asign)
 
 	# 2: AsignaturasCarrera - dedupe por fila completa
 	print('\nUnifying AsignaturasCarrera by full row...')
-	unify_by_row(asign_carrera_files, out_asig_carr)
+	tables['AsignaturasCarrera'] = unify_by_row(asign_carrera_files, out_asig_carr)
 
 	# 3: Horarios - dedupe por fila completa
 	print('\nUnifying Horarios by full row...')
-	unify_by_row(horarios_files, out_hor)
+	tables['Horarios'] = unify_by_row(horarios_files, out_hor)
 
 	# 4: Prerrequisitos - dedupe por fila completa
 	print('\nUnifying Prerrequisitos by full row...')
-	unify_by_row(prereq_files, out_pr)
+	tables['Prerrequisitos'] = unify_by_row(prereq_files, out_pr)
+
+	for fmt in columnar:
+		write_columnar(root, tables, fmt)
 
 	print('\nDone.')
 
@@ -0,0 +1,491 @@
+"""
+Benchmarks del pipeline scrape -> write -> unify.
+
+Etapas:
+ - parser:  extracción offline (src/parser.py) sobre páginas de detalle guardadas
+ - writer:  dicts `info` sintéticos a través de CentralWriter hasta los CSV
+ - unifier: Data/unifier.py sobre carpetas Facultad_* generadas de 1k/10k/100k filas
+ - ipc:     mensajes/s de N procesos productores hacia la cola del writer: cola del
+            Manager, multiprocessing.Queue directa y directa con lotes (src/ipc.py)
+ - engines: asignaturas/s del cliente HTTP sin navegador (src/http_engine.py) y de
+            su variante con K vistas en hilos (src/async_engine.py) contra el
+            catálogo local levantado en un hilo
+
+Cada etapa se ejecuta en un proceso nuevo para medir su RSS máximo por separado.
+El resultado se emite como JSON (stdout o --out) para comparar ejecuciones.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.run
+    python -m benchmarks.run --stages parser writer --out bench.json
+    python -m benchmarks.run --pages carpeta_con_html --sizes 1000 10000
+    python -m benchmarks.run --stages ipc --ipc-producers 6 --ipc-messages 2000
+    python -m benchmarks.run --stages engines --engine-units 6 --engine-latency-ms 50
+"""
+import argparse
+import contextlib
+import csv
+import glob
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def peak_rss_mb():
+    """RSS máximo del proceso actual en MB (None si la plataforma no lo expone)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    return round(rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024, 1)
+
+
+def percentiles(samples):
+    """p50/p90/p99/max en milisegundos"""
+    if not samples:
+        return {}
+    ms = sorted(s * 1000 for s in samples)
+    if len(ms) == 1:
+        q = [ms[0]] * 99
+    else:
+        q = statistics.quantiles(ms, n=100, method='inclusive')
+    return {'p50_ms': round(q[49], 3), 'p90_ms': round(q[89], 3), 'p99_ms': round(q[98], 3),
+            'max_ms': round(ms[-1], 3), 'n': len(ms)}
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silencia los print de los módulos medidos"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def info_from_catalogo(catalogo, codigo, carrera):
+    """Dict `info` con la forma que produce el scraper, a partir del catálogo del stand-in"""
+    a = catalogo['asignaturas'][codigo]
+    return {
+        'codigo': a['codigo'],
+        'nombre': a['nombre'],
+        'creditos': str(a['creditos']),
+        'carrera': carrera,
+        'tipologia': 'DISCIPLINAR OBLIGATORIA',
+        'grupos': [dict(g) for g in a['grupos']],
+        'prerrequisitos': [
+            {'Codigo asignatura': a['codigo'], 'Nombre asignatura': a['nombre'], 'Carrera': carrera,
+             'Prerrequisito': f"{c} {catalogo['asignaturas'].get(c, {}).get('nombre', '')}",
+             'Grupo prerrequisito': str(n)}
+            for n, panel in enumerate(a['prerrequisitos'], 1) for c in panel['asignaturas']
+        ],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Etapas
+# ---------------------------------------------------------------------------
+
+def bench_parser(args):
+    from src.parser import parse_asignatura_html
+    from src.standin import build_catalogo, dump_pages
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pages_dir = args.pages
+        if not pages_dir:
+            pages_dir = os.path.join(tmp, 'pages')
+            with quiet():
+                dump_pages(build_catalogo(seed=args.seed), pages_dir)
+        paths = sorted(glob.glob(os.path.join(pages_dir, '*.html')))
+        pages = []
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                pages.append(f.read())
+
+    latencias = []
+    grupos = 0
+    start = time.perf_counter()
+    for page in pages:
+        t0 = time.perf_counter()
+        info = parse_asignatura_html(page)
+        latencias.append(time.perf_counter() - t0)
+        grupos += len(info['grupos'])
+    total = time.perf_counter() - start
+    return {
+        'pages': len(pages),
+        'grupos': grupos,
+        'seconds': round(total, 4),
+        'subjects_per_sec': round(len(pages) / total, 1) if total else None,
+        'latency': percentiles(latencias),
+    }
+
+
+class _TimedWriter:
+    """Envuelve CentralWriter.flush para registrar la latencia de cada escritura"""
+
+    @staticmethod
+    def build(q, **kwargs):
+        from src.writer import CentralWriter
+
+        class TimedWriter(CentralWriter):
+            flush_times = []
+
+            def flush(self, *a, **kw):
+                t0 = time.perf_counter()
+                try:
+                    return super().flush(*a, **kw)
+                finally:
+                    self.flush_times.append(time.perf_counter() - t0)
+
+        TimedWriter.flush_times = []
+        return TimedWriter(q, **kwargs)
+
+
+def bench_writer(args):
+    from src.standin import build_catalogo
+    from src.utils import Facultades_Bot
+
+    catalogo = build_catalogo(seed=args.seed, asignaturas_por_carrera=args.writer_subjects_per_carrera)
+    mensajes = []
+    for cfg in Facultades_Bot:
+        out_dir = cfg['output_dir']
+        for carrera in cfg['carreras']:
+            for filas in catalogo['carreras'][carrera].values():
+                for fila in filas:
+                    mensajes.append((out_dir, info_from_catalogo(catalogo, fila['codigo'], carrera)))
+    mensajes = mensajes[:args.writer_messages] if args.writer_messages else mensajes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        q = queue.Queue()
+        filas = 0
+        for out_dir, info in mensajes:
+            q.put({'type': 'asignatura', 'info': info, 'output_dir': os.path.join(tmp, out_dir)})
+            filas += 2 + sum(len(g['horarios']) for g in info['grupos']) + len(info['prerrequisitos'])
+        q.put({'type': 'shutdown'})
+        kwargs = dict(args.writer_kwargs)
+        if args.writer_journal:
+            kwargs['journal_path'] = os.path.join(tmp, '.writer-journal.jsonl')
+        writer = _TimedWriter.build(q, **kwargs)
+        start = time.perf_counter()
+        with quiet():
+            writer.run()
+        total = time.perf_counter() - start
+        escritas = 0
+        for path in glob.glob(os.path.join(tmp, '*', '*.csv')):
+            with open(path, encoding='utf-8') as f:
+                escritas += max(0, sum(1 for _ in f) - 1)
+    return {
+        'messages': len(mensajes),
+        'rows_in': filas,
+        'rows_written': escritas,
+        'seconds': round(total, 4),
+        'subjects_per_sec': round(len(mensajes) / total, 1) if total else None,
+        'rows_per_sec': round(filas / total, 1) if total else None,
+        'flush_latency': percentiles(writer.flush_times),
+    }
+
+
+def _load_unifier():
+    spec = importlib.util.spec_from_file_location('unifier', os.path.join(ROOT, 'Data', 'unifier.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate_facultades(root, rows, n_facultades=5, seed=2024):
+    """Genera carpetas Facultad_* con `rows` filas de Horarios en total (y tablas proporcionales)"""
+    from src.writer import TABLES
+    rng = random.Random(seed)
+    por_facultad = max(1, rows // n_facultades)
+    dias = ['LUNES', 'MARTES', 'MIÉRCOLES', 'JUEVES', 'VIERNES']
+    for f in range(n_facultades):
+        folder = os.path.join(root, f"Facultad_Bench{f}")
+        os.makedirs(folder, exist_ok=True)
+        n_asig = max(1, por_facultad // 8)
+        # ~20% de las asignaturas se repiten entre facultades, como las básicas compartidas
+        codigos = [str(1000000 + (i if rng.random() < 0.2 else f * 100000 + i)) for i in range(n_asig)]
+        tablas = {
+            'Asignaturas': [[c, f"ASIGNATURA {c}", str(rng.randint(2, 5))] for c in codigos],
+            'AsignaturasCarrera': [[c, f"ASIGNATURA {c}", f"35{f:02d} CARRERA {f}", 'DISCIPLINAR OBLIGATORIA']
+                                   for c in codigos],
+            'Horarios': [],
+            'Prerrequisitos': [[c, f"ASIGNATURA {c}", f"35{f:02d} CARRERA {f}", f"{rng.choice(codigos)} PREVIA",
+                                '1', rng.choice(['todas', 'una'])]
+                               for c in codigos[: n_asig // 2]],
+        }
+        for i in range(por_facultad):
+            c = codigos[i % n_asig]
+            h = rng.choice([6, 8, 10, 12, 14, 16])
+            tablas['Horarios'].append([c, f"ASIGNATURA {c}", str(i // n_asig + 1), 'PROFESOR', rng.choice(dias),
+                                       f"{h:02d}:00", f"{h + 2:02d}:00", f"{rng.randint(11, 46)}-{rng.randint(101, 420)}"])
+        for name, filas in tablas.items():
+            with open(os.path.join(folder, f"{name}.csv"), 'w', newline='', encoding='utf-8') as fh:
+                w = csv.writer(fh, lineterminator='\n')
+                w.writerow(TABLES[name][0])
+                w.writerows(filas)
+
+
+def bench_unifier(args):
+    unifier = _load_unifier()
+    resultados = {}
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_facultades(tmp, size, seed=args.seed)
+            start = time.perf_counter()
+            with quiet():
+                unifier.main(['--root', tmp, '--format', *args.unifier_formats])
+            total = time.perf_counter() - start
+            out_rows = 0
+            for path in glob.glob(os.path.join(tmp, 'unified_*.csv')):
+                with open(path, encoding='utf-8') as f:
+                    out_rows += max(0, sum(1 for _ in f) - 1)
+            out_bytes = {fmt: sum(os.path.getsize(p) for p in glob.glob(os.path.join(tmp, f'unified_*.{fmt}')))
+                         for fmt in args.unifier_formats}
+        resultados[str(size)] = {
+            'horarios_rows': size,
+            'unified_rows': out_rows,
+            'output_bytes': out_bytes,
+            'seconds': round(total, 4),
+            'rows_per_sec': round(size / total, 1) if total else None,
+        }
+    return resultados
+
+
+def _ipc_producer(sender, n, seed, ready, start):
+    """Proceso productor: prepara n mensajes 'asignatura' y los envía tras la señal de inicio"""
+    from src.ipc import flush_sender
+    from src.standin import build_catalogo
+    catalogo = build_catalogo(seed=seed)
+    codigos = list(catalogo['asignaturas'])
+    mensajes = [{'type': 'asignatura', 'output_dir': 'Data/Facultad_Bench',
+                 'info': info_from_catalogo(catalogo, codigos[i % len(codigos)], '3534 CARRERA')}
+                for i in range(n)]
+    ready.set()
+    start.wait()
+    for msg in mensajes:
+        sender.put(msg)
+    with quiet():
+        flush_sender(sender)
+
+
+def _ipc_round(kind, batch, args):
+    from src.ipc import BatchingSender, make_writer_queue
+    manager = multiprocessing.Manager() if kind == 'manager' else None
+    q = make_writer_queue(kind, maxsize=args.ipc_queue_size, manager=manager)
+    sender = BatchingSender(q, batch_size=batch) if batch > 1 else q
+    n = args.ipc_messages
+    start = multiprocessing.Event()
+    listos = [multiprocessing.Event() for _ in range(args.ipc_producers)]
+    procs = [multiprocessing.Process(target=_ipc_producer, args=(sender, n, args.seed, ready, start))
+             for ready in listos]
+    for p in procs:
+        p.start()
+    for ready in listos:
+        ready.wait()
+    total = n * len(procs)
+    recibidos = envios = 0
+    t0 = time.perf_counter()
+    start.set()
+    while recibidos < total:
+        msg = q.get(timeout=60)
+        envios += 1
+        recibidos += len(msg['messages']) if msg.get('type') == 'batch' else 1
+    seconds = time.perf_counter() - t0
+    for p in procs:
+        p.join()
+    if manager is not None:
+        manager.shutdown()
+    return {
+        'messages': recibidos,
+        'sends': envios,
+        'seconds': round(seconds, 4),
+        'messages_per_sec': round(recibidos / seconds, 1) if seconds else None,
+    }
+
+
+def bench_ipc(args):
+    from src.ipc import message_size
+    from src.standin import build_catalogo
+    catalogo = build_catalogo(seed=args.seed)
+    codigo = next(iter(catalogo['asignaturas']))
+    resultados = {
+        'producers': args.ipc_producers,
+        'messages_per_producer': args.ipc_messages,
+        'message_bytes': message_size({'type': 'asignatura', 'output_dir': 'Data/Facultad_Bench',
+                                       'info': info_from_catalogo(catalogo, codigo, '3534 CARRERA')}),
+    }
+    for nombre, kind, batch in (('manager', 'manager', 1), ('direct', 'direct', 1),
+                                (f'direct_batch{args.ipc_batch}', 'direct', args.ipc_batch)):
+        resultados[nombre] = _ipc_round(kind, batch, args)
+    return resultados
+
+
+ENGINE_VARIANTS = ('http', 'async')
+
+
+def _engine_round(variant, url, units, args):
+    """Una pasada del motor sobre las unidades; los mensajes al writer se cuentan, no se escriben"""
+    import src.scraper as scraper
+    from src.scheduler import fill_job_queue
+
+    # Índice de códigos vacío en cada variante: todas extraen grupos y horarios
+    scraper.CODIGO_INDEX = scraper.CodigoIndex()
+    job_queue = queue.Queue()
+    fill_job_queue(job_queue, units, 1)
+    mensajes = queue.Queue()
+    start = time.perf_counter()
+    with quiet():
+        if variant == 'http':
+            from src.http_engine import run_http_worker
+            run_http_worker(job_queue, writer_queue=mensajes, url=url)
+        else:
+            from src.async_engine import run_async_worker
+            run_async_worker(job_queue, writer_queue=mensajes, url=url, concurrency=args.engine_concurrency, rate=0)
+    total = time.perf_counter() - start
+    asignaturas = mensajes.qsize()
+    return {
+        'units': len(units),
+        'subjects': asignaturas,
+        'seconds': round(total, 4),
+        'subjects_per_sec': round(asignaturas / total, 1) if total else None,
+    }
+
+
+def bench_engines(args):
+    from src.scheduler import build_work_units
+    from src.standin import build_catalogo, start_in_thread
+
+    units = build_work_units()[:args.engine_units]
+    server, url = start_in_thread(port=0, catalogo=build_catalogo(seed=args.seed),
+                                  latency=args.engine_latency_ms / 1000)
+    cwd = os.getcwd()
+    resultados = {'latency_ms': args.engine_latency_ms, 'async_concurrency': args.engine_concurrency}
+    try:
+        for variant in ENGINE_VARIANTS:
+            # Las carpetas Data/Facultad_* que el motor crea quedan en un directorio temporal
+            with tempfile.TemporaryDirectory() as tmp:
+                os.chdir(tmp)
+                try:
+                    resultados[variant] = _engine_round(variant, url, units, args)
+                finally:
+                    os.chdir(cwd)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return resultados
+
+
+STAGES = {
+    'parser': bench_parser,
+    'writer': bench_writer,
+    'unifier': bench_unifier,
+    'ipc': bench_ipc,
+    'engines': bench_engines,
+}
+
+
+def _run_stage(name, args, conn):
+    try:
+        t0 = time.perf_counter()
+        result = STAGES[name](args)
+        result['wall_seconds'] = round(time.perf_counter() - t0, 4)
+        result['peak_rss_mb'] = peak_rss_mb()
+        conn.send(result)
+    except Exception as e:
+        conn.send({'error': f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_stage(name, args):
+    """Ejecuta la etapa en un proceso nuevo para aislar su RSS máximo"""
+    parent, child = multiprocessing.Pipe(duplex=False)
+    p = multiprocessing.Process(target=_run_stage, args=(name, args, child), name=f"bench-{name}")
+    p.start()
+    child.close()
+    try:
+        result = parent.recv()
+    except EOFError:
+        result = {'error': f'el proceso terminó con exitcode {p.exitcode}'}
+    p.join()
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks del pipeline scrape -> write -> unify')
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--pages', default=None,
+                        help='Carpeta con páginas de detalle .html (por defecto se generan con src/standin.py)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+                        help='Filas de Horarios de las carpetas generadas para el unifier')
+    parser.add_argument('--writer-messages', type=int, default=0,
+                        help='Máximo de mensajes enviados al writer (0 = todo el catálogo generado)')
+    parser.add_argument('--writer-subjects-per-carrera', type=int, default=12)
+    parser.add_argument('--writer-group-size', type=int, default=1,
+                        help='Asignaturas por escritura del writer (group commit, 1 = una por asignatura)')
+    parser.add_argument('--writer-group-ms', type=int, default=0)
+    parser.add_argument('--writer-journal', action='store_true',
+                        help='Activa el journal del writer (fsync por mensaje) en la etapa writer')
+    parser.add_argument('--ipc-producers', type=int, default=4, help='Procesos productores de la etapa ipc')
+    parser.add_argument('--ipc-messages', type=int, default=2000, help='Mensajes por productor en la etapa ipc')
+    parser.add_argument('--ipc-batch', type=int, default=8, help='Tamaño de lote de la variante con lotes')
+    parser.add_argument('--ipc-queue-size', type=int, default=256)
+    parser.add_argument('--engine-units', type=int, default=6,
+                        help='Unidades de trabajo que recorre cada motor en la etapa engines')
+    parser.add_argument('--engine-concurrency', type=int, default=4,
+                        help='Vistas (asignaturas en curso) de la variante async en la etapa engines')
+    parser.add_argument('--engine-latency-ms', type=float, default=20,
+                        help='Latencia por petición del catálogo local en la etapa engines')
+    parser.add_argument('--unifier-format', nargs='+', default=['csv'], dest='unifier_formats',
+                        choices=['csv', 'parquet', 'feather'],
+                        help='Formatos de salida del unifier (parquet/feather requieren pyarrow)')
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--out', default=None, help='Archivo JSON de salida (por defecto stdout)')
+    args = parser.parse_args(argv)
+    args.writer_kwargs = {'group_size': args.writer_group_size, 'group_ms': args.writer_group_ms}
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'stages': {},
+    }
+    for name in args.stages:
+        print(f"[bench] Ejecutando etapa {name}...", file=sys.stderr)
+        report['stages'][name] = run_stage(name, args)
+
+    data = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(data + '\n')
+        print(f"[bench] Resultados guardados en {args.out}", file=sys.stderr)
+    else:
+        print(data)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
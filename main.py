@@ -1,60 +1,68 @@
 """
 main.py
 
-Lanza los bots de cada facultad en procesos separados (multiprocessing).
-Cada bot debe exponer una función `main()` (ya presente en los módulos de bot).
+Encola las unidades de trabajo (facultad, carrera, tipo de asignatura) de todas las
+facultades configuradas en src/utils.py en una cola compartida de la que N procesos
+worker (multiprocessing) toman trabajo hasta vaciarla. Cada worker ejecuta el bot
+genérico de src/bot.py con sesiones de navegador de su propio DriverPool.
 
-Uso: python main.py
+Uso: python main.py [--workers N]
 """
 import multiprocessing
 import time
 import traceback
 import sys
 import argparse
+import os
 
-# Importar los módulos de los bots (los archivos deben existir en el mismo directorio)
-import src.botAgrarias as botAgrarias
-import src.botArquitectura as botArquitectura
-import src.botCiencias as botCiencias
-import src.botFCHE as botFCHE
-import src.botMinas as botMinas
-import src.botMinas2 as botMinas2
+import src.bot as bot_module
+import src.ipc as ipc
 import src.writer as writer_module
+from src.browser_profiles import DEFAULT_PROFILE, PROFILES
+from src.checkpoint import DEFAULT_JOURNAL, ProgressJournal
+from src.driver_pool import DEFAULT_MAX_PAGES, DEFAULT_MAX_RSS_MB
+from src.registry import SubjectRegistry
+from src.scheduler import build_work_units, fill_job_queue
+from src.standin import CATALOGO_PATH
 
-"""
-BOT_MODULES = [
-    ("FCHE", botFCHE),
-    ("Arquitectura", botArquitectura),
-    ("Agrarias", botAgrarias),
-    ("Ciencias", botCiencias),
-    ("Minas", botMinas),
-]
-"""
+# Número de procesos worker (navegadores) lanzados por defecto
+DEFAULT_WORKERS = 6
 
-BOT_MODULES = [
-    ("FCHE", botFCHE),
-    ("Arquitectura", botArquitectura),
-    ("Agrarias", botAgrarias),
-    ("Ciencias", botCiencias),
-    ("Minas", botMinas),
-    ("Minas2", botMinas2)
-]
 
-
-def start_processes(modules, delay_between_starts=15):
+def start_processes(n_workers, job_queue, delay_between_starts=15, ack_queues=None, **worker_kwargs):
     processes = []
-    for name, mod in modules:
-        # Ejecutar la función main del módulo en un proceso separado
-        p = multiprocessing.Process(target=mod.main, name=f"bot-{name}")
+    for idx in range(1, n_workers + 1):
+        name = f"worker{idx}"
+        # Cada worker toma unidades de la cola compartida hasta vaciarla
+        # (worker_kwargs: headless, writer_queue, parse_mode... de bot.run_worker)
+        kwargs = dict(worker_kwargs)
+        if ack_queues:
+            # Los acks del writer para los lotes de este worker llegan por su propia cola
+            kwargs['writer_queue'] = kwargs['writer_queue'].with_acks(ack_queues[idx - 1], idx - 1)
+        p = multiprocessing.Process(target=bot_module.run_worker, args=(job_queue,), kwargs=kwargs,
+                                    name=f"bot-{name}")
         p.start()
-        print(f"[main] Lanzado proceso {p.name} pid={p.pid} para bot {name}")
+        print(f"[main] Lanzado proceso {p.name} pid={p.pid} (headless={worker_kwargs.get('headless')})")
         processes.append((name, p))
         # Espera configurable entre lanzamientos para permitir interacción manual
-        time.sleep(delay_between_starts)
+        if idx < n_workers:
+            time.sleep(delay_between_starts)
     return processes
 
 
-def monitor_processes(processes):
+# Segundos que main.py espera a que los workers envíen su último lote tras Ctrl+C
+INTERRUPT_GRACE_S = 15
+
+
+def monitor_processes(processes, writer_procs=()):
+    """
+    Sondea los procesos hasta que terminan. Si un writer termina antes que los
+    workers, lo que éstos envíen ya no se escribiría: se terminan y la ejecución
+    se aborta (lo que el writer no confirmó queda pendiente para --resume).
+
+    Returns:
+        int: 0 si los workers terminaron, 130 si se interrumpió con Ctrl+C y 1 si un writer murió
+    """
     try:
         while True:
             alive = False
@@ -66,15 +74,61 @@ def monitor_processes(processes):
             if not alive:
                 print("[main] Todos los procesos han terminado.")
                 break
+            caidos = [w for w in writer_procs if not w.is_alive()]
+            if caidos:
+                for w in caidos:
+                    print(f"[main] {w.name} terminó inesperadamente (exitcode={w.exitcode}); abortando la ejecución")
+                for name, p in processes:
+                    if p.is_alive():
+                        print(f"[main] Terminando {name} (pid={p.pid})")
+                        p.terminate()
+                return 1
             # Intervalo de sondeo
             time.sleep(5)
     except KeyboardInterrupt:
-        print("[main] Interrupción por teclado: terminando procesos...")
+        # Los workers también reciben el Ctrl+C y, al salir, envían al writer su lote
+        # pendiente y anotan esas asignaturas en el diario: se les da un margen antes
+        # de terminarlos para que --resume no salte asignaturas que no se escribieron
+        print(f"[main] Interrupción por teclado: esperando hasta {INTERRUPT_GRACE_S}s a que los workers terminen...")
+        limite = time.monotonic() + INTERRUPT_GRACE_S
         for name, p in processes:
+            p.join(timeout=max(0.0, limite - time.monotonic()))
             if p.is_alive():
                 print(f"[main] Terminando {name} (pid={p.pid})")
                 p.terminate()
-        raise
+        return 130
+    return 0
+
+
+# Segundos que main.py espera a que haya hueco en la cola para el mensaje de shutdown
+SHUTDOWN_PUT_TIMEOUT_S = 30
+
+
+def shutdown_writers(writer_queue, writer_procs):
+    """
+    Pide a los writers que escriban lo pendiente y terminen, y espera a que lo hagan.
+
+    Returns:
+        bool: True si todos los writers terminaron con exitcode 0
+    """
+    # Pedir a los writers que terminen (con varios, el router lo reenvía a cada uno)
+    try:
+        writer_queue.put({'type': 'shutdown'}, timeout=SHUTDOWN_PUT_TIMEOUT_S)
+    except Exception as e:
+        # Un writer muerto deja su cola llena: no se puede esperar a que la vacíe
+        print(f"[main] No se pudo enviar el shutdown a los writers: {e!r}")
+        for p in writer_procs:
+            if p.is_alive():
+                p.terminate()
+    ok = True
+    for p in writer_procs:
+        p.join()
+        print(f"[main] {p.name} exitcode={p.exitcode}")
+        ok = ok and p.exitcode == 0
+    if not ok:
+        print("[main] Algún writer terminó con error: lo que no escribió sigue en su journal y se recupera al "
+              "relanzar con --resume")
+    return ok
 
 
 def main():
@@ -89,38 +143,134 @@ def main():
     parser.add_argument('--delay', '-d', type=float, default=15,
                         help='Segundos a esperar entre el lanzamiento de cada bot (por defecto 15s)')
     parser.add_argument('--headless', action='store_true', help='Ejecutar navegadores en modo headless (sin UI)')
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_WORKERS,
+                        help=f'Número de workers (navegadores) que toman carreras de la cola compartida (por defecto {DEFAULT_WORKERS})')
+    parser.add_argument('--storage', choices=['csv', 'sqlite'], default='csv',
+                        help="Backend de almacenamiento del writer: CSVs por facultad o una base SQLite")
+    parser.add_argument('--db', default=os.path.join('Data', 'sia.db'),
+                        help='Ruta de la base de datos con --storage sqlite (por defecto Data/sia.db)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Reanudar una ejecución interrumpida: omite carreras y asignaturas ya terminadas')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL,
+                        help=f'Diario de progreso usado por --resume (por defecto {DEFAULT_JOURNAL})')
+    parser.add_argument('--base-url', default=None,
+                        help='URL base de un catálogo alternativo, p. ej. el servidor local de src/standin.py '
+                             '(http://127.0.0.1:8765)')
+    parser.add_argument('--parse-mode', choices=['driver', 'html', 'js'], default='driver',
+                        help="Extracción del detalle: 'driver' (un find_element por campo), 'html' (page_source + lxml) "
+                             "o 'js' (un script que expande los grupos y devuelve todo el detalle)")
+    parser.add_argument('--recycle-pages', type=int, default=DEFAULT_MAX_PAGES,
+                        help=f'Reciclar el navegador de cada bot tras N asignaturas (0 = nunca, por defecto {DEFAULT_MAX_PAGES})')
+    parser.add_argument('--recycle-mb', type=int, default=DEFAULT_MAX_RSS_MB,
+                        help=f'Reciclar el navegador cuando Chrome supere N MB de memoria; requiere psutil '
+                             f'(0 = nunca, por defecto {DEFAULT_MAX_RSS_MB})')
+    parser.add_argument('--profile', choices=PROFILES, default=DEFAULT_PROFILE,
+                        help="Perfil de Chrome: 'lean' bloquea imágenes, fuentes y tráfico de fondo con carga 'eager'; "
+                             "'minimal' además bloquea CSS")
+    parser.add_argument('--tabs', type=int, default=1,
+                        help='Pestañas por navegador: cada una es una vista del catálogo y se atienden en turno '
+                             'rotativo, sin esperar a que la tabla se redibuje tras volver (por defecto 1)')
+    parser.add_argument('--ipc', choices=ipc.IPC_KINDS, default=ipc.DEFAULT_IPC,
+                        help="Cola del writer: 'direct' (multiprocessing.Queue acotada, con lotes) o 'manager' "
+                             "(proxy de multiprocessing.Manager, la de versiones anteriores)")
+    parser.add_argument('--batch', type=int, default=ipc.DEFAULT_BATCH,
+                        help=f'Asignaturas por envío al writer; 1 = sin lotes (por defecto {ipc.DEFAULT_BATCH})')
+    parser.add_argument('--queue-size', type=int, default=ipc.DEFAULT_MAXSIZE,
+                        help=f"Con --ipc direct: envíos en cola antes de bloquear a los workers (por defecto {ipc.DEFAULT_MAXSIZE})")
+    parser.add_argument('--group-size', type=int, default=writer_module.DEFAULT_GROUP_SIZE,
+                        help=f'El writer escribe las cuatro tablas cada N asignaturas recibidas (por defecto '
+                             f'{writer_module.DEFAULT_GROUP_SIZE}; 1 = una escritura por asignatura)')
+    parser.add_argument('--group-ms', type=int, default=writer_module.DEFAULT_GROUP_MS,
+                        help=f'... o cuando la asignatura pendiente más antigua lleva T ms esperando '
+                             f'(por defecto {writer_module.DEFAULT_GROUP_MS})')
+    parser.add_argument('--writer-journal', default=writer_module.DEFAULT_WRITER_JOURNAL,
+                        help=f'Journal donde el writer registra (con fsync) las asignaturas recibidas aún no escritas; '
+                             f'se recupera al arrancar tras una caída (por defecto {writer_module.DEFAULT_WRITER_JOURNAL})')
+    parser.add_argument('--no-writer-journal', action='store_true',
+                        help='Sin journal del writer: más rápido, pero una caída pierde las asignaturas pendientes')
+    parser.add_argument('--writer-shards', type=int, default=1,
+                        help='Procesos writer; cada carpeta de facultad la escribe siempre el mismo (por defecto 1). '
+                             'Tras una caída, reanudar con el mismo número para recuperar sus journals')
     args = parser.parse_args()
+    if args.storage == 'sqlite' and args.writer_shards > 1:
+        # Todas las facultades van a la misma base: varios writers sólo competirían por su bloqueo
+        print("[main] --storage sqlite usa un único writer; se ignora --writer-shards")
+        args.writer_shards = 1
 
-    # Crear cola y proceso writer central
+    # Crear colas y procesos writer (uno por shard, cada uno con su cola y su journal)
     manager = multiprocessing.Manager()
-    writer_queue = manager.Queue()
-    writer_proc = multiprocessing.Process(target=writer_module.start_writer, args=(writer_queue,), name='writer')
-    writer_proc.start()
-    print(f"[main] Lanzado proceso writer pid={writer_proc.pid}")
-
-    # Pasar la opción headless y la writer_queue a cada proceso como argumento
-    processes = []
-    for name, mod in BOT_MODULES:
-        # Cada bot.main(headless, writer_queue)
-        p = multiprocessing.Process(target=mod.main, args=(args.headless, writer_queue), name=f"bot-{name}")
+    n_shards = max(1, args.writer_shards)
+    db_path = args.db if args.storage == 'sqlite' else None
+    writer_journal = None if args.no_writer_journal else args.writer_journal
+    # Una cola de acks por worker: los writers las heredan al arrancar y confirman por
+    # ellas cada lote anotado en su journal; el worker anota el progreso al recibir el ack
+    ack_queues = [multiprocessing.Queue() for _ in range(max(1, args.workers))]
+    writer_queues = []
+    writer_procs = []
+    for shard in range(n_shards):
+        q = ipc.make_writer_queue(args.ipc, maxsize=args.queue_size, manager=manager)
+        p = multiprocessing.Process(target=writer_module.start_writer, args=(q, args.storage, db_path),
+                                    kwargs=dict(group_size=args.group_size, group_ms=args.group_ms,
+                                                journal_path=ipc.shard_journal_path(writer_journal, shard, n_shards),
+                                                ack_queues=ack_queues),
+                                    name='writer' if n_shards == 1 else f'writer{shard}')
         p.start()
-        print(f"[main] Lanzado proceso {p.name} pid={p.pid} para bot {name} (headless={args.headless})")
-        processes.append((name, p))
-    procs = processes
+        print(f"[main] Lanzado proceso {p.name} pid={p.pid}")
+        writer_queues.append(q)
+        writer_procs.append(p)
+    # Con varios writers, el router reparte los mensajes por output_dir
+    writer_queue = writer_queues[0] if n_shards == 1 else ipc.ShardedQueue(writer_queues)
+
+    # Diario de progreso: con --resume se omiten las unidades terminadas, si no se reinicia
+    journal = ProgressJournal(args.journal)
+    units = build_work_units()
+    if args.resume:
+        total = len(units)
+        units = journal.pending_units(units)
+        print(f"[main] Reanudando: {total - len(units)} de {total} unidades ya terminadas")
+    else:
+        journal.reset()
+    if not units:
+        # Nada que extraer: no se lanza ningún worker; los writers sólo recuperan sus journals
+        print("[main] No quedan unidades pendientes")
+        if not shutdown_writers(writer_queue, writer_procs):
+            sys.exit(1)
+        return
+
+    # Cola compartida de unidades de trabajo (un centinela por worker al final)
+    n_workers = max(1, min(args.workers, len(units)))
+    job_queue = manager.Queue()
+    fill_job_queue(job_queue, units, n_workers)
+    print(f"[main] {len(units)} unidades de trabajo encoladas para {n_workers} workers")
+
+    url = bot_module.URL_CATALOGO
+    if args.base_url:
+        url = args.base_url.rstrip('/') + CATALOGO_PATH
+        print(f"[main] Usando catálogo alternativo: {url}")
+
+    # Registro compartido de asignaturas ya scrapeadas (grupos/horarios una vez por código)
+    registry = SubjectRegistry(manager.dict())
+
+    # Pasar la cola de trabajo, la opción headless y la writer_queue a cada proceso como argumento
+    # Cada worker agrupa sus asignaturas en lotes antes de enviarlas al writer (src/ipc.py)
+    sender = ipc.BatchingSender(writer_queue, batch_size=args.batch)
+    procs = start_processes(n_workers, job_queue, delay_between_starts=args.delay, ack_queues=ack_queues,
+                            headless=args.headless, writer_queue=sender, url=url, parse_mode=args.parse_mode,
+                            registry=registry, db_path=db_path, journal_path=args.journal,
+                            max_pages=args.recycle_pages, max_rss_mb=args.recycle_mb, profile=args.profile,
+                            tabs=max(1, args.tabs))
     print(f"[main] Lanzados {len(procs)} bots. Monitorizando... (delay entre lanzamientos: {args.delay}s)")
-    monitor_processes(procs)
+    codigo = monitor_processes(procs, writer_procs)
 
     # Reporte final
     for name, p in procs:
         p.join(timeout=0.1)
         print(f"[main] Bot {name} exitcode={p.exitcode}")
-    # tell writer to shutdown
-    try:
-        writer_queue.put({'type': 'shutdown'})
-    except Exception:
-        pass
-    writer_proc.join(timeout=5)
-    print(f"[main] Writer exitcode={writer_proc.exitcode}")
+    writers_ok = shutdown_writers(writer_queue, writer_procs)
+    if codigo:
+        sys.exit(codigo)
+    if not writers_ok:
+        sys.exit(1)
 
 
 if __name__ == '__main__':
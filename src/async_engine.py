@@ -0,0 +1,165 @@
+"""
+Variante asyncio del cliente HTTP (src/http_engine.py): varias asignaturas en
+curso a la vez dentro de un mismo proceso.
+
+Como el cliente, es una herramienta de pruebas y benchmarks contra el catálogo
+local (src/standin.py), no un motor de producción: main.py no la ofrece.
+
+No hay E/S asíncrona: asyncio sólo coordina K hilos que hacen peticiones
+bloqueantes de `requests`. Cada tarea ejecuta las llamadas de su
+AdfHttpClient (src/http_engine.py) con asyncio.to_thread en un
+ThreadPoolExecutor de K + 1 hilos (uno más para leer la cola de unidades), así
+que la concurrencia es la de K hilos del proceso, cada uno esperando su
+respuesta HTTP.
+
+Una vista sólo puede mostrar un detalle a la vez (el ViewState guarda en el
+servidor qué asignatura está abierta), así que las K tareas usan K vistas
+paralelas de la misma carrera, cada una con los filtros ya configurados, y
+toman asignaturas de una cola común.
+
+ - `concurrency` es K, el número de vistas: cada una atiende una asignatura a la
+   vez, así que K es también el límite de asignaturas en curso del proceso.
+ - `rate` limita las peticiones por segundo del proceso (token bucket), para no
+   superar la tasa que el servidor tolera aunque K sea alto.
+
+Uso:
+    python -m benchmarks.run --stages engines --engine-concurrency 8
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.bot import URL_CATALOGO, finish_unit
+from src.checkpoint import ProgressJournal
+from src.http_engine import AdfHttpClient, open_results, pending_subjects, process_subject_http
+from src.ipc import flush_sender
+from src.scheduler import iter_job_queue, output_dir_for
+from src.utils import Facultades_Bot
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 10.0
+
+
+class TokenBucket:
+    """
+    Límite de tasa compartido por los hilos del proceso: `rate` peticiones por
+    segundo con ráfagas de hasta `burst`. acquire() bloquea hasta que hay un token.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                espera = (1 - self.tokens) / self.rate
+            time.sleep(espera)
+
+    __call__ = acquire
+
+
+async def process_work_unit_async(clients, unit, writer_queue=None, registry=None, journal=None):
+    """
+    Procesa una unidad con hasta len(clients) asignaturas en curso a la vez (una por vista).
+
+    Returns:
+        bool: True si se procesaron todas las asignaturas pendientes de la unidad
+    """
+    os.makedirs(output_dir_for(unit[0]), exist_ok=True)
+    filas = await asyncio.to_thread(open_results, clients[0], unit)
+    if filas is None:
+        return False
+    asignaturas = pending_subjects(filas, unit, journal)
+    if not asignaturas:
+        return finish_unit(unit, [], journal, writer_queue)
+
+    # Abrir el resto de vistas con los mismos filtros (sólo las que se van a usar)
+    activos = [clients[0]]
+    extra = clients[1:len(asignaturas)]
+    abiertas = await asyncio.gather(*(asyncio.to_thread(open_results, c, unit) for c in extra))
+    activos += [c for c, f in zip(extra, abiertas) if f is not None]
+
+    pendientes = asyncio.Queue()
+    for asignatura in asignaturas:
+        pendientes.put_nowait(asignatura)
+    fallos = []
+
+    async def tarea(client):
+        while True:
+            try:
+                asignatura = pendientes.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            print(f"\n➡️ Procesando asignatura {asignatura['codigo']} - {asignatura['nombre']}")
+            try:
+                info = await asyncio.to_thread(process_subject_http, client, unit, asignatura,
+                                               writer_queue, registry, journal)
+            except RuntimeError as e:
+                # Vista irrecuperable: esta vista deja de tomar asignaturas
+                print(e)
+                fallos.append(asignatura['codigo'])
+                return
+            if info is None:
+                fallos.append(asignatura['codigo'])
+
+    await asyncio.gather(*(tarea(c) for c in activos))
+    while not pendientes.empty():
+        fallos.append(pendientes.get_nowait()['codigo'])
+    return finish_unit(unit, fallos, journal, writer_queue)
+
+
+async def _worker_loop(job_queue, concurrency, rate, writer_queue, url, registry, journal):
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency + 1, thread_name_prefix='sia-http'))
+    limiter = TokenBucket(rate)
+    clients = [AdfHttpClient(url, throttle=limiter) for _ in range(concurrency)]
+    unidades = iter_job_queue(job_queue)
+    procesadas = 0
+    try:
+        while True:
+            unit = await asyncio.to_thread(next, unidades, None)
+            if unit is None:
+                break
+            procesadas += 1
+            print(f"\n==============================")
+            print(f"Procesando unidad #{procesadas}: {unit.carrera} ({unit.facultad}, {unit.tipo_asignatura})")
+            try:
+                await process_work_unit_async(clients, unit, writer_queue, registry, journal)
+            except Exception as e:
+                print(f"Error procesando la carrera {unit.carrera}: {e}")
+    finally:
+        print(f"Worker async terminado: {procesadas} unidades procesadas")
+        peticiones = sum(c.stats['peticiones'] for c in clients)
+        segundos = sum(c.stats['segundos'] for c in clients)
+        print(f"[async] {len(clients)} vistas, {peticiones} peticiones, {segundos:.1f}s en red acumulados")
+        for c in clients:
+            c.close()
+
+
+def run_async_worker(job_queue, writer_queue=None, url=URL_CATALOGO, registry=None, db_path=None,
+                     journal_path=None, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE):
+    """Worker de la cola compartida con el motor asyncio (argumentos de http_engine.run_http_worker más K y tasa)"""
+    from src.scraper import CODIGO_INDEX
+    CODIGO_INDEX.db_path = db_path
+    CODIGO_INDEX.preload(output_dir_for(cfg["facultad"]) for cfg in Facultades_Bot)
+    journal = ProgressJournal(journal_path) if journal_path else None
+    try:
+        asyncio.run(_worker_loop(job_queue, max(1, concurrency), rate, writer_queue, url, registry, journal))
+    finally:
+        # Después de asyncio.run, que espera a los hilos: también se envía lo que
+        # entregaron los que seguían en curso al interrumpir el bucle
+        flush_sender(writer_queue)
@@ -0,0 +1,725 @@
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import functools
+import os
+
+from src.browser_profiles import DEFAULT_PROFILE, apply_profile, chrome_options
+from src.checkpoint import ProgressJournal
+from src.driver_pool import DEFAULT_MAX_PAGES, DEFAULT_MAX_RSS_MB, DriverPool
+from src.ipc import after_delivery, flush_sender
+from src.scheduler import build_work_units, iter_job_queue, output_dir_for
+from src.utils import Facultades_Bot
+from src.waits import WAIT_BUDGET, wait_for_ppr, wait_for_rows, wait_for_staleness, wait_until
+
+# URL del catálogo de asignaturas del SIA
+URL_CATALOGO = "https://sia.unal.edu.co/Catalogo/facespublico/public/servicioPublico.jsf?taskflowId=task-flow-AC_CatalogoAsignaturas"
+# Veces que el modo pestañas vuelve a encolar una asignatura que falló antes de darla por fallida
+TABS_REINTENTOS = 1
+
+# Lee todas las filas de la tabla de resultados en una sola llamada a execute_script.
+# Mismos selectores que la extracción fila a fila; innerText equivale a WebElement.text.
+TABLA_JS = """
+function texto(el) { return el ? (el.innerText || el.textContent || '').trim() : ''; }
+function valor(el) {
+  if (!el) { return ''; }
+  var t = (el.getAttribute('title') || '').trim();
+  return t || texto(el);
+}
+var filas = document.querySelectorAll('tr.af_table_data-row');
+var out = [];
+for (var i = 0; i < filas.length; i++) {
+  var f = filas[i];
+  var enlace = f.querySelector('td:nth-child(1) a.af_commandLink');
+  var col2 = f.querySelector('td:nth-child(2)');
+  out.push({
+    codigo: texto(enlace),
+    columna_nombre: texto(col2),
+    nombre: valor(f.querySelector('td:nth-child(2) span[title]')),
+    creditos: valor(f.querySelector('td:nth-child(3) span[title]')),
+    tipo: texto(f.querySelector('td:nth-child(4) span[title]')),
+    completa: !!(enlace && col2 && f.querySelector('td:nth-child(2) span[title]'))
+  });
+}
+return out;
+"""
+
+
+class AsignaturaExtractor:
+    def __init__(self, driver_path='src/chromedriver.exe', headless=False, profile=DEFAULT_PROFILE):
+        self.driver = None
+        self.headless = headless
+        self.profile = profile
+        self.setup_driver(driver_path)
+    
+    def setup_driver(self, driver_path):
+        # Opciones del perfil (src/browser_profiles.py): evitar interacción/manual focus,
+        # tamaño razonable y, en 'lean'/'minimal', sin imágenes, fuentes ni tráfico de fondo
+        options = chrome_options(getattr(self, 'profile', DEFAULT_PROFILE), getattr(self, 'headless', False))
+        service = Service(executable_path=driver_path)
+        self.driver = webdriver.Chrome(service=service, options=options)
+        apply_profile(self.driver, getattr(self, 'profile', DEFAULT_PROFILE))
+        # Intentar forzar foco de la ventana desde JS
+        try:
+            self.driver.execute_script("window.focus();")
+        except Exception:
+            pass
+
+    def safe_click(self, element):
+        """Click con fallbacks: element.click(), JS click y ActionChains."""
+        try:
+            element.click()
+            return
+        except Exception:
+            pass
+        try:
+            self.driver.execute_script("arguments[0].click();", element)
+            return
+        except Exception:
+            pass
+        try:
+            from selenium.webdriver import ActionChains
+            ActionChains(self.driver).move_to_element(element).click().perform()
+        except Exception:
+            pass
+    
+    def catalogo_cargado(self, url):
+        """True si el navegador ya muestra la página de filtros/tabla del catálogo en `url`"""
+        try:
+            if not self.driver.current_url.split('?')[0] == url.split('?')[0]:
+                return False
+            return bool(self.driver.find_elements(By.ID, "pt1:r1:0:soc1::content"))
+        except Exception:
+            return False
+
+    def select_filtro(self, element_id, valor, site):
+        """
+        Selecciona `valor` en el select indicado, salvo que ya esté seleccionado.
+        Al cambiar un select ADF reinicia los dependientes, así que tras un cambio
+        los siguientes ya no coinciden y se vuelven a elegir.
+
+        Returns:
+            bool: True si hubo que cambiar el select (y esperar su PPR)
+        """
+        elemento = WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.ID, element_id))
+        )
+        select = Select(elemento)
+        try:
+            if select.first_selected_option.text.strip() == valor:
+                return False
+        except NoSuchElementException:
+            pass
+        select.select_by_visible_text(valor)
+        wait_for_ppr(self.driver, site)
+        return True
+
+    def configure_filters(self, nivel_estudio="Pregrado", sede="1102 SEDE MEDELLÍN", 
+                         facultad="3068 FACULTAD DE MINAS", carrera=str,
+                         tipo_asignatura="TODAS MENOS LIBRE ELECCIÓN"):
+        """
+        Configura los filtros de búsqueda sobre la página actual. Sólo cambia los
+        selects cuyo valor es distinto del que ya muestra la página: entre
+        unidades de la misma facultad (o la misma carrera con otro tipo) se
+        mantienen nivel, sede y facultad sin recargar.
+        """
+        try:
+            print("Configurando filtros de búsqueda...")
+            filtros = [
+                ("nivel de estudio", "pt1:r1:0:soc1::content", nivel_estudio, "filtros.select_nivel"),
+                ("sede", "pt1:r1:0:soc9::content", sede, "filtros.select_sede"),
+                ("facultad", "pt1:r1:0:soc2::content", facultad, "filtros.select_facultad"),
+                ("carrera", "pt1:r1:0:soc3::content", carrera, "filtros.select_carrera"),
+                ("tipo de asignatura", "pt1:r1:0:soc4::content", tipo_asignatura, "filtros.select_tipo"),
+            ]
+            for etiqueta, element_id, valor, site in filtros:
+                if self.select_filtro(element_id, valor, site):
+                    print(f"Seleccionado {etiqueta}: {valor}")
+                else:
+                    print(f"{etiqueta.capitalize()} ya seleccionado: {valor}")
+            
+            print("Haciendo clic en el botón Mostrar...")
+            boton_mostrar = WebDriverWait(self.driver, 10).until(
+                EC.element_to_be_clickable((By.CLASS_NAME, "af_button_link"))
+            )
+            self.safe_click(boton_mostrar)
+            wait_for_ppr(self.driver, "filtros.mostrar")  # Esperar a que cargue la tabla
+            
+            print("Filtros configurados correctamente")
+            return True
+            
+        except TimeoutException:
+            print("Error: Tiempo de espera agotado configurando filtros")
+            return False
+        except Exception as e:
+            print(f"Error configurando filtros: {e}")
+            return False
+    
+    # Espera a que la tabla de asignaturas cargue
+    def wait_for_table(self, timeout=10):
+
+        if wait_for_rows(self.driver, "bot.tabla", timeout):
+            print("Tabla de asignaturas cargada correctamente")
+            return True
+        print("Error: No se pudo cargar la tabla de asignaturas")
+        return False
+    
+    # Extrae info de asignaturas de la tabla
+    def extract_asignaturas(self):
+        """
+        Lee la tabla de resultados con una sola llamada a execute_script (TABLA_JS).
+        Si el script falla, usa la extracción fila a fila con find_element.
+        """
+        try:
+            filas = self.driver.execute_script(TABLA_JS)
+        except Exception as e:
+            print(f"No se pudo leer la tabla con JavaScript ({e}); se lee fila a fila")
+            filas = None
+        if not isinstance(filas, list):
+            return self.extract_asignaturas_por_fila()
+
+        asignaturas = []
+        asignaturas_omitidas = []
+        print(f"Se encontraron {len(filas)} filas en total")
+        for i, fila in enumerate(filas, 1):
+            if not fila.get('completa') or not fila.get('codigo'):
+                print(f"Error extrayendo datos de la fila {i}: faltan columnas")
+                continue
+            codigo = fila['codigo']
+            nombre = fila['nombre']
+            if "ASIGNATURA SIN PROGRAMAR" in fila['columna_nombre']:
+                nombre = nombre.replace("ASIGNATURA SIN PROGRAMAR", "").strip()
+                asignaturas_omitidas.append({
+                    'codigo': codigo,
+                    'nombre': nombre,
+                    'razon': 'Sin programar'
+                })
+                print(f"❌ Asignatura omitida (sin programar): {codigo} - {nombre}")
+                continue
+            creditos = fila['creditos']
+            asignaturas.append({
+                'codigo': codigo,
+                'nombre': nombre,
+                'creditos': int(creditos) if creditos.isdigit() else creditos,
+                'tipo': fila['tipo']
+            })
+            print(f"✅ Asignatura {len(asignaturas)}: {codigo} - {nombre} ({creditos} créditos)")
+
+        if asignaturas_omitidas:
+            print(f"\n📊 RESUMEN DE FILTRADO:")
+            print(f"   - Asignaturas programadas: {len(asignaturas)}")
+            print(f"   - Asignaturas omitidas: {len(asignaturas_omitidas)}")
+            print(f"   - Total procesadas: {len(filas)}")
+        return asignaturas
+
+    def extract_asignaturas_por_fila(self):
+        """Extracción de la tabla con find_element por columna de cada fila"""
+        asignaturas = []
+        asignaturas_omitidas = []
+        
+        try:
+            # Buscar todas las filas de la tabla que contienen datos de asignaturas
+            filas = self.driver.find_elements(By.CSS_SELECTOR, "tr.af_table_data-row")
+            
+            print(f"Se encontraron {len(filas)} filas en total")
+            
+            for i, fila in enumerate(filas, 1):
+                try:
+                    # Extraer el código de la asignatura 
+                    codigo_element = fila.find_element(By.CSS_SELECTOR, "td:nth-child(1) a.af_commandLink")
+                    codigo = codigo_element.text.strip()
+                    
+                    # Verificar si la asignatura está programada 
+                    segunda_columna = fila.find_element(By.CSS_SELECTOR, "td:nth-child(2)")
+                    texto_completo_columna = segunda_columna.text.strip()
+                    
+                    
+                    if "ASIGNATURA SIN PROGRAMAR" in texto_completo_columna:
+                        # Extraer el nombre para el reporte de omitidas
+                        nombre_element = fila.find_element(By.CSS_SELECTOR, "td:nth-child(2) span[title]")
+                        nombre = nombre_element.get_attribute('title').strip()
+                        if not nombre:
+                            nombre = nombre_element.text.strip().replace("ASIGNATURA SIN PROGRAMAR", "").strip()
+                        
+                        asignaturas_omitidas.append({
+                            'codigo': codigo,
+                            'nombre': nombre,
+                            'razon': 'Sin programar'
+                        })
+                        print(f"❌ Asignatura omitida (sin programar): {codigo} - {nombre}")
+                        continue
+                    
+                    # Extraer el nombre de la asignatura 
+                    nombre_element = fila.find_element(By.CSS_SELECTOR, "td:nth-child(2) span[title]")
+                    nombre = nombre_element.get_attribute('title').strip()
+                    if not nombre:  # Si el title está vacío, usar el texto
+                        nombre = nombre_element.text.strip()
+                    
+                    # Extraer el número de créditos
+                    creditos_element = fila.find_element(By.CSS_SELECTOR, "td:nth-child(3) span[title]")
+                    creditos = creditos_element.get_attribute('title').strip()
+                    if not creditos:  # Si el title está vacío, usar el texto
+                        creditos = creditos_element.text.strip()
+                    
+                    # Extraer tipo de asignatura 
+                    tipo_element = fila.find_element(By.CSS_SELECTOR, "td:nth-child(4) span[title]")
+                    tipo = tipo_element.text.strip()
+                    if not tipo:  # Si el title está vacío, usar el texto
+                        tipo = tipo_element.text.strip()
+
+                    
+                    asignatura = {
+                        'codigo': codigo,
+                        'nombre': nombre,
+                        'creditos': int(creditos) if creditos.isdigit() else creditos,
+                        'tipo': tipo
+                    }
+                    
+                    asignaturas.append(asignatura)
+                    print(f"✅ Asignatura {len(asignaturas)}: {codigo} - {nombre} ({creditos} créditos)")
+                    
+                except NoSuchElementException as e:
+                    print(f"Error extrayendo datos de la fila {i}: {e}")
+                    continue
+                except Exception as e:
+                    print(f"Error inesperado en la fila {i}: {e}")
+                    continue
+            
+            
+            if asignaturas_omitidas:
+                print(f"\n📊 RESUMEN DE FILTRADO:")
+                print(f"   - Asignaturas programadas: {len(asignaturas)}")
+                print(f"   - Asignaturas omitidas: {len(asignaturas_omitidas)}")
+                print(f"   - Total procesadas: {len(filas)}")
+            
+            return asignaturas
+            
+        except Exception as e:
+            print(f"Error general extrayendo asignaturas: {e}")
+            return []
+     
+    
+    def close(self):
+        """Cierra el driver"""
+        if self.driver:
+            self.driver.quit()
+
+def open_results_table(extractor, unit, url=URL_CATALOGO, reuse=True):
+    """
+    Configura los filtros de la unidad hasta tener la tabla de resultados cargada.
+    Con reuse=True, si el navegador ya está en la página de filtros del catálogo
+    (p. ej. tras la unidad anterior) se reutiliza sin recargarla y sólo cambian
+    los selects necesarios; si falla, se reintenta con la página recargada.
+    Como la página ya tiene filas (las de la unidad anterior), antes de leer la
+    tabla se espera a que una de esas filas quede obsoleta tras Mostrar.
+
+    Returns:
+        bool: True si la tabla quedó cargada
+    """
+    facultad, carrera, tipo_asignatura = unit
+    if reuse and extractor.catalogo_cargado(url):
+        print(f"Reutilizando la página del catálogo para {carrera} ({tipo_asignatura})")
+        filas = extractor.driver.find_elements(By.CSS_SELECTOR, "tr.af_table_data-row")
+        if (extractor.configure_filters(facultad=facultad, carrera=carrera, tipo_asignatura=tipo_asignatura)
+                and (not filas or wait_for_staleness(extractor.driver, filas[0], "bot.tabla_reutilizada"))
+                and extractor.wait_for_table()):
+            return True
+        print("No se pudo reutilizar la página: se recarga")
+    print(f"Navegando a: {url}")
+    extractor.driver.get(url)
+    # Configurar filtros de búsqueda para la unidad actual
+    if not extractor.configure_filters(facultad=facultad, carrera=carrera, tipo_asignatura=tipo_asignatura):
+        print(f"No se pudieron configurar los filtros para la carrera {carrera}")
+        return False
+    # Esperar a que cargue la tabla
+    if not extractor.wait_for_table():
+        print(f"No se pudo cargar la tabla de resultados para la carrera {carrera}")
+        return False
+    return True
+
+
+def process_work_unit(extractor, unit, writer_queue=None, url=URL_CATALOGO, parse_mode="driver",
+                      registry=None, journal=None, pool=None):
+    """
+    Procesa una unidad de trabajo (facultad, carrera, tipo de asignatura) con el
+    extractor dado: configura los filtros, recorre la tabla de resultados y
+    scrapea cada asignatura programada.
+
+    Si se pasa un SubjectRegistry compartido, los grupos y horarios de cada código
+    se expanden una sola vez por carpeta de salida (el primer bot que lo reclama).
+    Si se pasa un ProgressJournal, se saltan las asignaturas ya registradas en él
+    y se anota cada asignatura terminada; el fin de la unidad sólo se anota si no
+    falló ninguna, de modo que --resume reintenta las que faltan.
+    Si se pasa un DriverPool, la sesión se revisa antes de cada asignatura y, si el
+    pool la recicla o la reemplaza por una caída, se vuelve a abrir la tabla en la
+    sesión nueva (que queda en pool.active).
+
+    Returns:
+        bool: True si se procesaron todas las asignaturas pendientes de la unidad
+    """
+    from src.scraper import scrape_asignatura_from_driver
+    facultad, carrera, tipo_asignatura = unit
+    out_dir = output_dir_for(facultad)
+    os.makedirs(out_dir, exist_ok=True)
+    fallidas = []
+
+    if pool is not None:
+        extractor = pool.ensure(extractor, count=False)
+    if not open_results_table(extractor, unit, url):
+        return False
+
+    print("\n=== Intentando extracción principal ===")
+    asignaturas = extractor.extract_asignaturas()
+    if not asignaturas:
+        print(f"No se pudieron extraer asignaturas para la carrera {carrera}")
+        return False
+
+    # Reanudación: saltar las asignaturas terminadas en una ejecución anterior
+    hechas = journal.done_codes(unit) if journal is not None else set()
+    if hechas:
+        print(f"Reanudando {carrera}: {len(hechas)} asignaturas ya procesadas se omiten")
+
+    print(f"\n=== RESUMEN ({carrera}) ===")
+    print(f"Total de asignaturas extraídas: {len(asignaturas)}")
+    total_creditos = sum(a['creditos'] for a in asignaturas if isinstance(a['creditos'], int))
+    print(f"Total de créditos: {total_creditos}")
+
+    # Recorrer cada asignatura programada y hacer clic en el código
+    for idx, asignatura in enumerate(asignaturas, 1):
+        if asignatura['codigo'] in hechas:
+            continue
+        if pool is not None:
+            sesion = pool.ensure(extractor)
+            if sesion is not extractor:
+                # Sesión nueva: restaurar filtros y tabla antes de seguir
+                extractor = sesion
+                if not open_results_table(extractor, unit, url):
+                    return False
+        print(f"\n➡️ Procesando asignatura {idx}/{len(asignaturas)}: {asignatura['codigo']} - {asignatura['nombre']}")
+        # Reclamar el código antes de entrar: si otro bot ya lo hizo, se omiten los horarios
+        token = registry.claim(out_dir, asignatura['codigo']) if registry is not None else None
+        omitir_horarios = registry is not None and token is None
+        if omitir_horarios:
+            print(f"Asignatura {asignatura['codigo']} ya registrada por otro bot: se omiten horarios")
+        info = None
+        try:
+            # Buscar el enlace por código en la tabla actual
+            enlace = extractor.driver.find_element(By.LINK_TEXT, asignatura['codigo'])
+            extractor.safe_click(enlace)
+            # Esperar a que el detalle de la asignatura reemplace la tabla
+            wait_until(extractor.driver,
+                       EC.presence_of_element_located((By.CSS_SELECTOR, ".ocu-titulo h2")),
+                       "bot.abrir_detalle")
+
+            # Usar la función del modulo scraper y guardar por facultad
+            info = scrape_asignatura_from_driver(extractor.driver, output_dir=out_dir, writer_queue=writer_queue,
+                                                 parse_mode=parse_mode, omitir_horarios=omitir_horarios)
+
+            print(f"✅ Asignatura {asignatura['codigo']} procesada correctamente")
+            if info is not None and journal is not None:
+                after_delivery(writer_queue, functools.partial(journal.record_subject, unit, asignatura['codigo']))
+
+            # Vuelve a tabla de asignaturas
+            boton_atras = extractor.driver.find_element(By.CLASS_NAME, "af_button_text")
+            extractor.safe_click(boton_atras)
+            wait_for_staleness(extractor.driver, boton_atras, "bot.atras")
+            wait_for_rows(extractor.driver, "bot.tabla_recargada")
+        except Exception as e:
+            print(f"Error procesando asignatura: {e}")
+        finally:
+            if info is None:
+                fallidas.append(asignatura['codigo'])
+                # Si no se pudo extraer, liberar el código para que otro bot lo reintente
+                if registry is not None:
+                    registry.release(out_dir, asignatura['codigo'], token)
+
+    return finish_unit(unit, fallidas, journal, writer_queue)
+
+
+def finish_unit(unit, fallidas, journal=None, writer_queue=None):
+    """
+    Cierra una unidad: la anota como terminada en el diario sólo si no quedó
+    ninguna asignatura sin procesar; si no, queda pendiente para --resume, que
+    reintenta las que no están en done_codes. Como las asignaturas, la unidad se
+    anota cuando el writer confirma (ack) los lotes enviados hasta ahora por el
+    worker, es decir, cuando ya están en su journal (after_delivery). El lote
+    pendiente se envía aquí, sin esperar a llenarlo, para que la unidad no quede
+    sin anotar mientras el worker carga la siguiente.
+
+    Returns:
+        bool: True si la unidad quedó completa
+    """
+    completa = not fallidas
+    if not completa:
+        print(f"Unidad {unit[1]} ({unit[2]}) incompleta: {len(fallidas)} asignaturas sin procesar "
+              f"({', '.join(fallidas[:10])}{'...' if len(fallidas) > 10 else ''})")
+    elif journal is not None:
+        after_delivery(writer_queue, functools.partial(journal.record_unit_done, unit))
+    flush_sender(writer_queue, report=False)
+    return completa
+
+
+def process_work_unit_tabs(extractor, unit, n_tabs, writer_queue=None, url=URL_CATALOGO, parse_mode="driver",
+                           registry=None, journal=None, pool=None):
+    """
+    Variante de process_work_unit con un pool de pestañas del mismo navegador.
+
+    Los enlaces de la tabla son postbacks ADF (no tienen URL que abrir en otra
+    pestaña), así que cada pestaña es una vista propia del catálogo con los filtros
+    de la unidad. Se recorren en turno rotativo y cada visita hace un solo paso:
+    si la pestaña tenía un detalle abierto, se scrapea y se hace clic en volver
+    sin esperar a que la tabla se redibuje; si no, se espera a su tabla (que ya
+    tuvo una vuelta entera para redibujarse) y se hace clic en la siguiente
+    asignatura, sin esperar al detalle. Mientras se scrapea una pestaña, las demás
+    cargan su detalle o redibujan su tabla, de modo que la navegación de ida y
+    vuelta sale del camino crítico.
+
+    Antes de cada clic se comprueba la sesión con pool.ensure, como en
+    process_work_unit; si el pool la reemplaza, las asignaturas abiertas vuelven
+    a la cola y las pestañas se abren de nuevo en la sesión nueva. Una asignatura
+    que falla se reintenta TABS_REINTENTOS veces y después cuenta como fallida.
+
+    Returns:
+        bool: True si se procesaron todas las asignaturas pendientes de la unidad
+    """
+    from src.scraper import scrape_asignatura_from_driver
+    facultad, carrera, tipo_asignatura = unit
+    out_dir = output_dir_for(facultad)
+    os.makedirs(out_dir, exist_ok=True)
+    if pool is not None:
+        extractor = pool.ensure(extractor, count=False)
+    driver = extractor.driver
+
+    if not open_results_table(extractor, unit, url):
+        return False
+    asignaturas = extractor.extract_asignaturas()
+    if not asignaturas:
+        print(f"No se pudieron extraer asignaturas para la carrera {carrera}")
+        return False
+    hechas = journal.done_codes(unit) if journal is not None else set()
+    pendientes = [a for a in asignaturas if a['codigo'] not in hechas]
+    fallidas = []
+    intentos = {}
+    print(f"\n=== {len(pendientes)} asignaturas pendientes de {carrera} en hasta {n_tabs} pestañas ===")
+
+    # Por pestaña: (asignatura, token del registro, omitir_horarios) del detalle en curso
+    en_curso = {}
+
+    def reintentar(asignatura, token):
+        """Libera el código y devuelve la asignatura a la cola, o la da por fallida si ya se reintentó"""
+        if registry is not None:
+            registry.release(out_dir, asignatura['codigo'], token)
+        intentos[asignatura['codigo']] = intentos.get(asignatura['codigo'], 0) + 1
+        if intentos[asignatura['codigo']] <= TABS_REINTENTOS:
+            pendientes.append(asignatura)
+        else:
+            fallidas.append(asignatura['codigo'])
+
+    def lanzar(handle):
+        """
+        Hace clic en la siguiente pendiente desde la pestaña. Devuelve False si el
+        pool tuvo que reemplazar la sesión (caída o agotada): sus pestañas se
+        perdieron y hay que abrirlas de nuevo en la sesión nueva.
+        """
+        nonlocal extractor
+        if pool is not None:
+            sesion = pool.ensure(extractor, count=False)
+            if sesion is not extractor:
+                extractor = sesion
+                return False
+        asignatura = pendientes.pop(0)
+        token = registry.claim(out_dir, asignatura['codigo']) if registry is not None else None
+        omitir_horarios = registry is not None and token is None
+        try:
+            wait_for_rows(driver, "tabs.tabla")
+            enlace = driver.find_element(By.LINK_TEXT, asignatura['codigo'])
+            extractor.safe_click(enlace)
+            en_curso[handle] = (asignatura, token, omitir_horarios)
+        except Exception as e:
+            print(f"Error abriendo {asignatura['codigo']} en pestaña: {e}")
+            reintentar(asignatura, token)
+        return True
+
+    def terminar(handle):
+        asignatura, token, omitir_horarios = en_curso.pop(handle)
+        info = None
+        try:
+            print(f"\n➡️ Procesando asignatura {asignatura['codigo']} - {asignatura['nombre']}")
+            wait_until(driver,
+                       EC.text_to_be_present_in_element((By.CSS_SELECTOR, ".ocu-titulo h2"), f"({asignatura['codigo']})"),
+                       "tabs.abrir_detalle")
+            info = scrape_asignatura_from_driver(driver, output_dir=out_dir, writer_queue=writer_queue,
+                                                 parse_mode=parse_mode, omitir_horarios=omitir_horarios)
+            if info is not None and journal is not None:
+                after_delivery(writer_queue, functools.partial(journal.record_subject, unit, asignatura['codigo']))
+            if pool is not None:
+                pool.mark_page(extractor)
+            # Volver sin esperar: la tabla se redibuja mientras se atienden las otras pestañas
+            extractor.safe_click(driver.find_element(By.CLASS_NAME, "af_button_text"))
+            return True
+        except Exception as e:
+            print(f"Error procesando asignatura {asignatura['codigo']}: {e}")
+            return open_results_table(extractor, unit, url, reuse=False)
+        finally:
+            if info is None:
+                reintentar(asignatura, token)
+
+    sesion_nueva = False
+    while pendientes:
+        driver = extractor.driver
+        if sesion_nueva and not open_results_table(extractor, unit, url):
+            break
+        sesion_nueva = False
+        principal = driver.current_window_handle
+        pestanas = [principal]
+        for _ in range(min(n_tabs, len(pendientes)) - 1):
+            driver.switch_to.new_window('tab')
+            if open_results_table(extractor, unit, url):
+                pestanas.append(driver.current_window_handle)
+            else:
+                driver.close()
+                driver.switch_to.window(principal)
+
+        try:
+            while (pendientes or en_curso) and not sesion_nueva:
+                for handle in list(pestanas):
+                    driver.switch_to.window(handle)
+                    if handle in en_curso:
+                        if not terminar(handle) and handle != principal:
+                            # Pestaña irrecuperable: se cierra y el resto sigue con las pendientes
+                            pestanas.remove(handle)
+                            try:
+                                driver.close()
+                            except Exception:
+                                pass
+                        # La tabla se redibuja mientras se atienden las demás pestañas:
+                        # el clic en la siguiente asignatura queda para su próximo turno
+                        continue
+                    if pendientes and not lanzar(handle):
+                        sesion_nueva = True
+                        break
+        finally:
+            if sesion_nueva:
+                # La sesión anterior se cerró con sus pestañas: lo que tenían abierto vuelve a la cola
+                for asignatura, token, _ in en_curso.values():
+                    if registry is not None:
+                        registry.release(out_dir, asignatura['codigo'], token)
+                    pendientes.insert(0, asignatura)
+                en_curso.clear()
+            else:
+                for handle in pestanas:
+                    if handle != principal:
+                        try:
+                            driver.switch_to.window(handle)
+                            driver.close()
+                        except Exception:
+                            pass
+                driver.switch_to.window(principal)
+
+    fallidas.extend(a['codigo'] for a in pendientes)
+    return finish_unit(unit, fallidas, journal, writer_queue)
+
+
+def build_pool(headless=False, url=URL_CATALOGO, max_pages=DEFAULT_MAX_PAGES, max_rss_mb=DEFAULT_MAX_RSS_MB,
+               profile=DEFAULT_PROFILE):
+    """Crea el DriverPool del worker con una sesión ya abierta en el catálogo"""
+    factory = functools.partial(AsignaturaExtractor, 'src/chromedriver.exe', headless=headless, profile=profile)
+    pool = DriverPool(factory, size=1, max_pages=max_pages, max_rss_mb=max_rss_mb, warm_url=url)
+    pool.warm()
+    return pool
+
+
+def run_work_units(units, headless=False, writer_queue=None, url=URL_CATALOGO, parse_mode="driver",
+                   registry=None, db_path=None, journal_path=None,
+                   max_pages=DEFAULT_MAX_PAGES, max_rss_mb=DEFAULT_MAX_RSS_MB, profile=DEFAULT_PROFILE, tabs=1):
+    """
+    Ejecuta secuencialmente una lista de unidades de trabajo con las sesiones de un
+    único DriverPool.
+    """
+    from src.scraper import CODIGO_INDEX
+    CODIGO_INDEX.db_path = db_path
+    CODIGO_INDEX.preload({output_dir_for(unit[0]) for unit in units})
+    journal = ProgressJournal(journal_path) if journal_path else None
+    pool = build_pool(headless, url, max_pages, max_rss_mb, profile)
+
+    try:
+        for idx_unit, unit in enumerate(units, 1):
+            facultad, carrera, tipo_asignatura = unit
+            print(f"\n==============================")
+            print(f"Procesando unidad {idx_unit}/{len(units)}: {carrera} ({facultad}, {tipo_asignatura})")
+            try:
+                if tabs > 1:
+                    process_work_unit_tabs(pool.active, unit, tabs, writer_queue=writer_queue, url=url,
+                                           parse_mode=parse_mode, registry=registry, journal=journal, pool=pool)
+                else:
+                    process_work_unit(pool.active, unit, writer_queue=writer_queue, url=url, parse_mode=parse_mode,
+                                      registry=registry, journal=journal, pool=pool)
+            except Exception as e:
+                print(f"Error procesando la carrera {carrera}: {e}")
+
+    except Exception as e:
+        print(f"Error en la ejecución principal: {e}")
+
+    finally:
+        flush_sender(writer_queue)
+        print(WAIT_BUDGET.report())
+        print(pool.report())
+        pool.close()
+
+
+def run_worker(job_queue, headless=False, writer_queue=None, url=URL_CATALOGO, parse_mode="driver",
+               registry=None, db_path=None, journal_path=None,
+               max_pages=DEFAULT_MAX_PAGES, max_rss_mb=DEFAULT_MAX_RSS_MB, profile=DEFAULT_PROFILE, tabs=1):
+    """
+    Worker de la cola compartida: toma unidades de trabajo de job_queue hasta que
+    recibe el centinela, de modo que ningún navegador queda ocioso mientras
+    queden carreras pendientes. Es el punto de entrada de cada proceso worker
+    lanzado desde main.py. registry es un SubjectRegistry compartido por
+    todos los workers; db_path indica la base SQLite si el writer usa ese backend;
+    journal_path es el diario de progreso usado por --resume; max_pages y
+    max_rss_mb son los límites de reciclado de las sesiones del DriverPool,
+    profile el perfil de opciones de Chrome (src/browser_profiles.py) y tabs el
+    número de pestañas por navegador (process_work_unit_tabs si es mayor que 1).
+    """
+    from src.scraper import CODIGO_INDEX
+    CODIGO_INDEX.db_path = db_path
+    CODIGO_INDEX.preload(output_dir_for(cfg["facultad"]) for cfg in Facultades_Bot)
+    journal = ProgressJournal(journal_path) if journal_path else None
+    pool = build_pool(headless, url, max_pages, max_rss_mb, profile)
+    procesadas = 0
+
+    try:
+        for unit in iter_job_queue(job_queue):
+            procesadas += 1
+            print(f"\n==============================")
+            print(f"Procesando unidad #{procesadas}: {unit.carrera} ({unit.facultad}, {unit.tipo_asignatura})")
+            try:
+                if tabs > 1:
+                    process_work_unit_tabs(pool.active, unit, tabs, writer_queue=writer_queue, url=url,
+                                           parse_mode=parse_mode, registry=registry, journal=journal, pool=pool)
+                else:
+                    process_work_unit(pool.active, unit, writer_queue=writer_queue, url=url, parse_mode=parse_mode,
+                                      registry=registry, journal=journal, pool=pool)
+            except Exception as e:
+                print(f"Error procesando la carrera {unit.carrera}: {e}")
+
+    except Exception as e:
+        print(f"Error en la ejecución principal: {e}")
+
+    finally:
+        print(f"Worker terminado: {procesadas} unidades procesadas")
+        flush_sender(writer_queue)
+        print(WAIT_BUDGET.report())
+        print(pool.report())
+        pool.close()
+
+
+def main(headless=False, writer_queue=None, facultades=None):
+    """Ejecuta todas las unidades de trabajo (o las de las facultades indicadas) en este proceso"""
+    run_work_units(build_work_units(facultades), headless=headless, writer_queue=writer_queue)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Perfiles de opciones de Chrome para los bots.
+
+ - default: las opciones de siempre (ventana 1280x800, sin extensiones ni notificaciones).
+ - lean:    además bloquea imágenes y fuentes web, desactiva el tráfico en segundo
+            plano de Chrome (sincronización, actualizaciones de componentes,
+            métricas) y usa pageLoadStrategy 'eager', de modo que driver.get
+            vuelve en DOMContentLoaded sin esperar recursos que el scraper no lee.
+ - minimal: lean más bloqueo de hojas de estilo. Es opcional porque sin CSS cambia
+            la visibilidad de algunos elementos ADF; conviene probarlo antes con
+            el catálogo local (src/standin.py).
+
+Las imágenes se bloquean con las preferencias de contenido de Chrome; fuentes y
+CSS, con Network.setBlockedURLs de CDP una vez creado el driver (apply_profile).
+"""
+from selenium import webdriver
+
+PROFILES = ("default", "lean", "minimal")
+DEFAULT_PROFILE = "default"
+
+BASE_ARGS = [
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-notifications",
+    "--disable-infobars",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--window-size=1280,800",
+]
+
+LEAN_ARGS = [
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-domain-reliability",
+    "--disable-client-side-phishing-detection",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+]
+
+# 2 = bloquear
+LEAN_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+
+BLOCKED_FONTS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+BLOCKED_IMAGES = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp"]
+BLOCKED_CSS = ["*.css"]
+
+
+def check_profile(profile):
+    if profile not in PROFILES:
+        raise ValueError(f"Perfil de navegador inválido: {profile} (opciones: {PROFILES})")
+
+
+def chrome_options(profile=DEFAULT_PROFILE, headless=False):
+    """
+    Construye las ChromeOptions del perfil.
+
+    Args:
+        profile (str): 'default', 'lean' o 'minimal'
+        headless (bool): Si True, ejecuta Chrome sin interfaz gráfica
+
+    Returns:
+        webdriver.ChromeOptions
+    """
+    check_profile(profile)
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    for arg in BASE_ARGS:
+        options.add_argument(arg)
+    if profile != "default":
+        for arg in LEAN_ARGS:
+            options.add_argument(arg)
+        options.add_experimental_option("prefs", LEAN_PREFS)
+        options.page_load_strategy = "eager"
+    return options
+
+
+def blocked_urls(profile):
+    """Patrones de URL que el perfil bloquea vía CDP"""
+    check_profile(profile)
+    if profile == "default":
+        return []
+    patrones = BLOCKED_IMAGES + BLOCKED_FONTS
+    if profile == "minimal":
+        patrones += BLOCKED_CSS
+    return patrones
+
+
+def apply_profile(driver, profile=DEFAULT_PROFILE):
+    """
+    Aplica al driver ya creado la parte del perfil que no se puede expresar con
+    opciones (bloqueo de URLs por CDP). Si el driver no soporta CDP se ignora.
+    """
+    patrones = blocked_urls(profile)
+    if not patrones:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patrones})
+    except Exception as e:
+        print(f"No se pudo aplicar el bloqueo de recursos del perfil {profile}: {e}")
@@ -0,0 +1,81 @@
+"""
+Diario de progreso (checkpoint) de una ejecución de scraping.
+
+Archivo JSONL de sólo anexado compartido por todos los workers. Cada línea registra
+una asignatura terminada de una unidad de trabajo (facultad, carrera, tipo) o el
+fin de la unidad completa. `python main.py --resume` lo usa para saltar las
+unidades terminadas y, dentro de una unidad interrumpida, las asignaturas que ya
+se entregaron al writer.
+"""
+import json
+import os
+from typing import Dict, Set, Tuple
+
+DEFAULT_JOURNAL = os.path.join('Data', 'progress.jsonl')
+
+
+def _unit_key(unit) -> Tuple[str, str, str]:
+    facultad, carrera, tipo_asignatura = unit
+    return (facultad, carrera, tipo_asignatura)
+
+
+class ProgressJournal:
+    def __init__(self, path: str = DEFAULT_JOURNAL):
+        self.path = path
+
+    def reset(self):
+        """Empieza un diario vacío (ejecución nueva, sin --resume)"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        open(self.path, 'w', encoding='utf-8').close()
+
+    def _append(self, record: dict):
+        # Una línea por write con O_APPEND: las líneas de distintos procesos no se mezclan
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def record_subject(self, unit, codigo: str):
+        facultad, carrera, tipo_asignatura = _unit_key(unit)
+        self._append({'facultad': facultad, 'carrera': carrera, 'tipo': tipo_asignatura, 'codigo': codigo})
+
+    def record_unit_done(self, unit):
+        facultad, carrera, tipo_asignatura = _unit_key(unit)
+        self._append({'facultad': facultad, 'carrera': carrera, 'tipo': tipo_asignatura, 'done': True})
+
+    def load(self) -> Tuple[Set[Tuple[str, str, str]], Dict[Tuple[str, str, str], Set[str]]]:
+        """
+        Lee el diario.
+
+        Returns:
+            (unidades terminadas, códigos terminados por unidad)
+        """
+        done_units = set()
+        done_codes = {}
+        if not os.path.exists(self.path):
+            return done_units, done_codes
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    key = (record['facultad'], record['carrera'], record['tipo'])
+                except (ValueError, KeyError):
+                    # línea incompleta por una caída a mitad de escritura
+                    continue
+                if record.get('done'):
+                    done_units.add(key)
+                elif record.get('codigo'):
+                    done_codes.setdefault(key, set()).add(record['codigo'])
+        return done_units, done_codes
+
+    def pending_units(self, units):
+        """Filtra las unidades que no están marcadas como terminadas"""
+        done_units, _ = self.load()
+        return [u for u in units if _unit_key(u) not in done_units]
+
+    def done_codes(self, unit) -> Set[str]:
+        _, done_codes = self.load()
+        return done_codes.get(_unit_key(unit), set())
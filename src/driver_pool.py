@@ -0,0 +1,205 @@
+"""
+Pool de sesiones de navegador para los bots.
+
+Cada worker toma sus sesiones (AsignaturaExtractor) de un DriverPool en lugar de
+crear un único Chrome para toda la ejecución. Entre asignaturas el bot llama a
+`ensure`, que comprueba que la sesión responde y la recicla cuando:
+
+ - lleva `max_pages` páginas de detalle procesadas, o
+ - la memoria de Chrome (chromedriver y sus procesos hijos) supera `max_rss_mb`
+   (sólo si psutil está instalado), o
+ - la sesión dejó de responder (Chrome caído, ventana cerrada).
+
+Las sesiones se entregan "calientes": el pool las crea con antelación y abre la
+URL del catálogo, de modo que el reemplazo no paga el arranque en frío. Tras
+cada entrega (la primera, un reciclado o un reemplazo) un hilo de fondo crea la
+siguiente sesión de reserva mientras el bot sigue trabajando.
+"""
+import threading
+
+try:
+    import psutil
+except ImportError:  # el reciclado por memoria es opcional
+    psutil = None
+
+DEFAULT_MAX_PAGES = 300
+DEFAULT_MAX_RSS_MB = 1500
+
+
+class DriverPool:
+    def __init__(self, factory, size=1, max_pages=DEFAULT_MAX_PAGES, max_rss_mb=DEFAULT_MAX_RSS_MB,
+                 warm_url=None):
+        """
+        Args:
+            factory: callable sin argumentos que crea un AsignaturaExtractor
+            size: sesiones de reserva que se mantienen calientes
+            max_pages: páginas por sesión antes de reciclarla (0 = sin límite)
+            max_rss_mb: memoria de Chrome en MB antes de reciclar (0 = sin límite)
+            warm_url: URL que se abre al crear cada sesión
+        """
+        self.factory = factory
+        self.size = max(0, size)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.warm_url = warm_url
+        self.idle = []
+        self.active = None
+        self.pages = {}
+        self.stats = {'creadas': 0, 'recicladas': 0, 'caidas': 0}
+        # idle y el hilo de reposición se comparten con ese hilo
+        self.lock = threading.Lock()
+        self.refill_thread = None
+        self.closed = False
+
+    def _create(self):
+        extractor = self.factory()
+        with self.lock:
+            self.stats['creadas'] += 1
+        if self.warm_url:
+            try:
+                extractor.driver.get(self.warm_url)
+            except Exception as e:
+                print(f"[pool] No se pudo precargar {self.warm_url}: {e}")
+        self.pages[id(extractor)] = 0
+        return extractor
+
+    def warm(self):
+        """Crea las sesiones de reserva que falten (en el hilo que llama)"""
+        while not self.closed:
+            with self.lock:
+                if len(self.idle) >= self.size:
+                    return
+            extractor = self._create()
+            with self.lock:
+                if not self.closed:
+                    self.idle.append(extractor)
+                    continue
+            # El pool se cerró mientras se creaba
+            self._discard(extractor)
+            return
+
+    def refill(self):
+        """Repone la reserva en un hilo de fondo, sin bloquear al bot (un hilo a la vez)"""
+        with self.lock:
+            if self.closed or len(self.idle) >= self.size:
+                return
+            if self.refill_thread is not None and self.refill_thread.is_alive():
+                return
+            self.refill_thread = threading.Thread(target=self._refill, name='pool-refill', daemon=True)
+            self.refill_thread.start()
+
+    def _refill(self):
+        try:
+            self.warm()
+        except Exception as e:
+            print(f"[pool] No se pudo crear la sesión de reserva: {e}")
+
+    def acquire(self):
+        """
+        Entrega una sesión sana de la reserva (si se está creando una, la espera) o
+        una nueva, y repone la reserva en segundo plano
+        """
+        while True:
+            with self.lock:
+                extractor = self.idle.pop() if self.idle else None
+                hilo = self.refill_thread
+            if extractor is None:
+                if hilo is not None and hilo.is_alive():
+                    hilo.join()
+                    continue
+                break
+            if self.is_healthy(extractor):
+                self.active = extractor
+                self.refill()
+                return extractor
+            self.stats['caidas'] += 1
+            self._discard(extractor)
+        self.active = self._create()
+        self.refill()
+        return self.active
+
+    def is_healthy(self, extractor):
+        try:
+            return extractor.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def rss_mb(self, extractor):
+        """Memoria residente de chromedriver y Chrome en MB (None sin psutil)"""
+        if psutil is None:
+            return None
+        try:
+            proc = psutil.Process(extractor.driver.service.process.pid)
+            procs = [proc] + proc.children(recursive=True)
+            total = 0
+            for p in procs:
+                try:
+                    total += p.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total / (1024 * 1024)
+        except Exception:
+            return None
+
+    def _agotada(self, extractor):
+        if self.max_pages and self.pages.get(id(extractor), 0) >= self.max_pages:
+            return True
+        if self.max_rss_mb:
+            rss = self.rss_mb(extractor)
+            if rss is not None and rss > self.max_rss_mb:
+                return True
+        return False
+
+    def ensure(self, extractor, count=True):
+        """
+        Se llama antes de cada página de detalle. Si la sesión está caída o agotada
+        la reemplaza por una caliente y, con count=True, le cuenta la página.
+
+        Returns:
+            La misma sesión si sigue sirviendo, o la nueva. Si es otra, el estado
+            de la página (filtros, tabla) se perdió y el llamador debe restaurarlo.
+        """
+        if extractor is None:
+            extractor = self.acquire()
+        elif not self.is_healthy(extractor):
+            print("[pool] La sesión del navegador no responde: se reemplaza")
+            self.stats['caidas'] += 1
+            self._discard(extractor)
+            extractor = self.acquire()
+        elif self._agotada(extractor):
+            print(f"[pool] Reciclando sesión tras {self.pages.get(id(extractor), 0)} páginas")
+            self.stats['recicladas'] += 1
+            self._discard(extractor)
+            extractor = self.acquire()
+        if count:
+            self.mark_page(extractor)
+        self.active = extractor
+        return extractor
+
+    def mark_page(self, extractor):
+        """Cuenta una página de detalle de la sesión para el reciclado por max_pages"""
+        self.pages[id(extractor)] = self.pages.get(id(extractor), 0) + 1
+
+    def _discard(self, extractor):
+        self.pages.pop(id(extractor), None)
+        try:
+            extractor.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            hilo = self.refill_thread
+        if hilo is not None:
+            # La sesión que esté creando se descarta al terminar
+            hilo.join()
+        if self.active is not None:
+            self._discard(self.active)
+            self.active = None
+        while self.idle:
+            self._discard(self.idle.pop())
+
+    def report(self):
+        return (f"[pool] Sesiones creadas: {self.stats['creadas']}, recicladas: {self.stats['recicladas']}, "
+                f"reemplazadas por caída: {self.stats['caidas']}")
@@ -0,0 +1,347 @@
+"""
+Cliente HTTP del catálogo local (src/standin.py), sin navegador.
+
+Herramienta de pruebas y benchmarks, no un motor de producción: main.py no lo
+ofrece como --engine. benchmarks/run.py --stages engines lo usa para medir el
+parser y la cola del writer sin Chrome.
+
+Envía las peticiones de formulario / partial page refresh (PPR) equivalentes a
+lo que hace un bot de Selenium: cambiar los selects de filtros
+(`pt1:r1:0:soc1..soc4`), pulsar Mostrar, abrir una asignatura, expandir sus
+grupos y volver a la tabla. Usa una requests.Session con pool de conexiones que
+conserva las cookies de sesión y el `javax.faces.ViewState`, y pasa el HTML
+devuelto a src/parser.py, el mismo parser del modo --parse-mode html. Las
+respuestas `<partial-response>` se desenvuelven de sus secciones CDATA.
+
+Limitación: los eventos siguen el protocolo simplificado del catálogo local:
+POST del formulario con los selects (valor = índice de la opción), `event` y
+`target` y la cabecera `Adf-Rich-Message: true`. No es la codificación real de
+los partial submits de ADF (valores reales de los selects, campos
+`source`/`event` con su payload), que no se ha podido reproducir ni probar
+contra el SIA. Por eso start() rechaza cualquier servidor que no envíe la
+cabecera de protocolo del stand-in.
+
+Uso:
+    python -m benchmarks.run --stages engines
+"""
+import functools
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+import requests
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.bot import URL_CATALOGO, finish_unit
+from src.checkpoint import ProgressJournal
+from src.ipc import after_delivery, flush_sender
+from src.parser import _has_class, parse_asignatura_tree, parse_html, parse_resultados
+from src.scheduler import iter_job_queue, output_dir_for
+from src.standin import PROTOCOL_HEADER, PROTOCOL_VERSION
+from src.utils import Facultades_Bot
+
+REGION = "pt1:r1"
+VIEW_STATE = "javax.faces.ViewState"
+SELECTS = {'nivel': 'soc1', 'sede': 'soc9', 'facultad': 'soc2', 'carrera': 'soc3', 'tipo': 'soc4'}
+EVENT_MOSTRAR = "pt1:r1:0:cb1"
+EVENT_ATRAS = "pt1:r1:0:cb2"
+
+
+def unwrap_partial(text: str) -> str:
+    """Contenido HTML de una respuesta PPR (`<partial-response>` con CDATA) o el texto tal cual"""
+    if '<partial-response' not in text:
+        return text
+    return ''.join(re.findall(r'<!\[CDATA\[(.*?)\]\]>', text, re.S))
+
+
+def parse_fragment(fragment: str):
+    """Árbol lxml de un fragmento HTML, dentro de un div contenedor"""
+    return lxml_html.fragment_fromstring(fragment or '', create_parent='div')
+
+
+class AdfHttpClient:
+    """Sesión HTTP contra el catálogo: una vista ADF (ViewState) con su estado de filtros"""
+
+    def __init__(self, url=URL_CATALOGO, session=None, timeout=30, pool_size=4, retries=2, throttle=None):
+        """
+        Args:
+            url: URL del catálogo local de src/standin.py (el SIA real no es compatible)
+            session: requests.Session a reutilizar (por defecto una nueva con pool)
+            throttle: callable sin argumentos invocado antes de cada petición (límite de tasa)
+        """
+        self.url = url
+        self.timeout = timeout
+        self.throttle = throttle
+        self.session = session or self._build_session(pool_size, retries)
+        self.view_state = None
+        self.protocol = None
+        self.fields: Dict[str, str] = {}
+        self.options: Dict[str, List] = {}
+        self.stats = {'peticiones': 0, 'segundos': 0.0}
+
+    @staticmethod
+    def _build_session(pool_size, retries):
+        session = requests.Session()
+        # Reintentar sólo errores de conexión: repetir un POST ya recibido cambiaría el estado de la vista
+        retry = Retry(total=retries, connect=retries, read=0, status=0, backoff_factor=0.3)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'Accept-Language': 'es-CO,es;q=0.9'})
+        return session
+
+    def _request(self, method, **kwargs):
+        if self.throttle is not None:
+            self.throttle()
+        t0 = time.perf_counter()
+        try:
+            response = self.session.request(method, self.url, timeout=self.timeout, **kwargs)
+            response.raise_for_status()
+            self.protocol = response.headers.get(PROTOCOL_HEADER)
+            return response.text
+        finally:
+            self.stats['peticiones'] += 1
+            self.stats['segundos'] += time.perf_counter() - t0
+
+    def _update_form(self, tree):
+        """Toma el ViewState y los selects (valor y opciones) presentes en el árbol"""
+        vs = tree.xpath(f".//input[@name='{VIEW_STATE}']/@value")
+        if vs:
+            self.view_state = vs[0]
+        for select in tree.xpath(".//select[@name]"):
+            name = select.get('name')
+            opciones = [(o.get('value', ''), ' '.join(o.text_content().split())) for o in select.xpath(".//option")]
+            self.options[name] = opciones
+            elegida = select.xpath(".//option[@selected]/@value")
+            self.fields[name] = elegida[0] if elegida else ''
+
+    def start(self):
+        """Abre una vista nueva del catálogo (GET), como driver.get(url)"""
+        self.fields = {}
+        self.options = {}
+        tree = parse_html(self._request('GET'))
+        if self.protocol != PROTOCOL_VERSION:
+            raise RuntimeError(f"{self.url} no es el catálogo local (src/standin.py): el motor HTTP sólo implementa "
+                               f"su protocolo simplificado, no el de ADF del SIA real; usa --engine selenium")
+        self._update_form(tree)
+        if not self.view_state:
+            raise RuntimeError("La página del catálogo no tiene javax.faces.ViewState")
+        return tree
+
+    def post(self, event, target=REGION):
+        """Envía un evento ADF como partial page refresh y devuelve el fragmento HTML"""
+        data = dict(self.fields)
+        data.update({VIEW_STATE: self.view_state, 'event': event, 'target': target})
+        return unwrap_partial(self._request('POST', data=data, headers={'Adf-Rich-Message': 'true'}))
+
+    def post_region(self, event):
+        """Evento cuyo PPR reemplaza la región principal; actualiza el formulario"""
+        tree = parse_fragment(self.post(event))
+        self._update_form(tree)
+        return tree
+
+    def select(self, campo, texto):
+        """
+        Elige la opción con texto visible `texto` en el select del filtro `campo`.
+        Si ya está seleccionada no envía nada (los dependientes de un select que sí
+        cambió llegan reiniciados en el fragmento, así que nunca coinciden).
+
+        Returns:
+            bool: True si se envió el evento
+        """
+        name = f"pt1:r1:0:{SELECTS[campo]}"
+        valor = next((v for v, t in self.options.get(name, []) if t == texto), None)
+        if valor is None:
+            raise ValueError(f"Opción '{texto}' no disponible en {name}")
+        if self.fields.get(name) == valor:
+            return False
+        self.fields[name] = valor
+        self.post_region(name)
+        return True
+
+    def has_filters(self):
+        """True si la vista actual tiene los selects de filtros (tabla o filtros, no un detalle)"""
+        return bool(self.view_state) and f"pt1:r1:0:{SELECTS['nivel']}" in self.options
+
+    def configure_filters(self, nivel_estudio="Pregrado", sede="1102 SEDE MEDELLÍN",
+                          facultad="3068 FACULTAD DE MINAS", carrera=str,
+                          tipo_asignatura="TODAS MENOS LIBRE ELECCIÓN"):
+        """Mismos filtros que AsignaturaExtractor.configure_filters, como eventos PPR"""
+        try:
+            for campo, texto in (('nivel', nivel_estudio), ('sede', sede), ('facultad', facultad),
+                                 ('carrera', carrera), ('tipo', tipo_asignatura)):
+                self.select(campo, texto)
+            return True
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error configurando filtros: {e}")
+            return False
+
+    def mostrar(self) -> List[Dict]:
+        """Pulsa Mostrar y devuelve las filas de la tabla de resultados"""
+        return parse_resultados(self.post_region(EVENT_MOSTRAR))
+
+    def open_detalle(self, indice):
+        """Abre el detalle de la fila `indice` y devuelve su árbol"""
+        return parse_fragment(self.post(f"pt1:r1:0:tb3:{indice}:cl1"))
+
+    def expand_grupos(self, tree):
+        """Pide el contenido de cada grupo sin expandir y lo inserta en el árbol del detalle"""
+        headers = tree.xpath(f".//*[{_has_class('af_showDetailHeader')}][.//*[{_has_class('undisclosed')}]]")
+        for header in headers:
+            source = header.get('id')
+            if not source:
+                continue
+            body_id = f"{source}::body"
+            cuerpo = tree.xpath(f".//*[@id='{body_id}']")
+            if not cuerpo:
+                continue
+            contenido = parse_fragment(self.post(source, target=body_id))
+            body = cuerpo[0]
+            for hijo in list(body):
+                body.remove(hijo)
+            body.text = contenido.text
+            body.extend(list(contenido))
+        return len(headers)
+
+    def back(self):
+        """Vuelve del detalle a la tabla de resultados"""
+        return parse_resultados(self.post_region(EVENT_ATRAS))
+
+    def report(self):
+        media = self.stats['segundos'] / self.stats['peticiones'] * 1000 if self.stats['peticiones'] else 0
+        return f"[http] {self.stats['peticiones']} peticiones, {self.stats['segundos']:.1f}s en red ({media:.0f} ms/petición)"
+
+    def close(self):
+        self.session.close()
+
+
+def open_results(client, unit, reuse=True) -> Optional[List[Dict]]:
+    """
+    Filtros de la unidad aplicados en la vista del cliente; devuelve las filas de
+    la tabla o None. Con reuse=True se reutiliza la vista actual (sólo cambian los
+    selects distintos); si no hay vista o reuse=False se abre una nueva.
+    """
+    facultad, carrera, tipo_asignatura = unit
+    if reuse and client.has_filters():
+        if client.configure_filters(facultad=facultad, carrera=carrera, tipo_asignatura=tipo_asignatura):
+            filas = client.mostrar()
+            if filas:
+                return filas
+        print("No se pudo reutilizar la vista: se abre una nueva")
+    print(f"Abriendo catálogo: {client.url}")
+    client.start()
+    if not client.configure_filters(facultad=facultad, carrera=carrera, tipo_asignatura=tipo_asignatura):
+        print(f"No se pudieron configurar los filtros para la carrera {carrera}")
+        return None
+    filas = client.mostrar()
+    if not filas:
+        print(f"No se pudo cargar la tabla de resultados para la carrera {carrera}")
+        return None
+    return filas
+
+
+def process_subject_http(client, unit, asignatura, writer_queue=None, registry=None, journal=None):
+    """
+    Extrae una asignatura de la tabla abierta en `client` y la entrega al writer.
+    Deja la vista de nuevo en la tabla de resultados (o en una vista nueva con los
+    mismos filtros si algo falló).
+
+    Returns:
+        Dict con la información extraída, o None si no se pudo extraer
+    """
+    from src.scraper import CODIGO_INDEX, deliver_asignatura_info
+    out_dir = output_dir_for(unit[0])
+    token = registry.claim(out_dir, asignatura['codigo']) if registry is not None else None
+    omitir_horarios = registry is not None and token is None
+    info = None
+    try:
+        tree = client.open_detalle(asignatura['indice'])
+        codigo_existe = CODIGO_INDEX.contains(out_dir, asignatura['codigo'])
+        omitir_horarios = omitir_horarios or codigo_existe
+        if not omitir_horarios:
+            client.expand_grupos(tree)
+        extraida = parse_asignatura_tree(tree, omitir_horarios=omitir_horarios)
+        if not extraida.get('codigo'):
+            extraida = None
+        deliver_asignatura_info(extraida, out_dir, writer_queue, codigo_existe, omitir_horarios)
+        # Entregada: cuenta como procesada aunque falle la vuelta a la tabla
+        info = extraida
+        if info is not None and journal is not None:
+            after_delivery(writer_queue, functools.partial(journal.record_subject, unit, asignatura['codigo']))
+        client.back()
+    except Exception as e:
+        print(f"Error procesando asignatura {asignatura['codigo']}: {e}")
+        # La vista quedó en un estado desconocido: abrir una nueva con los mismos filtros
+        if open_results(client, unit, reuse=False) is None:
+            raise RuntimeError(f"No se pudo recuperar la vista de {unit[1]}") from e
+    finally:
+        if info is None and registry is not None:
+            registry.release(out_dir, asignatura['codigo'], token)
+    return info
+
+
+def pending_subjects(filas, unit, journal=None):
+    """Asignaturas programadas de la tabla que no están ya en el diario de progreso"""
+    asignaturas = [f for f in filas if not f['sin_programar']]
+    print(f"Se encontraron {len(filas)} filas, {len(asignaturas)} asignaturas programadas ({unit[1]})")
+    hechas = journal.done_codes(unit) if journal is not None else set()
+    if hechas:
+        print(f"Reanudando {unit[1]}: {len(hechas)} asignaturas ya procesadas se omiten")
+    return [a for a in asignaturas if a['codigo'] not in hechas]
+
+
+def process_work_unit_http(client, unit, writer_queue=None, registry=None, journal=None):
+    """
+    Equivalente HTTP de bot.process_work_unit: configura los filtros, recorre la
+    tabla de resultados y extrae cada asignatura programada, con el mismo uso del
+    SubjectRegistry, el ProgressJournal y el writer central.
+
+    Returns:
+        bool: True si se procesaron todas las asignaturas pendientes de la unidad
+    """
+    os.makedirs(output_dir_for(unit[0]), exist_ok=True)
+    filas = open_results(client, unit)
+    if filas is None:
+        return False
+    asignaturas = pending_subjects(filas, unit, journal)
+    fallidas = []
+
+    for idx, asignatura in enumerate(asignaturas, 1):
+        print(f"\n➡️ Procesando asignatura {idx}/{len(asignaturas)}: {asignatura['codigo']} - {asignatura['nombre']}")
+        try:
+            if process_subject_http(client, unit, asignatura, writer_queue, registry, journal) is None:
+                fallidas.append(asignatura['codigo'])
+        except RuntimeError as e:
+            print(e)
+            return False
+
+    return finish_unit(unit, fallidas, journal, writer_queue)
+
+
+def run_http_worker(job_queue, writer_queue=None, url=URL_CATALOGO, registry=None, db_path=None,
+                    journal_path=None):
+    """Worker de la cola compartida con el motor HTTP (mismos argumentos que bot.run_worker, sin navegador)"""
+    from src.scraper import CODIGO_INDEX
+    CODIGO_INDEX.db_path = db_path
+    CODIGO_INDEX.preload(output_dir_for(cfg["facultad"]) for cfg in Facultades_Bot)
+    journal = ProgressJournal(journal_path) if journal_path else None
+    client = AdfHttpClient(url)
+    procesadas = 0
+
+    try:
+        for unit in iter_job_queue(job_queue):
+            procesadas += 1
+            print(f"\n==============================")
+            print(f"Procesando unidad #{procesadas}: {unit.carrera} ({unit.facultad}, {unit.tipo_asignatura})")
+            try:
+                process_work_unit_http(client, unit, writer_queue=writer_queue, registry=registry, journal=journal)
+            except Exception as e:
+                print(f"Error procesando la carrera {unit.carrera}: {e}")
+    finally:
+        print(f"Worker HTTP terminado: {procesadas} unidades procesadas")
+        flush_sender(writer_queue)
+        print(client.report())
+        client.close()
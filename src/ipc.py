@@ -0,0 +1,320 @@
+"""
+Canal entre los workers y el writer central.
+
+Antes cada `put` de un worker pasaba por el proceso servidor de
+multiprocessing.Manager(): el dict `info` se serializaba hacia el Manager y
+de nuevo hacia el writer. Ahora la cola del writer es un
+multiprocessing.Queue directo (un pipe con un hilo alimentador por proceso) y
+cada worker envía a través de un BatchingSender:
+
+ - agrupa hasta `batch_size` mensajes 'asignatura' en un único mensaje
+   {'type': 'batch', 'messages': [...]} (un pickle y una escritura en el pipe
+   por lote). No hay temporizador: `linger` sólo se comprueba en put, que envía
+   el lote incompleto si el mensaje más antiguo lleva ya `linger` segundos
+   esperando; el resto lo envía flush_sender al terminar cada unidad
+   (bot.finish_unit) y cada worker;
+ - la cola tiene `maxsize`, de modo que si el writer se retrasa los workers se
+   bloquean en el put (contrapresión) en lugar de acumular memoria; tras
+   `put_timeout` segundos sin hueco el envío falla con queue.Full.
+
+Los mensajes de control ('flush', 'shutdown') vacían antes el lote pendiente.
+El lote vive en la memoria del worker: run_worker, run_http_worker y
+run_async_worker lo vacían al terminar (flush_sender). Si un envío falla, el
+lote vuelve a quedar pendiente y el error llega al llamador.
+
+Lo que depende de que una asignatura haya llegado al writer (anotarla en el
+diario de progreso) se registra con after_delivery. Con una cola de acks
+(main.py da una a cada worker) cada lote lleva un id y el writer lo confirma
+por esa cola después de anotarlo en su journal; los callbacks se ejecutan al
+leer el ack, no al entrar el lote en la cola. Si el worker o el writer mueren
+antes, la asignatura no queda anotada y --resume la vuelve a extraer. Sin cola
+de acks (benchmarks, colas simples) se ejecutan al entrar el lote en la cola.
+
+`--ipc manager` conserva la cola del Manager para comparar
+(benchmarks/run.py --stages ipc).
+
+Con `--writer-shards N` hay N writers, cada uno con su cola, y un ShardedQueue
+reparte los mensajes por output_dir: cada carpeta de facultad la escribe
+siempre el mismo writer, de modo que la estructura en disco no cambia.
+"""
+import collections
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+import time
+import zlib
+
+from src.scheduler import output_dir_for
+from src.utils import Facultades_Bot
+
+IPC_KINDS = ("direct", "manager")
+DEFAULT_IPC = "direct"
+DEFAULT_BATCH = 8
+DEFAULT_LINGER = 0.5
+DEFAULT_MAXSIZE = 256
+DEFAULT_PUT_TIMEOUT = 120
+
+
+def make_writer_queue(kind=DEFAULT_IPC, maxsize=DEFAULT_MAXSIZE, manager=None):
+    """
+    Crea la cola del writer.
+
+    Args:
+        kind (str): 'direct' (multiprocessing.Queue acotada) o 'manager' (proxy de Manager)
+        maxsize (int): capacidad de la cola directa en mensajes (lotes), 0 = sin límite
+        manager: multiprocessing.Manager ya iniciado, necesario con kind='manager'
+    """
+    if kind not in IPC_KINDS:
+        raise ValueError(f"Canal IPC inválido: {kind} (opciones: {IPC_KINDS})")
+    if kind == "manager":
+        if manager is None:
+            manager = multiprocessing.Manager()
+        return manager.Queue()
+    return multiprocessing.Queue(maxsize=max(0, int(maxsize)))
+
+
+# Carpetas de Facultades_Bot en orden: se reparten en turno rotativo entre los writers
+FACULTAD_DIRS = {os.path.normpath(output_dir_for(cfg['facultad'])): i for i, cfg in enumerate(Facultades_Bot)}
+
+
+def shard_for(output_dir, n_shards) -> int:
+    """
+    Writer que atiende un output_dir. Las facultades configuradas se reparten en
+    turno rotativo (con 5 facultades y 2 writers, 3 y 2); cualquier otra carpeta
+    por crc32, estable entre procesos a diferencia de hash().
+    """
+    if n_shards <= 1:
+        return 0
+    path = os.path.normpath(output_dir or 'Data')
+    if path in FACULTAD_DIRS:
+        return FACULTAD_DIRS[path] % n_shards
+    return zlib.crc32(path.encode('utf-8')) % n_shards
+
+
+def shard_journal_path(path, shard, n_shards):
+    """Journal del writer `shard`: Data/.writer-journal.jsonl -> Data/.writer-journal.1.jsonl"""
+    if not path or n_shards <= 1:
+        return path
+    base, ext = os.path.splitext(path)
+    return f"{base}.{shard}{ext}"
+
+
+class ShardedQueue:
+    """
+    Router hacia las colas de varios writers con la interfaz put() de una cola:
+    'asignatura' va a la cola de su output_dir, un 'batch' se divide en un lote
+    por writer y los mensajes de control ('flush', 'shutdown') van a todos.
+    """
+
+    def __init__(self, queues):
+        self.queues = list(queues)
+
+    def put(self, msg, block=True, timeout=None):
+        """Devuelve el número de mensajes encolados (un lote dividido recibe un ack por writer)"""
+        n = len(self.queues)
+        t = msg.get('type')
+        if t == 'asignatura':
+            self.queues[shard_for(msg.get('output_dir'), n)].put(msg, block, timeout)
+            return 1
+        if t == 'batch':
+            lotes = {}
+            for m in msg.get('messages') or []:
+                lotes.setdefault(shard_for(m.get('output_dir'), n), []).append(m)
+            for shard, mensajes in lotes.items():
+                parte = {'type': 'batch', 'messages': mensajes}
+                if 'ack' in msg:
+                    parte['ack'] = msg['ack']
+                self.queues[shard].put(parte, block, timeout)
+            return len(lotes)
+        for q in self.queues:
+            q.put(msg, block, timeout)
+        return n
+
+
+class BatchingSender:
+    """
+    Envoltorio de la cola del writer con la misma interfaz put() que usa el
+    scraper. Se pasa a cada proceso worker como writer_queue: al serializarse
+    viaja sólo la cola, de modo que cada proceso tiene su propio lote vacío.
+    Es seguro entre hilos (el motor async entrega desde varios hilos).
+
+    Con `ack_queue` (with_acks) los callbacks de after_send esperan al ack del
+    writer para su lote y de todos los anteriores; los acks se leen en cada put,
+    after_send y flush.
+    """
+
+    def __init__(self, queue, batch_size=DEFAULT_BATCH, linger=DEFAULT_LINGER, put_timeout=DEFAULT_PUT_TIMEOUT,
+                 ack_queue=None, ack_slot=None):
+        self.queue = queue
+        self.batch_size = max(1, int(batch_size))
+        self.linger = linger
+        self.put_timeout = put_timeout
+        self.ack_queue = ack_queue
+        self.ack_slot = ack_slot
+        self._init_local()
+
+    def _init_local(self):
+        self.pending = []
+        self.first_pending = None
+        self.callbacks = []
+        # lotes enviados sin ack, en orden: id -> [partes sin ack, callbacks]
+        self.unacked = collections.OrderedDict()
+        self.next_batch = 0
+        self.lock = threading.Lock()
+        self.stats = {'mensajes': 0, 'envios': 0, 'espera_s': 0.0}
+
+    def __getstate__(self):
+        return {'queue': self.queue, 'batch_size': self.batch_size, 'linger': self.linger,
+                'put_timeout': self.put_timeout, 'ack_queue': self.ack_queue, 'ack_slot': self.ack_slot}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_local()
+
+    def with_acks(self, ack_queue, ack_slot):
+        """Copia del sender que recibe los acks del writer por ack_queue; ack_slot la identifica ante el writer"""
+        return BatchingSender(self.queue, self.batch_size, self.linger, self.put_timeout, ack_queue, ack_slot)
+
+    def _send(self, msg) -> int:
+        t0 = time.perf_counter()
+        partes = self.queue.put(msg, timeout=self.put_timeout)
+        self.stats['espera_s'] += time.perf_counter() - t0
+        self.stats['envios'] += 1
+        # Un ShardedQueue devuelve en cuántos mensajes dividió el lote; una cola, None
+        return partes if isinstance(partes, int) else 1
+
+    @staticmethod
+    def _run(callbacks):
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[ipc] Error tras entregar un lote al writer: {e}")
+
+    def _send_pending(self):
+        callbacks, self.callbacks = self.callbacks, []
+        if not self.pending:
+            self._after_acks(callbacks)
+            return
+        lote = self.pending
+        msg = lote[0] if len(lote) == 1 else {'type': 'batch', 'messages': lote}
+        if self.ack_queue is not None:
+            msg = dict(msg, ack=(self.ack_slot, self.next_batch))
+        try:
+            partes = self._send(msg)
+        except Exception:
+            # El lote sigue pendiente, con sus callbacks, y el error sube al llamador
+            self.callbacks = callbacks + self.callbacks
+            raise
+        self.pending, self.first_pending = [], None
+        if self.ack_queue is None:
+            self._run(callbacks)
+            return
+        self.unacked[self.next_batch] = [partes, callbacks]
+        self.next_batch += 1
+
+    def _after_acks(self, callbacks):
+        """Ejecuta callbacks cuando los lotes ya enviados tengan ack (ahora, si no queda ninguno)"""
+        if callbacks and self.unacked:
+            next(reversed(self.unacked.values()))[1].extend(callbacks)
+        else:
+            self._run(callbacks)
+
+    def _read_acks(self, wait=False):
+        """
+        Lee los acks recibidos y ejecuta los callbacks de los lotes confirmados, en
+        orden de envío. Con wait=True espera hasta put_timeout a que no quede ninguno
+        sin ack y, si no llegan, lanza TimeoutError (p. ej. el writer ha muerto).
+        """
+        limite = time.monotonic() + (self.put_timeout or 0)
+        while self.unacked:
+            try:
+                if wait:
+                    batch_id = self.ack_queue.get(timeout=max(0.0, limite - time.monotonic()))
+                else:
+                    batch_id = self.ack_queue.get_nowait()
+            except queue.Empty:
+                if wait:
+                    raise TimeoutError(f"el writer no confirmó {len(self.unacked)} lotes en {self.put_timeout}s")
+                return
+            entrada = self.unacked.get(batch_id)
+            if entrada is not None:
+                entrada[0] -= 1
+            while self.unacked and next(iter(self.unacked.values()))[0] <= 0:
+                _, (_, callbacks) = self.unacked.popitem(last=False)
+                self._run(callbacks)
+
+    def put(self, msg):
+        with self.lock:
+            self.stats['mensajes'] += 1
+            if self.unacked:
+                self._read_acks()
+            if msg.get('type') != 'asignatura':
+                self._send_pending()
+                self._send(msg)
+                return
+            self.pending.append(msg)
+            if self.first_pending is None:
+                self.first_pending = time.monotonic()
+            if len(self.pending) >= self.batch_size or time.monotonic() - self.first_pending >= self.linger:
+                self._send_pending()
+
+    def flush(self):
+        """Envía el lote pendiente y, con cola de acks, espera a que el writer confirme todo lo enviado"""
+        with self.lock:
+            self._send_pending()
+            if self.unacked:
+                self._read_acks(wait=True)
+
+    def after_send(self, callback):
+        """
+        Ejecuta callback cuando lo entregado hasta ahora llegue al writer: con el
+        lote pendiente, o tras el ack de los lotes ya enviados (ahora, si no hay ninguno)
+        """
+        with self.lock:
+            if self.unacked:
+                self._read_acks()
+            if self.pending:
+                self.callbacks.append(callback)
+                return
+            if self.unacked:
+                self._after_acks([callback])
+                return
+        callback()
+
+    def report(self):
+        return (f"[ipc] {self.stats['mensajes']} mensajes en {self.stats['envios']} envíos, "
+                f"{self.stats['espera_s']:.2f}s bloqueado esperando al writer")
+
+
+def flush_sender(writer_queue, report=True):
+    """
+    Vacía el lote de un BatchingSender (y espera sus acks) al terminar una unidad
+    o un worker; no hace nada con una cola simple. Con report imprime las estadísticas.
+    """
+    if isinstance(writer_queue, BatchingSender):
+        try:
+            writer_queue.flush()
+            if report:
+                print(writer_queue.report())
+        except Exception as e:
+            print(f"[ipc] Error enviando el último lote al writer: {e}")
+
+
+def after_delivery(writer_queue, callback):
+    """
+    Ejecuta callback cuando lo entregado hasta ahora por writer_queue haya llegado
+    al writer: con un BatchingSender, tras el ack de su lote (o al enviarlo, si no
+    tiene cola de acks); con una cola simple (o sin cola), de inmediato.
+    """
+    if isinstance(writer_queue, BatchingSender):
+        writer_queue.after_send(callback)
+    else:
+        callback()
+
+
+def message_size(msg) -> int:
+    """Tamaño en bytes del mensaje serializado (pickle), usado por el benchmark"""
+    return len(pickle.dumps(msg, protocol=pickle.HIGHEST_PROTOCOL))
@@ -0,0 +1,254 @@
+"""
+Parser offline de las páginas del catálogo SIA.
+
+Trabaja sobre el HTML completo (driver.page_source, un archivo guardado o la
+respuesta del motor HTTP) y produce el mismo diccionario `info` que
+AsignaturasScraper.extract_asignatura_info_from_driver, sin una llamada a
+WebDriver por cada campo de cada grupo y horario. También lee la tabla de
+resultados con la misma estructura que AsignaturaExtractor.extract_asignaturas.
+"""
+import re
+from typing import Dict, List, Optional
+
+from lxml import html as lxml_html
+
+
+def _has_class(cls: str) -> str:
+    """Predicado XPath equivalente al selector CSS `.cls`"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+def _text(element) -> str:
+    """Texto del elemento con los espacios normalizados (similar a WebElement.text)"""
+    if element is None:
+        return ''
+    return ' '.join(element.text_content().split())
+
+
+def _first(element, xpath: str):
+    found = element.xpath(xpath)
+    return found[0] if found else None
+
+
+def parse_html(page_source: str):
+    """Construye el árbol lxml a partir del HTML de la página"""
+    return lxml_html.fromstring(page_source)
+
+
+def parse_titulo(tree) -> Dict:
+    """Extrae código y nombre del título principal (`.ocu-titulo h2`)"""
+    return titulo_from_texto(_text(_first(tree, f".//*[{_has_class('ocu-titulo')}]//h2")))
+
+
+def titulo_from_texto(titulo_text: str) -> Dict:
+    """Código (entre paréntesis) y nombre a partir del texto del título"""
+    codigo_match = re.search(r'\(([\w\-]+)\)', titulo_text)
+    return {
+        'codigo': codigo_match.group(1) if codigo_match else '',
+        'nombre': titulo_text.split('(')[0].strip(),
+    }
+
+
+def parse_detalle_campo(tree, clase: str) -> str:
+    """Texto del primer span[id*='ot'] dentro de `.row.<clase>` (créditos, plan, tipología)"""
+    span = _first(tree, f".//*[{_has_class('row')} and {_has_class(clase)}]//span[contains(@id, 'ot')]")
+    return _text(span)
+
+
+def parse_horario(horario_element) -> Optional[Dict]:
+    """Equivalente offline de AsignaturasScraper.extract_horario_info"""
+    tiempo_text = _text(_first(horario_element, ".//span[contains(@id, 'ot10')]"))
+    aula_elements = horario_element.xpath(
+        ".//span[contains(@id, 'ot27') or contains(@id, 'ot28') or contains(@id, 'ot29')]"
+    )
+    return horario_from_textos(tiempo_text, [_text(e) for e in aula_elements])
+
+
+def horario_from_textos(tiempo_text: str, aula_textos: List[str]) -> Optional[Dict]:
+    """
+    Horario a partir del texto de `ot10` ("LUNES de 08:00 a 10:00") y los textos
+    del salón (`ot27`/`ot28`/`ot29`); None si no es un horario (p. ej. una fecha)
+    """
+    horario_info = {
+        'dia': '',
+        'hora_inicio': '',
+        'hora_fin': '',
+        'salon': ''
+    }
+    # Omitir si el texto es una fecha (dd/mm/yyyy)
+    if tiempo_text and not re.match(r'\d{2}/\d{2}/\d{4}$', tiempo_text):
+        tiempo_match = re.search(r'(\w+)\s+de\s+(\d{2}:\d{2})\s+a\s+(\d{2}:\d{2})', tiempo_text)
+        if tiempo_match:
+            horario_info['dia'] = tiempo_match.group(1)
+            horario_info['hora_inicio'] = tiempo_match.group(2)
+            horario_info['hora_fin'] = tiempo_match.group(3)
+    horario_info['salon'] = ' '.join(t for t in aula_textos if t)
+    if not horario_info['dia']:
+        return None
+    return horario_info
+
+
+def parse_grupo(grupo_element) -> Dict:
+    """Equivalente offline de AsignaturasScraper.extract_grupo_info"""
+    grupo_info = {
+        'numero_grupo': '',
+        'profesor': '',
+        'horarios': []
+    }
+    titulo = _text(_first(grupo_element, f".//*[{_has_class('af_showDetailHeader_title-text0')}]"))
+    grupo_match = re.search(r'\(([\w\-]+)\)', titulo)
+    if grupo_match:
+        grupo_info['numero_grupo'] = grupo_match.group(1)
+
+    content_div = _first(grupo_element, f".//*[{_has_class('af_showDetailHeader_content0')}]")
+    if content_div is None:
+        return grupo_info
+    grupo_info['profesor'] = _text(_first(content_div, f".//*[{_has_class('strong')}]"))
+    for horario_element in content_div.xpath(
+            f".//*[{_has_class('lista-elemento')} and {_has_class('sin-descripcion')}]"):
+        horario_info = parse_horario(horario_element)
+        if horario_info:
+            grupo_info['horarios'].append(horario_info)
+    return grupo_info
+
+
+def parse_grupos(tree) -> List[Dict]:
+    """Grupos de la asignatura (`.borde.salto .af_showDetailHeader`)"""
+    grupos_elements = tree.xpath(
+        f".//*[{_has_class('borde')} and {_has_class('salto')}]//*[{_has_class('af_showDetailHeader')}]"
+    )
+    return [parse_grupo(g) for g in grupos_elements]
+
+
+CODIGO_RE = re.compile(r"^\d{7}(-[A-Z])?$", re.IGNORECASE)
+
+
+def prerrequisitos_section(tree):
+    """Paneles (`div.af_panelGroupLayout`) de la sección Prerrequisitos, o [] si no hay sección"""
+    for h3 in tree.iter('h3'):
+        if _text(h3).lower() == "prerrequisitos":
+            parent = h3.getparent()
+            return parent.xpath(
+                "following-sibling::span[contains(@class, 'borde') and contains(@class, 'salto')]"
+                "//div[contains(@class, 'af_panelGroupLayout')]"
+            )
+    return []
+
+
+def parse_prerrequisitos(tree, info_asignatura: Dict) -> List[Dict]:
+    """Equivalente offline de AsignaturasScraper.extract_prerrequisitos_from_page"""
+    paneles = []
+    for div in prerrequisitos_section(tree):
+        # Sólo los span hoja: un span que envuelve a otro repetiría su texto
+        paneles.append([_text(s) for s in div.iter('span') if not s.xpath(".//span")])
+    return prerrequisitos_from_textos(paneles, info_asignatura)
+
+
+def prerrequisitos_from_textos(paneles: List[List[str]], info_asignatura: Dict) -> List[Dict]:
+    """
+    Filas de Prerrequisitos a partir de los textos de los span de cada panel
+    (`div.af_panelGroupLayout`), en una sola pasada: cada código va seguido de su
+    nombre y los demás textos del panel se ignoran.
+    Cada panel con asignaturas es un grupo de prerrequisitos (número en 'Grupo prerrequisito').
+    """
+    prerrequisitos = []
+    grupo = 0
+    for textos in paneles:
+        codigo = None
+        filas_panel = []
+        for texto in textos:
+            if codigo is not None:
+                if texto:
+                    filas_panel.append(f"{codigo} {texto}")
+                codigo = None
+            # Permitir códigos de 7 dígitos o 7 dígitos + guion + letra
+            elif CODIGO_RE.match(texto):
+                codigo = texto
+        if filas_panel:
+            grupo += 1
+        for prerrequisito in filas_panel:
+            prerrequisitos.append({
+                'Codigo asignatura': info_asignatura['codigo'],
+                'Nombre asignatura': info_asignatura['nombre'],
+                'Carrera': info_asignatura['carrera'],
+                'Prerrequisito': prerrequisito,
+                'Grupo prerrequisito': str(grupo),
+            })
+    return prerrequisitos
+
+
+def parse_asignatura_html(page_source: str, omitir_horarios: bool = False) -> Dict:
+    """
+    Extrae toda la información de una asignatura a partir del HTML de su página de detalle
+
+    Args:
+        page_source (str): HTML completo de la página (con los grupos ya expandidos)
+        omitir_horarios (bool): Si True, no extrae grupos ni horarios
+
+    Returns:
+        Dict: Diccionario con la misma estructura que extract_asignatura_info_from_driver
+    """
+    return parse_asignatura_tree(parse_html(page_source), omitir_horarios=omitir_horarios)
+
+
+def parse_asignatura_tree(tree, omitir_horarios: bool = False) -> Dict:
+    """Como parse_asignatura_html, sobre un árbol lxml ya construido"""
+    info = {
+        'codigo': '',
+        'nombre': '',
+        'creditos': '',
+        'carrera': '',
+        'tipologia': '',
+        'grupos': [],
+        'prerrequisitos': []
+    }
+    info.update(parse_titulo(tree))
+    info['creditos'] = parse_detalle_campo(tree, 'detass-creditos')
+    info['carrera'] = parse_detalle_campo(tree, 'detass-plan')
+    info['tipologia'] = parse_detalle_campo(tree, 'detass-tipologia')
+    if not omitir_horarios:
+        info['grupos'] = parse_grupos(tree)
+    info['prerrequisitos'] = parse_prerrequisitos(tree, info)
+    return info
+
+
+def _cell_value(cell) -> str:
+    """Atributo title del span[title] de la celda o, si está vacío, su texto"""
+    span = _first(cell, ".//span[@title]")
+    if span is None:
+        return ''
+    return (span.get('title') or '').strip() or _text(span)
+
+
+def parse_resultados(tree) -> List[Dict]:
+    """
+    Filas de la tabla de resultados (`tr.af_table_data-row`)
+
+    Returns:
+        List[Dict]: una entrada por fila con codigo, nombre, creditos, tipo,
+        sin_programar e indice (posición de la fila, usada en el evento ADF
+        que abre el detalle)
+    """
+    filas = []
+    for i, fila in enumerate(tree.xpath(f".//tr[{_has_class('af_table_data-row')}]")):
+        celdas = fila.xpath("./td")
+        if len(celdas) < 4:
+            continue
+        codigo = _text(_first(celdas[0], f".//a[{_has_class('af_commandLink')}]"))
+        if not codigo:
+            continue
+        sin_programar = "ASIGNATURA SIN PROGRAMAR" in _text(celdas[1])
+        nombre = _cell_value(celdas[1])
+        if sin_programar:
+            nombre = nombre.replace("ASIGNATURA SIN PROGRAMAR", "").strip()
+        creditos = _cell_value(celdas[2])
+        tipo_span = _first(celdas[3], ".//span[@title]")
+        filas.append({
+            'codigo': codigo,
+            'nombre': nombre,
+            'creditos': int(creditos) if creditos.isdigit() else creditos,
+            'tipo': _text(tipo_span),
+            'sin_programar': sin_programar,
+            'indice': i,
+        })
+    return filas
@@ -0,0 +1,64 @@
+"""
+Registro compartido entre procesos de las asignaturas ya scrapeadas en la ejecución.
+
+Los bots lo consultan antes de hacer clic en una asignatura: sólo el primer bot que
+reclama un código en una carpeta de salida expande sus grupos y horarios; los demás
+siguen entrando al detalle para registrar AsignaturasCarrera y Prerrequisitos de su
+carrera, pero omiten los horarios. El reclamo es por (output_dir, código): una
+asignatura compartida entre facultades tiene sus horarios en el Horarios.csv de
+cada una.
+"""
+import os
+from typing import Optional, Tuple
+
+
+class SubjectRegistry:
+    """
+    Envuelve un dict compartido (multiprocessing.Manager().dict()) de
+    (output_dir, código) -> token.
+    setdefault se ejecuta en el proceso del Manager, por lo que reclamar un código
+    es atómico entre procesos. Sin dict compartido funciona como registro local.
+    """
+
+    def __init__(self, shared=None):
+        self._shared = shared if shared is not None else {}
+        self._counter = 0
+
+    def _new_token(self) -> str:
+        self._counter += 1
+        return f"{os.getpid()}:{self._counter}"
+
+    @staticmethod
+    def _key(output_dir: str, codigo: str) -> Tuple[str, str]:
+        return os.path.normpath(output_dir or '.'), str(codigo)
+
+    def claim(self, output_dir: str, codigo: str) -> Optional[str]:
+        """
+        Reclama el código en la carpeta de salida output_dir para este proceso.
+
+        Returns:
+            str: token del reclamo si nadie lo había reclamado, o None si ya estaba registrado
+        """
+        token = self._new_token()
+        if self._shared.setdefault(self._key(output_dir, codigo), token) == token:
+            return token
+        return None
+
+    def release(self, output_dir: str, codigo: str, token: Optional[str]):
+        """Libera un reclamo propio (p. ej. si el scraping falló) para que otro bot lo reintente"""
+        if token is None:
+            return
+        try:
+            key = self._key(output_dir, codigo)
+            if self._shared.get(key) == token:
+                self._shared.pop(key, None)
+        except Exception as e:
+            print(f"[registry] Error liberando {codigo}: {e}")
+
+    def __contains__(self, key) -> bool:
+        """`(output_dir, codigo) in registry`"""
+        output_dir, codigo = key
+        return self._key(output_dir, codigo) in self._shared
+
+    def __len__(self) -> int:
+        return len(self._shared)
@@ -0,0 +1,76 @@
+"""
+Planificador de unidades de trabajo para los bots.
+
+Una unidad de trabajo es la tupla (facultad, carrera, tipo_asignatura) que el bot
+genérico (src/bot.py) necesita para configurar los filtros del catálogo. Las
+unidades se generan a partir de la tabla `Facultades_Bot` de src/utils.py y se
+encolan en una cola compartida de la que toman trabajo los procesos worker.
+"""
+import os
+from typing import List, NamedTuple, Optional
+
+from src.utils import Facultades_Bot, Tipos_Asignatura
+
+
+class WorkUnit(NamedTuple):
+    facultad: str
+    carrera: str
+    tipo_asignatura: str
+
+
+DEFAULT_TIPO = "TODAS MENOS LIBRE ELECCIÓN"
+
+
+def get_facultad_config(facultad: str) -> dict:
+    """Busca la entrada de Facultades_Bot por nombre corto ("Minas") o por nombre del SIA"""
+    for cfg in Facultades_Bot:
+        if facultad in (cfg["nombre"], cfg["facultad"]):
+            return cfg
+    raise KeyError(f"Facultad no configurada: {facultad}")
+
+
+def output_dir_for(facultad: str, root: str = "Data") -> str:
+    """Carpeta de salida de una facultad (ej. Data/Facultad_Minas)"""
+    return os.path.join(root, get_facultad_config(facultad)["output_dir"])
+
+
+def build_work_units(facultades: Optional[List[str]] = None, tipos: Optional[List[str]] = None) -> List[WorkUnit]:
+    """
+    Genera las unidades de trabajo de las facultades indicadas (todas por defecto).
+
+    Args:
+        facultades: nombres cortos o nombres del SIA de las facultades a incluir
+        tipos: tipos de asignatura a recorrer por carrera (por defecto todos los de
+            Tipos_Asignatura)
+    Returns:
+        List[WorkUnit]: unidades ordenadas por facultad, carrera y tipo, de modo que
+        las consecutivas comparten filtros y el bot no recarga la página entre ellas
+    """
+    tipos = tipos or list(Tipos_Asignatura)
+    configs = Facultades_Bot if not facultades else [get_facultad_config(f) for f in facultades]
+    units = []
+    for cfg in configs:
+        for carrera in cfg["carreras"]:
+            for tipo in tipos:
+                units.append(WorkUnit(cfg["facultad"], carrera, tipo))
+    return units
+
+
+def fill_job_queue(job_queue, units: List[WorkUnit], n_workers: int):
+    """
+    Encola todas las unidades en la cola compartida seguidas de un centinela (None)
+    por worker, para que cada worker termine cuando la cola se vacía.
+    """
+    for unit in units:
+        job_queue.put(tuple(unit))
+    for _ in range(max(1, int(n_workers))):
+        job_queue.put(None)
+
+
+def iter_job_queue(job_queue):
+    """Itera las unidades de la cola compartida hasta recibir el centinela"""
+    while True:
+        unit = job_queue.get()
+        if unit is None:
+            return
+        yield WorkUnit(*unit)
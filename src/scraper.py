@@ -2,18 +2,19 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 import pandas as pd
+import functools
 import re
 import time
-from typing import Dict, List, Tuple
+from typing import Dict, List
 import os
-import json
-import stat
-import errno
 import platform
 import tempfile
 
+from src.browser_profiles import DEFAULT_PROFILE, apply_profile, chrome_options
+from src.ipc import after_delivery
+from src.waits import WAIT_BUDGET, adf_synchronized, wait_for_ppr, wait_until
+
 
 # Cross-platform file lock (uses msvcrt on Windows, fcntl on POSIX)
 class FileLock:
@@ -97,21 +98,102 @@ class FileLock:
 
 
 
-# Utilidad para integración directa desde botMinas.py
-def scrape_asignatura_from_driver(driver_externo, output_dir=".", writer_queue=None):
+class CodigoIndex:
+    """
+    Índice en memoria de los códigos de asignatura con horarios ya guardados en
+    Horarios.csv (o en la tabla Horarios de SQLite), por carpeta de salida. Sólo
+    esos códigos pueden saltarse la expansión de grupos: una asignatura presente
+    en Asignaturas.csv puede no tener sus horarios escritos (se entregó sin ellos
+    o el writer cayó antes de escribirlos). Cada carpeta se lee una sola vez por
+    proceso y luego el índice se actualiza cuando el writer confirma (ack) una
+    asignatura entregada con horarios.
+    """
+
+    def __init__(self, db_path=None):
+        self._codigos = {}
+        # Con el backend SQLite los códigos se leen de la base de datos
+        self.db_path = db_path
+
+    @staticmethod
+    def _key(output_dir):
+        return os.path.normpath(output_dir if output_dir and output_dir != "." else "Data")
+
+    def _load(self, key):
+        codigos = set()
+        csv_horarios = os.path.join(key, "Horarios.csv")
+        if self.db_path:
+            if os.path.exists(self.db_path):
+                try:
+                    from src.sqlite_store import SqliteStore
+                    store = SqliteStore(self.db_path)
+                    try:
+                        codigos = store.codigos(key, 'Horarios')
+                    finally:
+                        store.close()
+                except Exception as e:
+                    print(f"[asignaturasinfo] Error leyendo {self.db_path}: {e}")
+        elif os.path.exists(csv_horarios):
+            try:
+                import csv
+                with open(csv_horarios, newline='', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        codigo = (row.get('Codigo de asignatura') or '').strip()
+                        if codigo:
+                            codigos.add(codigo)
+            except Exception as e:
+                print(f"[asignaturasinfo] Error leyendo Horarios.csv: {e}")
+        self._codigos[key] = codigos
+        return codigos
+
+    def _get(self, output_dir):
+        key = self._key(output_dir)
+        codigos = self._codigos.get(key)
+        if codigos is None:
+            codigos = self._load(key)
+        return codigos
+
+    def preload(self, output_dirs):
+        """Carga de una vez los índices de las carpetas indicadas (al iniciar el bot)"""
+        for output_dir in output_dirs:
+            self._get(output_dir)
+
+    def contains(self, output_dir, codigo) -> bool:
+        return codigo is not None and str(codigo) in self._get(output_dir)
+
+    def add(self, output_dir, codigo):
+        if codigo:
+            self._get(output_dir).add(str(codigo))
+
+
+# Índice de códigos del proceso actual (cada bot tiene el suyo)
+CODIGO_INDEX = CodigoIndex()
+
+
+def tiene_horarios(info) -> bool:
+    """True si la asignatura extraída produce alguna fila de Horarios (un horario con día)"""
+    return any(horario.get('dia') for grupo in info.get('grupos') or [] for horario in grupo.get('horarios') or [])
+
+
+# Utilidad para integración directa desde bot.py
+def scrape_asignatura_from_driver(driver_externo, output_dir=".", writer_queue=None, parse_mode="driver",
+                                  omitir_horarios=False):
     """
     Procesa la asignatura abierta en el driver externo y guarda los CSVs.
     Args:
         driver_externo: instancia de selenium.webdriver ya posicionada en la asignatura.
         output_dir: directorio donde guardar los archivos CSV.
+        parse_mode: 'driver' (un find_element por campo) o 'html' (parser offline sobre page_source).
+        omitir_horarios: si True no se expanden grupos ni horarios (otro bot ya los extrajo).
+    Returns:
+        Dict con la información extraída, o None si no se pudo extraer.
     """
     print("[asignaturasinfo] scrape_asignatura_from_driver llamado correctamente.")
     if driver_externo is None:
         print("[asignaturasinfo] Error: driver_externo es None.")
-        return
+        return None
     
     # Crear una nueva instancia del scraper
-    scraper = AsignaturasScraper()
+    scraper = AsignaturasScraper(parse_mode=parse_mode)
 
     # Primero, intentar extraer el código de la asignatura sin scrapear todo
     # Usar el driver externo para obtener el código de la asignatura de la página
@@ -131,38 +213,51 @@ def scrape_asignatura_from_driver(driver_externo, output_dir=".", writer_queue=N
     except Exception as e:
         print(f"[asignaturasinfo] No se pudo extraer el código de la asignatura antes del scraping completo: {e}")
 
-    # Verificar si el código ya existe en Asignaturas.csv (usar el output_dir proporcionado)
-    output_dir_check = output_dir if output_dir and output_dir != "." else "Data"
-    csv_asignaturas = os.path.join(output_dir_check, "Asignaturas.csv")
-    codigo_existe = False
-    if codigo_asignatura is not None and os.path.exists(csv_asignaturas):
-        try:
-            df_asig = pd.read_csv(csv_asignaturas, dtype=str)
-            if not df_asig.empty:
-                codigos = df_asig['Codigo de asignatura'].astype(str).tolist()
-                if str(codigo_asignatura) in codigos:
-                    codigo_existe = True
-        except Exception as e:
-            print(f"[asignaturasinfo] Error leyendo Asignaturas.csv: {e}")
+    # Verificar si el código ya tiene horarios en Horarios.csv (índice en memoria del output_dir)
+    codigo_existe = CODIGO_INDEX.contains(output_dir, codigo_asignatura)
+    omitir_horarios = codigo_existe or omitir_horarios
 
     # Procesar la asignatura usando el driver externo con flag de asignatura existente
-    info = scraper.extract_asignatura_info_from_driver(driver_externo, omitir_horarios=codigo_existe)
+    info = scraper.extract_asignatura_info_from_driver(driver_externo, omitir_horarios=omitir_horarios)
+    deliver_asignatura_info(info, output_dir, writer_queue, codigo_existe, omitir_horarios, scraper=scraper)
+    return info
+
+
+def deliver_asignatura_info(info, output_dir=".", writer_queue=None, codigo_existe=False, omitir_horarios=False,
+                            scraper=None):
+    """
+    Entrega la información extraída de una asignatura: al writer central si hay
+    writer_queue o, si no, directamente a los CSVs del output_dir. Compartida por
+    el motor Selenium y el motor HTTP (src/http_engine.py).
+    Args:
+        info: diccionario de la asignatura (None si no se pudo extraer).
+        codigo_existe: el código ya tenía horarios en Horarios.csv del output_dir.
+        omitir_horarios: no se extrajeron grupos ni horarios.
 
+    Si el envío al writer falla se propaga el error.
+    """
     if info:
         # If a writer_queue is provided, send the extracted info to the central writer
         if writer_queue is not None:
             try:
                 msg = {'type': 'asignatura', 'info': info, 'output_dir': output_dir, 'omit_existing': codigo_existe}
                 writer_queue.put(msg)
+                if tiene_horarios(info):
+                    after_delivery(writer_queue, functools.partial(CODIGO_INDEX.add, output_dir, info.get('codigo')))
                 print(f"[scraper] Enviado info de {info.get('codigo')} al writer queue")
             except Exception as e:
+                # El llamador no debe dar la asignatura por entregada (ni anotarla en el diario)
                 print(f"[scraper] Error enviando al writer queue: {e}")
+                raise
         else:
+            scraper = scraper or AsignaturasScraper()
             # Agregar los datos a las listas del scraper con flag de asignatura existente
-            scraper.add_asignatura_data(info, omitir_asignatura=codigo_existe, omitir_horarios=codigo_existe)
+            scraper.add_asignatura_data(info, omitir_asignatura=codigo_existe, omitir_horarios=omitir_horarios)
 
             # Generar o actualizar los CSVs
             scraper.append_to_csvs(output_dir)
+            if tiene_horarios(info):
+                CODIGO_INDEX.add(output_dir, info.get('codigo'))
 
             if codigo_existe:
                 print(f"✅ Asignatura {info['nombre']} ({info['codigo']}) ya existía. Se actualizó AsignaturasCarrera.csv y Prerrequisitos.csv. Se omitió scraping de horarios.")
@@ -172,17 +267,122 @@ def scrape_asignatura_from_driver(driver_externo, output_dir=".", writer_queue=N
         print("❌ No se pudo extraer información de la asignatura")
 
 
+PARSE_MODES = ("driver", "html", "js")
+
+# HTML de la sección de prerrequisitos: el contenedor del h3 "Prerrequisitos" y los
+# span.borde.salto que lo siguen, envueltos en un div (o null si no hay sección)
+PRERREQUISITOS_JS = """
+var h3s = document.querySelectorAll('h3');
+for (var i = 0; i < h3s.length; i++) {
+  if ((h3s[i].innerText || h3s[i].textContent || '').trim().toLowerCase() !== 'prerrequisitos') { continue; }
+  var parent = h3s[i].parentElement, html = [parent.outerHTML];
+  for (var sib = parent.nextElementSibling; sib; sib = sib.nextElementSibling) {
+    if (sib.tagName === 'SPAN' && sib.classList.contains('borde') && sib.classList.contains('salto')) {
+      html.push(sib.outerHTML);
+    }
+  }
+  return '<div>' + html.join('') + '</div>';
+}
+return null;
+"""
+
+# Script asíncrono del modo 'js': expande los grupos colapsados, espera a que ADF
+# termine el PPR y devuelve los textos de título, campos, grupos/horarios y
+# paneles de prerrequisitos en una sola llamada. Argumentos: omitir_horarios,
+# timeout en ms y el callback de execute_async_script.
+DETALLE_JS = """
+var omitir = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+function texto(el) { return el ? (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim() : ''; }
+function sincronizado() {
+  if (document.readyState !== 'complete') { return false; }
+  if (typeof AdfPage === 'undefined' || !AdfPage.PAGE || !AdfPage.PAGE.isSynchronizedWithServer) { return true; }
+  return AdfPage.PAGE.isSynchronizedWithServer();
+}
+function campo(clase) { return texto(document.querySelector('.row.' + clase + " span[id*='ot']")); }
+var expandidos = [];
+if (!omitir) {
+  var links = document.querySelectorAll('.borde.salto .af_showDetailHeader_disclosure-link');
+  for (var i = 0; i < links.length; i++) {
+    if ((links[i].className || '').indexOf('undisclosed') >= 0) {
+      var header = links[i].closest('.af_showDetailHeader');
+      try { links[i].click(); expandidos.push(header); } catch (e) {}
+    }
+  }
+}
+function listos() {
+  for (var i = 0; i < expandidos.length; i++) {
+    if (expandidos[i] && !expandidos[i].querySelector('.af_showDetailHeader_content0')) { return false; }
+  }
+  return sincronizado();
+}
+function extraer(timedOut) {
+  var out = {titulo: texto(document.querySelector('.ocu-titulo h2')), creditos: campo('detass-creditos'),
+             carrera: campo('detass-plan'), tipologia: campo('detass-tipologia'), grupos: [], prerrequisitos: [],
+             expandidos: expandidos.length, timeout: timedOut};
+  if (!omitir) {
+    var grupos = document.querySelectorAll('.borde.salto .af_showDetailHeader');
+    for (var g = 0; g < grupos.length; g++) {
+      var contenido = grupos[g].querySelector('.af_showDetailHeader_content0');
+      var grupo = {titulo: texto(grupos[g].querySelector('.af_showDetailHeader_title-text0')),
+                   profesor: '', horarios: [], contenido: !!contenido};
+      if (contenido) {
+        grupo.profesor = texto(contenido.querySelector('.strong'));
+        var items = contenido.querySelectorAll('.lista-elemento.sin-descripcion');
+        for (var h = 0; h < items.length; h++) {
+          var aulas = items[h].querySelectorAll("span[id*='ot27'], span[id*='ot28'], span[id*='ot29']");
+          var textosAula = [];
+          for (var a = 0; a < aulas.length; a++) { textosAula.push(texto(aulas[a])); }
+          grupo.horarios.push({tiempo: texto(items[h].querySelector("span[id*='ot10']")), aulas: textosAula});
+        }
+      }
+      out.grupos.push(grupo);
+    }
+  }
+  var h3s = document.querySelectorAll('h3');
+  for (var k = 0; k < h3s.length; k++) {
+    if (texto(h3s[k]).toLowerCase() !== 'prerrequisitos') { continue; }
+    var sib = h3s[k].parentElement.nextElementSibling;
+    for (; sib; sib = sib.nextElementSibling) {
+      if (sib.tagName !== 'SPAN' || !sib.classList.contains('borde') || !sib.classList.contains('salto')) { continue; }
+      var paneles = sib.querySelectorAll('div.af_panelGroupLayout');
+      for (var p = 0; p < paneles.length; p++) {
+        var spans = paneles[p].querySelectorAll('span'), textos = [];
+        for (var t = 0; t < spans.length; t++) { if (!spans[t].querySelector('span')) { textos.push(texto(spans[t])); } }
+        out.prerrequisitos.push(textos);
+      }
+    }
+    break;
+  }
+  done(out);
+}
+var inicio = Date.now();
+(function esperar() {
+  if (listos()) { extraer(false); }
+  else if (Date.now() - inicio > timeout) { extraer(true); }
+  else { setTimeout(esperar, 50); }
+})();
+"""
+
+
 class AsignaturasScraper:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, parse_mode="driver", profile=DEFAULT_PROFILE):
         """
         Inicializa el scraper de asignaturas
         
         Args:
             headless (bool): Si True, ejecuta el navegador sin interfaz gráfica
+            parse_mode (str): 'driver' lee cada campo con WebDriver; 'html' toma
+                driver.page_source una vez y lo procesa con src/parser.py; 'js'
+                expande y lee todo el detalle con un único script (DETALLE_JS)
+            profile (str): Perfil de opciones de Chrome de src/browser_profiles.py
         """
+        if parse_mode not in PARSE_MODES:
+            raise ValueError(f"parse_mode inválido: {parse_mode} (opciones: {PARSE_MODES})")
         self.driver = None
         self.wait = None
         self.headless = headless
+        self.parse_mode = parse_mode
+        self.profile = profile
         self.asignaturas_data = []
         self.asignaturas_carrera_data = []
         self.horarios_data = []
@@ -192,45 +392,27 @@ class AsignaturasScraper:
     def extract_prerrequisitos_from_page(self, driver, info_asignatura):
         """
         Extrae los prerrequisitos de la asignatura desde la página actual (driver ya posicionado).
+        Lee el HTML de la sección de prerrequisitos con una sola llamada (PRERREQUISITOS_JS)
+        y lo procesa en una pasada con src/parser.py, incluyendo el grupo (panel) de
+        cada prerrequisito.
         Args:
             driver: Driver de selenium ya posicionado en la página de la asignatura
             info_asignatura: dict con info de la asignatura (codigo, nombre, carrera)
         Returns:
             List[Dict]: Lista de dicts con los prerrequisitos
         """
+        from src.parser import parse_html, parse_prerrequisitos
         prerrequisitos = []
         try:
             print(f"Buscando prerrequisitos para {info_asignatura['codigo']} - {info_asignatura['nombre']}")
-            h3s = driver.find_elements(By.TAG_NAME, "h3")
-            prerreq_h3 = None
-            for h3 in h3s:
-                if h3.text.strip().lower() == "prerrequisitos":
-                    prerreq_h3 = h3
-                    print("Sección de prerrequisitos encontrada")
-                    break
-            if not prerreq_h3:
+            seccion = driver.execute_script(PRERREQUISITOS_JS)
+            if not seccion:
                 print("No se encontró sección de prerrequisitos")
                 return prerrequisitos
-            parent = prerreq_h3.find_element(By.XPATH, "..")
-            spans = parent.find_elements(By.XPATH, "following-sibling::span[contains(@class, 'borde') and contains(@class, 'salto')]")
-            print(f"Se encontraron {len(spans)} elementos span para procesar")
-            for span in spans:
-                divs = span.find_elements(By.XPATH, ".//div[contains(@class, 'af_panelGroupLayout')]")
-                for div in divs:
-                    spans_prer = div.find_elements(By.XPATH, ".//span")
-                    for i in range(len(spans_prer)-1):
-                        text1 = spans_prer[i].text.strip()
-                        text2 = spans_prer[i+1].text.strip()
-                        # Permitir códigos de 7 dígitos o 7 dígitos + guion + letra
-                        if re.match(r"^\d{7}(-[A-Z])?$", text1, re.IGNORECASE) and text2:
-                            prerreq_data = {
-                                'Codigo asignatura': info_asignatura['codigo'],
-                                'Nombre asignatura': info_asignatura['nombre'],
-                                'Carrera': info_asignatura['carrera'],
-                                'Prerrequisito': f"{text1} {text2}"
-                            }
-                            prerrequisitos.append(prerreq_data)
-                            print(f"Prerrequisito encontrado: {text1} {text2}")
+            prerrequisitos = parse_prerrequisitos(parse_html(seccion), info_asignatura)
+            for pr in prerrequisitos:
+                print(f"Prerrequisito encontrado: {pr['Prerrequisito']} "
+                      f"(grupo {pr['Grupo prerrequisito']})")
             print(f"Total prerrequisitos extraídos: {len(prerrequisitos)}")
             return prerrequisitos
         except Exception as e:
@@ -239,14 +421,8 @@ class AsignaturasScraper:
     
     def setup_driver(self):
         """Configura y inicializa el driver de Chrome"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
+        self.driver = webdriver.Chrome(options=chrome_options(self.profile, self.headless))
+        apply_profile(self.driver, self.profile)
         self.wait = WebDriverWait(self.driver, 10)
     
     def extract_asignatura_info_from_driver(self, driver_externo, omitir_horarios=False) -> Dict:
@@ -260,12 +436,16 @@ class AsignaturasScraper:
         Returns:
             Dict: Diccionario con toda la información extraída
         """
+        if self.parse_mode == "html":
+            return self.extract_asignatura_info_from_page_source(driver_externo, omitir_horarios=omitir_horarios)
+        if self.parse_mode == "js":
+            return self.extract_asignatura_info_from_js(driver_externo, omitir_horarios=omitir_horarios)
         try:
             # Usar el driver externo
             driver = driver_externo
             wait = WebDriverWait(driver, 10)
             
-            time.sleep(2)  # Esperar a que cargue la página
+            wait_for_ppr(driver, "detalle.carga")  # Esperar a que cargue la página
             
             info = {
                 'codigo': '',
@@ -355,6 +535,122 @@ class AsignaturasScraper:
             print(f"Error general extrayendo información: {e}")
             return None
     
+    def expand_grupos(self, driver) -> int:
+        """
+        Expande todos los grupos colapsados para que su contenido esté en el DOM
+
+        Returns:
+            int: número de grupos expandidos
+        """
+        expandidos = 0
+        links = driver.find_elements(
+            By.CSS_SELECTOR, ".borde.salto .af_showDetailHeader_disclosure-link"
+        )
+        for link in links:
+            try:
+                if "undisclosed" in (link.get_attribute("class") or ""):
+                    link.click()
+                    expandidos += 1
+            except Exception:
+                pass  # Ya está expandido o no se puede expandir
+        if expandidos:
+            wait_for_ppr(driver, "detalle.expandir_grupos")
+        return expandidos
+
+    def extract_asignatura_info_from_page_source(self, driver_externo, omitir_horarios=False) -> Dict:
+        """
+        Extrae la información de la asignatura leyendo driver.page_source una sola vez
+        y procesándolo con el parser offline (src/parser.py)
+
+        Args:
+            driver_externo: Driver de selenium ya posicionado en la página de la asignatura
+            omitir_horarios (bool): Si True, omite la extracción de información de horarios/grupos
+
+        Returns:
+            Dict: Diccionario con toda la información extraída
+        """
+        from src.parser import parse_asignatura_html
+        try:
+            driver = driver_externo
+            wait_for_ppr(driver, "detalle.carga")  # Esperar a que cargue la página
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ".ocu-titulo h2"))
+            )
+            if not omitir_horarios:
+                self.expand_grupos(driver)
+            else:
+                print("Se omite extracción de horarios (asignatura ya existe)")
+            info = parse_asignatura_html(driver.page_source, omitir_horarios=omitir_horarios)
+            print(f"Asignatura extraída (html): {info['codigo']} - {info['nombre']}, "
+                  f"{len(info['grupos'])} grupos, {len(info['prerrequisitos'])} prerrequisitos")
+            return info
+        except Exception as e:
+            print(f"Error general extrayendo información: {e}")
+            return None
+
+    def extract_asignatura_info_from_js(self, driver_externo, omitir_horarios=False, timeout=10) -> Dict:
+        """
+        Extrae la información de la asignatura con una sola llamada a
+        execute_async_script (DETALLE_JS), que expande los grupos colapsados, espera
+        el PPR y devuelve todos los textos; se interpretan con las mismas reglas que
+        el parser offline (src/parser.py)
+
+        Args:
+            driver_externo: Driver de selenium ya posicionado en la página de la asignatura
+            omitir_horarios (bool): Si True, omite la extracción de información de horarios/grupos
+            timeout (int): segundos máximos de espera a que los grupos expandidos carguen
+
+        Returns:
+            Dict: Diccionario con toda la información extraída
+        """
+        from src.parser import horario_from_textos, prerrequisitos_from_textos, titulo_from_texto
+        try:
+            driver = driver_externo
+            wait_for_ppr(driver, "detalle.carga")  # Esperar a que cargue la página
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ".ocu-titulo h2"))
+            )
+            driver.set_script_timeout(timeout + 5)
+            t0 = time.perf_counter()
+            raw = driver.execute_async_script(DETALLE_JS, bool(omitir_horarios), int(timeout * 1000))
+            if raw.get('expandidos'):
+                WAIT_BUDGET.record("detalle.js_expandir", time.perf_counter() - t0, bool(raw.get('timeout')))
+            if raw.get('timeout'):
+                print(f"Tiempo agotado esperando {raw['expandidos']} grupos expandidos; se extrae lo cargado")
+
+            info = {
+                'codigo': '',
+                'nombre': '',
+                'creditos': raw.get('creditos', ''),
+                'carrera': raw.get('carrera', ''),
+                'tipologia': raw.get('tipologia', ''),
+                'grupos': [],
+                'prerrequisitos': []
+            }
+            info.update(titulo_from_texto(raw.get('titulo', '')))
+            if not omitir_horarios:
+                for grupo in raw.get('grupos', []):
+                    grupo_match = re.search(r'\(([\w\-]+)\)', grupo.get('titulo', ''))
+                    grupo_info = {
+                        'numero_grupo': grupo_match.group(1) if grupo_match else '',
+                        'profesor': grupo.get('profesor', ''),
+                        'horarios': []
+                    }
+                    for h in grupo.get('horarios', []):
+                        horario_info = horario_from_textos(h.get('tiempo', ''), h.get('aulas', []))
+                        if horario_info:
+                            grupo_info['horarios'].append(horario_info)
+                    info['grupos'].append(grupo_info)
+            else:
+                print("Se omite extracción de horarios (asignatura ya existe)")
+            info['prerrequisitos'] = prerrequisitos_from_textos(raw.get('prerrequisitos', []), info)
+            print(f"Asignatura extraída (js): {info['codigo']} - {info['nombre']}, "
+                  f"{len(info['grupos'])} grupos, {len(info['prerrequisitos'])} prerrequisitos")
+            return info
+        except Exception as e:
+            print(f"Error general extrayendo información: {e}")
+            return None
+
     def extract_grupo_info(self, grupo_element, driver) -> Dict:
         """
         Extrae información de un grupo específico
@@ -391,7 +687,13 @@ class AsignaturasScraper:
                 )
                 if "undisclosed" in disclosure_link.get_attribute("class"):
                     disclosure_link.click()
-                    time.sleep(1)
+                    # Esperar a que el PPR inserte el contenido del grupo
+                    wait_until(
+                        driver,
+                        lambda d: grupo_element.find_elements(By.CSS_SELECTOR, ".af_showDetailHeader_content0")
+                        and adf_synchronized(d),
+                        "detalle.expandir_grupo",
+                    )
             except Exception:
                 pass  # Ya está expandido o no se puede expandir
             
@@ -0,0 +1,136 @@
+"""
+SQLite storage backend: alternative to the per-faculty CSV files.
+
+All faculties share one database (WAL mode). Every table has the same columns as
+its CSV plus `output_dir` (Data/Facultad_X), and a UNIQUE constraint on the same
+dedup keys CentralWriter uses for the CSVs, so inserts are `INSERT OR IGNORE` in
+batches (AsignaturasCarrera is keyed by its full row).
+
+CSV export for compatibility:
+    python -m src.sqlite_store export --db Data/sia.db --out Data
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+
+from src.writer import TABLES
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _unique_columns(name: str):
+    columns, key_columns = TABLES[name]
+    return key_columns or columns
+
+
+class SqliteStore:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.create_tables()
+
+    def create_tables(self):
+        for name, (columns, _) in TABLES.items():
+            cols = ', '.join(f'{_quote(c)} TEXT' for c in ['output_dir'] + columns)
+            unique = ', '.join(_quote(c) for c in ['output_dir'] + _unique_columns(name))
+            self.conn.execute(f'CREATE TABLE IF NOT EXISTS {_quote(name)} ({cols}, UNIQUE ({unique}))')
+            # Databases created with an older layout get the new columns (empty for old rows)
+            existing = {row[1] for row in self.conn.execute(f'PRAGMA table_info({_quote(name)})')}
+            for c in columns:
+                if c not in existing:
+                    self.conn.execute(f"ALTER TABLE {_quote(name)} ADD COLUMN {_quote(c)} TEXT DEFAULT ''")
+        self.conn.commit()
+
+    def insert_rows(self, output_dir: str, name: str, rows) -> int:
+        """Inserts a batch of rows ignoring duplicates; returns how many were new (uncommitted)"""
+        columns, _ = TABLES[name]
+        placeholders = ', '.join('?' for _ in range(len(columns) + 1))
+        sql = (f'INSERT OR IGNORE INTO {_quote(name)} '
+               f'({", ".join(_quote(c) for c in ["output_dir"] + columns)}) VALUES ({placeholders})')
+        output_dir = os.path.normpath(output_dir)
+        before = self.conn.total_changes
+        self.conn.executemany(sql, [
+            [output_dir] + ['' if row.get(c) is None else str(row.get(c)) for c in columns]
+            for row in rows
+        ])
+        return self.conn.total_changes - before
+
+    def commit(self):
+        self.conn.commit()
+
+    def codigos(self, output_dir: str, table: str = 'Asignaturas'):
+        """Codes already stored in `table` (Asignaturas or Horarios) for an output folder"""
+        cur = self.conn.execute(
+            f'SELECT DISTINCT "Codigo de asignatura" FROM {_quote(table)} WHERE output_dir = ?',
+            (os.path.normpath(output_dir),),
+        )
+        return {row[0] for row in cur}
+
+    def output_dirs(self):
+        dirs = set()
+        for name in TABLES:
+            dirs.update(row[0] for row in self.conn.execute(f'SELECT DISTINCT output_dir FROM {_quote(name)}'))
+        return sorted(dirs)
+
+    def export_csv(self, out_root: str = None):
+        """
+        Writes each output folder's tables as CSVs with the usual layout
+        (Data/Facultad_X/Asignaturas.csv ...). With out_root the folder name is
+        kept but placed under out_root.
+        """
+        for output_dir in self.output_dirs():
+            target_dir = os.path.join(out_root, os.path.basename(output_dir)) if out_root else output_dir
+            os.makedirs(target_dir, exist_ok=True)
+            for name, (columns, _) in TABLES.items():
+                cur = self.conn.execute(
+                    f'SELECT {", ".join(_quote(c) for c in columns)} FROM {_quote(name)} '
+                    f'WHERE output_dir = ? ORDER BY rowid',
+                    (output_dir,),
+                )
+                rows = cur.fetchall()
+                if not rows:
+                    continue
+                path = os.path.join(target_dir, f'{name}.csv')
+                with open(path, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f, lineterminator='\n')
+                    writer.writerow(columns)
+                    writer.writerows(rows)
+                print(f"[sqlite] Exportadas {len(rows)} filas a {path}")
+
+    def close(self):
+        try:
+            self.conn.commit()
+        finally:
+            self.conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Utilidades del backend SQLite')
+    sub = parser.add_subparsers(dest='command', required=True)
+    export = sub.add_parser('export', help='Exporta la base de datos a CSVs por facultad')
+    export.add_argument('--db', default=os.path.join('Data', 'sia.db'), help='Ruta de la base de datos')
+    export.add_argument('--out', default=None,
+                        help='Carpeta raíz de salida (por defecto, la output_dir original de cada tabla)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        if not os.path.exists(args.db):
+            print(f"No existe la base de datos {args.db}")
+            return 1
+        store = SqliteStore(args.db)
+        try:
+            store.export_csv(args.out)
+        finally:
+            store.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
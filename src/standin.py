@@ -0,0 +1,462 @@
+"""
+Servidor local que sustituye al catálogo de asignaturas del SIA para pruebas y
+benchmarks sin conexión.
+
+Sirve la misma ruta que el catálogo real (/Catalogo/facespublico/public/servicioPublico.jsf)
+con el marcado del que dependen los bots: selects de filtros `pt1:r1:0:soc*::content`,
+botón `af_button_link`, tabla de resultados `tr.af_table_data-row`, página de detalle
+(`.ocu-titulo h2`, `.detass-*`, grupos `.af_showDetailHeader` y prerrequisitos) y botón
+`af_button_text` para volver. Imita el comportamiento de ADF: estado de la vista en el
+servidor asociado a `javax.faces.ViewState`, eventos enviados por POST y partial page
+refresh (PPR) con un objeto `AdfPage.PAGE.isSynchronizedWithServer()` en la página.
+
+Los datos salen de un JSON de catálogo (--catalogo) o se generan de forma
+determinista a partir de la tabla Facultades_Bot (--seed).
+
+Uso:
+    python -m src.standin --port 8765 --latency-ms 150
+    python main.py --base-url http://127.0.0.1:8765
+    python -m src.standin --dump benchmarks/pages   # guarda páginas de detalle
+"""
+import argparse
+import html
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.utils import Facultades_Bot, Tipos_Asignatura
+
+CATALOGO_PATH = "/Catalogo/facespublico/public/servicioPublico.jsf"
+# Cabecera con la que el servidor se identifica: el motor HTTP (src/http_engine.py)
+# habla el protocolo simplificado de este servidor y se niega a usar otro
+PROTOCOL_HEADER = "X-SIA-Standin-Protocol"
+PROTOCOL_VERSION = "1"
+NIVELES = ["Pregrado"]
+SEDES = ["1102 SEDE MEDELLÍN"]
+DIAS = ["LUNES", "MARTES", "MIÉRCOLES", "JUEVES", "VIERNES", "SÁBADO"]
+TIPOLOGIAS = ["FUNDAMENTACIÓN OBLIGATORIA", "FUNDAMENTACIÓN OPTATIVA", "DISCIPLINAR OBLIGATORIA",
+              "DISCIPLINAR OPTATIVA", "TRABAJO DE GRADO"]
+NOMBRES = ["CÁLCULO", "ÁLGEBRA", "FÍSICA", "QUÍMICA", "PROGRAMACIÓN", "ESTADÍSTICA", "MECÁNICA",
+           "TERMODINÁMICA", "ECONOMÍA", "GEOLOGÍA", "DISEÑO", "HISTORIA", "BIOLOGÍA", "CONTROL",
+           "MATERIALES", "PROYECTO"]
+PROFESORES = ["PÉREZ GÓMEZ JUAN", "RESTREPO LÓPEZ ANA", "GARCÍA RÍOS LUIS", "MEJÍA CANO SARA",
+              "OSORIO VÉLEZ CARLOS", "ZAPATA MUÑOZ LAURA"]
+
+_e = html.escape
+
+PAGE_JS = """
+var AdfPage = {PAGE: {pending: 0, isSynchronizedWithServer: function () { return this.pending === 0; }}};
+function adfSubmit(source, target) {
+  var form = document.getElementById('f1');
+  var data = new URLSearchParams(new FormData(form));
+  data.set('event', source);
+  data.set('target', target);
+  AdfPage.PAGE.pending++;
+  fetch(form.action, {method: 'POST', body: data, headers: {'Adf-Rich-Message': 'true'}})
+    .then(function (r) { return r.text(); })
+    .then(function (fragment) {
+      document.getElementById(target).innerHTML = fragment;
+      var link = document.querySelector('[data-disclosure="' + source + '"]');
+      if (link) { link.className = link.className.replace('undisclosed', 'disclosed'); }
+    })
+    .finally(function () { AdfPage.PAGE.pending--; });
+  return false;
+}
+"""
+
+
+# ---------------------------------------------------------------------------
+# Catálogo
+# ---------------------------------------------------------------------------
+
+def _horarios(rng):
+    horarios = []
+    for dia in rng.sample(DIAS, rng.randint(1, 3)):
+        inicio = rng.choice([6, 8, 10, 12, 14, 16, 18])
+        horarios.append({'dia': dia, 'hora_inicio': f"{inicio:02d}:00", 'hora_fin': f"{inicio + 2:02d}:00",
+                         'salon': f"{rng.randint(11, 46)}-{rng.randint(101, 420)}"})
+    return horarios
+
+
+def _asignatura(rng, codigo, nombre, max_grupos, codigos_previos):
+    grupos = [{'numero_grupo': str(n), 'profesor': rng.choice(PROFESORES), 'horarios': _horarios(rng)}
+              for n in range(1, rng.randint(1, max_grupos) + 1)]
+    paneles = []
+    if codigos_previos and rng.random() < 0.6:
+        for _ in range(rng.randint(1, 2)):
+            items = rng.sample(codigos_previos, min(len(codigos_previos), rng.randint(1, 3)))
+            paneles.append({'asignaturas': items})
+    return {'codigo': codigo, 'nombre': nombre, 'creditos': rng.choice([2, 3, 3, 4, 4, 5]),
+            'sin_programar': rng.random() < 0.1, 'grupos': grupos, 'prerrequisitos': paneles}
+
+
+def build_catalogo(seed=2024, asignaturas_por_carrera=12, max_grupos=25):
+    """
+    Genera un catálogo determinista con la estructura del SIA para todas las
+    facultades y carreras de Facultades_Bot. Incluye asignaturas comunes a varias
+    carreras (como las básicas de Minas) y asignaturas sin programar.
+    """
+    rng = random.Random(seed)
+    asignaturas = {}
+    comunes = []
+    for i in range(6):
+        codigo = f"{1000001 + i}" + ("-M" if i % 3 == 0 else "")
+        asignaturas[codigo] = _asignatura(rng, codigo, f"{NOMBRES[i]} BÁSICO", max_grupos, [])
+        asignaturas[codigo]['sin_programar'] = False
+        comunes.append(codigo)
+
+    carreras = {}
+    siguiente = 3000000
+    for cfg in Facultades_Bot:
+        for carrera in cfg['carreras']:
+            por_tipo = {}
+            for tipo in Tipos_Asignatura:
+                codigos = list(comunes[:3]) if tipo != "LIBRE ELECCIÓN" else []
+                for _ in range(asignaturas_por_carrera):
+                    siguiente += rng.randint(1, 40)
+                    codigo = str(siguiente)
+                    nombre = f"{rng.choice(NOMBRES)} {rng.choice(['I', 'II', 'III', 'APLICADA', 'AVANZADA'])}"
+                    asignaturas[codigo] = _asignatura(rng, codigo, nombre, max(2, max_grupos // 3),
+                                                      sorted(set(comunes + codigos[-5:])))
+                    codigos.append(codigo)
+                por_tipo[tipo] = [{'codigo': c, 'tipologia': rng.choice(TIPOLOGIAS) if tipo != "LIBRE ELECCIÓN"
+                                   else "LIBRE ELECCIÓN"} for c in codigos]
+            carreras[carrera] = por_tipo
+    facultades = {cfg['facultad']: list(cfg['carreras']) for cfg in Facultades_Bot}
+    return {'facultades': facultades, 'carreras': carreras, 'asignaturas': asignaturas}
+
+
+def load_catalogo(path=None, **kwargs):
+    if path:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    return build_catalogo(**kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Render
+# ---------------------------------------------------------------------------
+
+def _options(opciones, seleccionada):
+    out = ['<option value="">Selecciona qué quieres consultar</option>']
+    for i, texto in enumerate(opciones):
+        sel = ' selected="selected"' if texto == seleccionada else ''
+        out.append(f'<option value="{i}"{sel}>{_e(texto)}</option>')
+    return ''.join(out)
+
+
+def _select(comp, opciones, seleccionada):
+    return (f'<select id="pt1:r1:0:{comp}::content" name="pt1:r1:0:{comp}" class="af_selectOneChoice_content" '
+            f'onchange="adfSubmit(this.name, \'pt1:r1\')">{_options(opciones, seleccionada)}</select>')
+
+
+def select_options(state, catalogo):
+    """Opciones de cada select según el estado actual de la vista (selects dependientes)"""
+    facultades = list(catalogo['facultades']) if state.get('sede') else []
+    carreras = catalogo['facultades'].get(state.get('facultad'), []) if state.get('facultad') else []
+    return {
+        'soc1': NIVELES,
+        'soc9': SEDES if state.get('nivel') else [],
+        'soc2': facultades,
+        'soc3': carreras,
+        'soc4': list(Tipos_Asignatura) if state.get('carrera') else [],
+    }
+
+
+STATE_FIELDS = {'soc1': 'nivel', 'soc9': 'sede', 'soc2': 'facultad', 'soc3': 'carrera', 'soc4': 'tipo'}
+
+
+def resultados(state, catalogo):
+    return catalogo['carreras'].get(state.get('carrera'), {}).get(state.get('tipo'), [])
+
+
+def render_filtros(state, catalogo):
+    opciones = select_options(state, catalogo)
+    partes = ['<div class="filtros">']
+    for comp, campo in STATE_FIELDS.items():
+        partes.append(f'<div class="campo">{_select(comp, opciones[comp], state.get(campo))}</div>')
+    partes.append('<a class="af_button_link" href="#" onclick="return adfSubmit(\'pt1:r1:0:cb1\', \'pt1:r1\')">'
+                  'Mostrar</a></div>')
+    if state.get('mostrar'):
+        partes.append('<table class="af_table_data-table"><tbody>')
+        for i, fila in enumerate(resultados(state, catalogo)):
+            a = catalogo['asignaturas'][fila['codigo']]
+            sin_programar = '<span class="sin-programar">ASIGNATURA SIN PROGRAMAR</span>' if a['sin_programar'] else ''
+            partes.append(
+                f'<tr class="af_table_data-row">'
+                f'<td><a class="af_commandLink" href="#" '
+                f'onclick="return adfSubmit(\'pt1:r1:0:tb3:{i}:cl1\', \'pt1:r1\')">{_e(a["codigo"])}</a></td>'
+                f'<td><span title="{_e(a["nombre"])}">{_e(a["nombre"])}</span>{sin_programar}</td>'
+                f'<td><span title="{a["creditos"]}">{a["creditos"]}</span></td>'
+                f'<td><span title="{_e(fila["tipologia"])}">{_e(fila["tipologia"])}</span></td>'
+                f'</tr>')
+        partes.append('</tbody></table>')
+    return ''.join(partes)
+
+
+def render_grupo_body(grupo, j):
+    partes = [f'<div class="af_showDetailHeader_content0"><span class="strong">{_e(grupo["profesor"])}</span>']
+    for k, h in enumerate(grupo['horarios']):
+        partes.append(
+            f'<div class="lista-elemento sin-descripcion">'
+            f'<span id="pt1:r1:0:i{j}:i{k}:ot10">{h["dia"]} de {h["hora_inicio"]} a {h["hora_fin"]}</span> '
+            f'<span id="pt1:r1:0:i{j}:i{k}:ot27">{_e(h["salon"].split("-")[0])}</span>'
+            f'<span id="pt1:r1:0:i{j}:i{k}:ot28">-</span>'
+            f'<span id="pt1:r1:0:i{j}:i{k}:ot29">{_e(h["salon"].split("-")[-1])}</span>'
+            f'</div>'
+            f'<div class="lista-elemento sin-descripcion"><span id="pt1:r1:0:i{j}:i{k}:ot11">01/02/2025</span></div>')
+    partes.append('</div>')
+    return ''.join(partes)
+
+
+def render_detalle(state, catalogo):
+    a = catalogo['asignaturas'][state['codigo']]
+    fila = next((f for f in resultados(state, catalogo) if f['codigo'] == a['codigo']), {'tipologia': ''})
+    expandidos = state.setdefault('expandidos', {0, 1})
+    partes = [
+        '<a class="af_button_text" href="#" onclick="return adfSubmit(\'pt1:r1:0:cb2\', \'pt1:r1\')">Volver</a>',
+        f'<div class="ocu-titulo"><h2>{_e(a["nombre"])} ({_e(a["codigo"])})</h2></div>',
+        f'<div class="row detass-creditos"><label>Créditos:</label><span id="pt1:r1:0:ot3">{a["creditos"]}</span></div>',
+        f'<div class="row detass-plan"><label>Plan de estudios:</label><span id="pt1:r1:0:ot4">{_e(state.get("carrera", ""))}</span></div>',
+        f'<div class="row detass-tipologia"><label>Tipología:</label><span id="pt1:r1:0:ot5">{_e(fila["tipologia"])}</span></div>',
+        '<div class="seccion"><h3>Grupos</h3></div><span class="borde salto">',
+    ]
+    for j, grupo in enumerate(a['grupos']):
+        abierto = j in expandidos
+        clase = 'disclosed' if abierto else 'undisclosed'
+        partes.append(
+            f'<div class="af_showDetailHeader" id="pt1:r1:0:sdh{j}">'
+            f'<a class="af_showDetailHeader_disclosure-link {clase}" href="#" data-disclosure="pt1:r1:0:sdh{j}" '
+            f'onclick="return adfSubmit(\'pt1:r1:0:sdh{j}\', \'pt1:r1:0:sdh{j}::body\')"></a>'
+            f'<span class="af_showDetailHeader_title-text0">Grupo {j + 1} ({_e(grupo["numero_grupo"])})</span>'
+            f'<div id="pt1:r1:0:sdh{j}::body">{render_grupo_body(grupo, j) if abierto else ""}</div>'
+            f'</div>')
+    partes.append('</span>')
+    if a['prerrequisitos']:
+        partes.append('<div class="seccion"><h3>Prerrequisitos</h3></div>')
+        for panel in a['prerrequisitos']:
+            partes.append('<span class="borde salto"><div class="af_panelGroupLayout">')
+            for codigo in panel['asignaturas']:
+                nombre = catalogo['asignaturas'].get(codigo, {}).get('nombre', '')
+                partes.append(f'<span>{_e(codigo)}</span> <span>{_e(nombre)}</span>')
+            partes.append('</div></span>')
+    return ''.join(partes)
+
+
+def render_region(state, catalogo):
+    if state.get('view') == 'detalle':
+        return render_detalle(state, catalogo)
+    return render_filtros(state, catalogo)
+
+
+def render_page(view_state, state, catalogo):
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Catálogo de asignaturas</title>'
+        f'<script>{PAGE_JS}</script></head><body>'
+        f'<form id="f1" method="post" action="{CATALOGO_PATH}">'
+        f'<input type="hidden" name="javax.faces.ViewState" value="{view_state}">'
+        f'<div id="pt1:r1">{render_region(state, catalogo)}</div>'
+        '</form></body></html>'
+    )
+
+
+def render_detalle_page(catalogo, codigo, carrera='', tipo=None, expandir_todos=True):
+    """Página de detalle completa de una asignatura (para fixtures y benchmarks offline)"""
+    a = catalogo['asignaturas'][codigo]
+    state = {'view': 'detalle', 'codigo': codigo, 'carrera': carrera, 'tipo': tipo,
+             'expandidos': set(range(len(a['grupos']))) if expandir_todos else {0, 1}}
+    return render_page('dump', state, catalogo)
+
+
+# ---------------------------------------------------------------------------
+# Servidor
+# ---------------------------------------------------------------------------
+
+class StandinState:
+    """Vistas ADF del servidor: ViewState -> estado de filtros / detalle"""
+
+    def __init__(self, catalogo, latency=0.0, jitter=0.0):
+        self.catalogo = catalogo
+        self.latency = latency
+        self.jitter = jitter
+        self.views = {}
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def new_view(self):
+        token = uuid.uuid4().hex
+        with self.lock:
+            self.views[token] = {'view': 'filtros'}
+        return token
+
+    def apply_event(self, state, event, form):
+        # Actualizar selects con los valores enviados (índices como en ADF)
+        opciones = select_options(state, self.catalogo)
+        for comp, campo in STATE_FIELDS.items():
+            valor = form.get(f'pt1:r1:0:{comp}')
+            if valor is None:
+                continue
+            try:
+                texto = opciones[comp][int(valor)] if valor != '' else None
+            except (ValueError, IndexError):
+                texto = None
+            if texto != state.get(campo):
+                state[campo] = texto
+                # Los selects dependientes se reinician al cambiar uno anterior
+                dependientes = list(STATE_FIELDS.values())
+                for dep in dependientes[dependientes.index(campo) + 1:]:
+                    state.pop(dep, None)
+                state['mostrar'] = False
+                opciones = select_options(state, self.catalogo)
+        if event == 'pt1:r1:0:cb1':
+            state['mostrar'] = bool(state.get('carrera') and state.get('tipo'))
+        elif event.startswith('pt1:r1:0:tb3:') and event.endswith(':cl1'):
+            idx = int(event.split(':')[4])
+            state['view'] = 'detalle'
+            state['codigo'] = resultados(state, self.catalogo)[idx]['codigo']
+            state['expandidos'] = {0, 1}
+        elif event == 'pt1:r1:0:cb2':
+            state['view'] = 'filtros'
+        elif event.startswith('pt1:r1:0:sdh'):
+            state.setdefault('expandidos', {0, 1}).add(int(event[len('pt1:r1:0:sdh'):]))
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "SIAStandin/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _delay(self):
+        st = self.server.standin
+        st.requests += 1
+        espera = st.latency + (random.uniform(0, st.jitter) if st.jitter else 0)
+        if espera > 0:
+            time.sleep(espera)
+
+    def _send(self, body, status=200, content_type='text/html; charset=utf-8'):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header(PROTOCOL_HEADER, PROTOCOL_VERSION)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if urlparse(self.path).path != CATALOGO_PATH:
+            self._send('no encontrado', status=404, content_type='text/plain; charset=utf-8')
+            return
+        self._delay()
+        st = self.server.standin
+        token = st.new_view()
+        self._send(render_page(token, st.views[token], st.catalogo))
+
+    def do_POST(self):
+        if urlparse(self.path).path != CATALOGO_PATH:
+            self._send('no encontrado', status=404, content_type='text/plain; charset=utf-8')
+            return
+        self._delay()
+        st = self.server.standin
+        length = int(self.headers.get('Content-Length') or 0)
+        form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode('utf-8'),
+                                             keep_blank_values=True).items()}
+        token = form.get('javax.faces.ViewState', '')
+        with st.lock:
+            state = st.views.get(token)
+            if state is None:
+                self._send('ViewExpiredException', status=500, content_type='text/plain; charset=utf-8')
+                return
+            try:
+                st.apply_event(state, form.get('event', ''), form)
+            except (IndexError, KeyError, ValueError) as e:
+                self._send(f'Evento inválido: {e}', status=400, content_type='text/plain; charset=utf-8')
+                return
+            if self.headers.get('Adf-Rich-Message') == 'true':
+                target = form.get('target', 'pt1:r1')
+                if target.startswith('pt1:r1:0:sdh') and target.endswith('::body'):
+                    j = int(target[len('pt1:r1:0:sdh'):-len('::body')])
+                    grupo = st.catalogo['asignaturas'][state['codigo']]['grupos'][j]
+                    body = render_grupo_body(grupo, j)
+                else:
+                    body = render_region(state, st.catalogo)
+            else:
+                body = render_page(token, state, st.catalogo)
+        self._send(body)
+
+
+def make_server(host='127.0.0.1', port=8765, catalogo=None, latency=0.0, jitter=0.0):
+    """Crea el servidor (sin arrancarlo); server.server_address da el puerto real si port=0"""
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.standin = StandinState(catalogo or build_catalogo(), latency=latency, jitter=jitter)
+    return server
+
+
+def start_in_thread(**kwargs):
+    """Arranca el servidor en un hilo de fondo; devuelve (server, base_url)"""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, name='sia-standin', daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}{CATALOGO_PATH}"
+
+
+def dump_pages(catalogo, out_dir):
+    """Guarda la página de detalle (con todos los grupos expandidos) de cada asignatura programada"""
+    os.makedirs(out_dir, exist_ok=True)
+    n = 0
+    for carrera, por_tipo in catalogo['carreras'].items():
+        for tipo, filas in por_tipo.items():
+            for fila in filas:
+                codigo = fila['codigo']
+                path = os.path.join(out_dir, f"{codigo}.html")
+                if os.path.exists(path) or catalogo['asignaturas'][codigo]['sin_programar']:
+                    continue
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(render_detalle_page(catalogo, codigo, carrera=carrera, tipo=tipo))
+                n += 1
+    print(f"[standin] {n} páginas de detalle guardadas en {out_dir}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Servidor local que sustituye al catálogo del SIA')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0, help='Latencia añadida a cada petición')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Latencia aleatoria adicional máxima')
+    parser.add_argument('--catalogo', default=None, help='JSON de catálogo (por defecto se genera uno)')
+    parser.add_argument('--seed', type=int, default=2024, help='Semilla del catálogo generado')
+    parser.add_argument('--asignaturas', type=int, default=12, help='Asignaturas por carrera y tipo')
+    parser.add_argument('--save-catalogo', default=None, help='Guardar el catálogo usado como JSON')
+    parser.add_argument('--dump', default=None, help='Guardar las páginas de detalle en esta carpeta y salir')
+    args = parser.parse_args(argv)
+
+    catalogo = load_catalogo(args.catalogo, seed=args.seed, asignaturas_por_carrera=args.asignaturas)
+    if args.save_catalogo:
+        with open(args.save_catalogo, 'w', encoding='utf-8') as f:
+            json.dump(catalogo, f, ensure_ascii=False, indent=1)
+    if args.dump:
+        dump_pages(catalogo, args.dump)
+        return 0
+
+    server = make_server(args.host, args.port, catalogo, latency=args.latency_ms / 1000,
+                         jitter=args.jitter_ms / 1000)
+    print(f"[standin] Sirviendo http://{args.host}:{args.port}{CATALOGO_PATH} "
+          f"(latencia {args.latency_ms}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -69,4 +69,29 @@ Carreras_F_Minas_Nuevo2 = ["3534 INGENIERÍA DE SISTEMAS E INFORMÁTICA",
                     "3539 INGENIERÍA QUÍMICA"]
 
 Tipos_Asignatura = ["TODAS MENOS LIBRE ELECCIÓN", 
-                    "LIBRE ELECCIÓN"]
\ No newline at end of file
+                    "LIBRE ELECCIÓN"]
+
+# Tabla de configuración de los bots: una entrada por facultad con su nombre en el
+# filtro del SIA, las carreras a recorrer y la carpeta de salida dentro de Data/
+Facultades_Bot = [
+    {"nombre": "FCHE",
+     "facultad": "3067 FACULTAD DE CIENCIAS HUMANAS Y ECONÓMICAS",
+     "carreras": Carreras_F_Ciencias_Humanas,
+     "output_dir": "Facultad_FCHE"},
+    {"nombre": "Arquitectura",
+     "facultad": "3064 FACULTAD DE ARQUITECTURA",
+     "carreras": Carreras_F_Arquitectura,
+     "output_dir": "Facultad_Arquitectura"},
+    {"nombre": "Agrarias",
+     "facultad": "3442 FACULTAD DE CIENCIAS AGRARIAS",
+     "carreras": Carreras_F_Ciencias_Agrarias,
+     "output_dir": "Facultad_Agrarias"},
+    {"nombre": "Ciencias",
+     "facultad": "3065 FACULTAD DE CIENCIAS",
+     "carreras": Carreras_F_Ciencias,
+     "output_dir": "Facultad_Ciencias"},
+    {"nombre": "Minas",
+     "facultad": "3068 FACULTAD DE MINAS",
+     "carreras": Carreras_F_Minas_Nuevo + Carreras_F_Minas_Nuevo2,
+     "output_dir": "Facultad_Minas"},
+]
@@ -0,0 +1,100 @@
+"""
+Esperas por condición para las páginas ADF del catálogo SIA y contabilidad del
+tiempo esperado por punto de llamada (wait budget).
+
+Reemplaza los time.sleep fijos: cada espera termina en cuanto se cumple la
+condición (fin del partial page refresh de ADF, elemento obsoleto tras navegar,
+filas de la tabla presentes) y registra cuánto tardó en WAIT_BUDGET, que cada
+worker imprime al terminar.
+"""
+import time
+from typing import Callable, Dict
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+# True cuando ADF no tiene eventos ni peticiones PPR pendientes (o la página no es ADF)
+ADF_SYNC_JS = """
+if (document.readyState !== 'complete') { return false; }
+if (typeof AdfPage === 'undefined' || !AdfPage.PAGE || !AdfPage.PAGE.isSynchronizedWithServer) { return true; }
+return AdfPage.PAGE.isSynchronizedWithServer();
+"""
+
+
+class WaitBudget:
+    """Acumula, por punto de llamada, número de esperas, segundos esperados y timeouts"""
+
+    def __init__(self):
+        self.sites: Dict[str, Dict] = {}
+
+    def record(self, site: str, seconds: float, timed_out: bool = False):
+        entry = self.sites.setdefault(site, {'llamadas': 0, 'segundos': 0.0, 'timeouts': 0})
+        entry['llamadas'] += 1
+        entry['segundos'] += seconds
+        if timed_out:
+            entry['timeouts'] += 1
+
+    def total(self) -> float:
+        return sum(e['segundos'] for e in self.sites.values())
+
+    def report(self) -> str:
+        lineas = [f"⏱️ Tiempo total en esperas: {self.total():.1f}s"]
+        for site, e in sorted(self.sites.items(), key=lambda kv: kv[1]['segundos'], reverse=True):
+            promedio = e['segundos'] / e['llamadas'] if e['llamadas'] else 0.0
+            lineas.append(f"   - {site}: {e['segundos']:.1f}s en {e['llamadas']} esperas "
+                          f"(promedio {promedio:.2f}s, timeouts {e['timeouts']})")
+        return "\n".join(lineas)
+
+    def reset(self):
+        self.sites.clear()
+
+
+# Presupuesto de esperas del proceso actual (cada worker tiene el suyo)
+WAIT_BUDGET = WaitBudget()
+
+
+def wait_until(driver, condition: Callable, site: str, timeout: float = 10, poll: float = 0.1):
+    """
+    Espera hasta que condition(driver) sea verdadera y registra el tiempo en WAIT_BUDGET.
+
+    Returns:
+        El valor devuelto por la condición, o False si se agotó el tiempo
+    """
+    start = time.perf_counter()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+        WAIT_BUDGET.record(site, time.perf_counter() - start)
+        return result
+    except TimeoutException:
+        WAIT_BUDGET.record(site, time.perf_counter() - start, timed_out=True)
+        print(f"[waits] Tiempo de espera agotado en {site} ({timeout}s)")
+        return False
+
+
+def adf_synchronized(driver) -> bool:
+    """True si la página terminó de cargar y ADF no tiene un partial page refresh en curso"""
+    try:
+        return bool(driver.execute_script(ADF_SYNC_JS))
+    except Exception:
+        return False
+
+
+def wait_for_ppr(driver, site: str, timeout: float = 10):
+    """Espera a que termine el partial page refresh (PPR) de ADF"""
+    return wait_until(driver, adf_synchronized, site, timeout)
+
+
+def wait_for_staleness(driver, element, site: str, timeout: float = 10):
+    """Espera a que el elemento deje de estar en el DOM (la vista fue reemplazada)"""
+    return wait_until(driver, EC.staleness_of(element), site, timeout)
+
+
+def wait_for_rows(driver, site: str, timeout: float = 10):
+    """Espera a que haya filas en la tabla de resultados y ADF esté sincronizado"""
+    return wait_until(
+        driver,
+        lambda d: d.find_elements(By.CSS_SELECTOR, "tr.af_table_data-row") and adf_synchronized(d),
+        site, timeout,
+    )
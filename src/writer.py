@@ -2,28 +2,291 @@
 Writer process: consumes messages from a multiprocessing.Queue and writes CSVs safely.
 Messages:
  - {'type':'asignatura', 'info': {...}, 'output_dir': 'Data/Facultad_X', 'omit_existing': bool}
+ - {'type':'batch', 'messages': [asignatura messages]} (src/ipc.py)
+   asignatura and batch messages may carry 'ack': (slot, batch_id); once they
+   are journaled the writer puts batch_id on ack_queues[slot], and only then
+   does the worker record those subjects as done
  - {'type':'flush'} -> force write
- - {'type':'shutdown'} -> write remaining and exit
+ - {'type':'shutdown'} -> write remaining, compact files and exit
+
+Group commit: subjects are accumulated and the four tables are written together
+once `group_size` subjects are pending or the oldest one has waited `group_ms`
+milliseconds. Every received subject is first appended to a write-ahead journal
+(one fsync per queue message); the journal is truncated after each commit and
+replayed when the writer starts, so a crash between receiving a subject and
+committing it loses nothing. A crash after the commit but before the truncate
+replays subjects already on disk; the dedup keys of the tables skip those rows.
+group_size=1 without journal is the old flush-per-subject behaviour.
+
+A failed journal append or table write stops the writer with a non-zero exit
+code (main.py aborts the run); the journal keeps what was not committed.
+Only an unreadable queue message is skipped.
+
+With backend='sqlite' rows go to src/sqlite_store.SqliteStore instead (one
+INSERT OR IGNORE batch per flush) and nothing is compacted.
+
+Rows are buffered per output_dir and flushed to that directory's files. CSV
+files are append-only during the run: each file keeps an in-memory index of its
+dedup keys and an open append handle, only new rows are appended (one write +
+fsync per flush) and the files are compacted (deduplicated and rewritten) only
+at shutdown.
 """
+import csv
+import io
+import json
 import multiprocessing
+import pickle
+import queue
 import time
-import pandas as pd
 import os
+import signal
 import tempfile
 
 PLACEHOLDER_PATTERNS = ["Selecciona qué quieres consultar"]
 
+DEFAULT_GROUP_SIZE = 25
+DEFAULT_GROUP_MS = 1000
+DEFAULT_WRITER_JOURNAL = os.path.join('Data', '.writer-journal.jsonl')
+
+# Columns and dedup key columns of each table (key None -> no dedup). Every table
+# has a key so that replaying the journal after a crash between a commit and the
+# journal truncate does not append the same rows twice.
+TABLES = {
+    'Asignaturas': (
+        ['Codigo de asignatura', 'Nombre de asignatura', 'Numero de creditos'],
+        ['Codigo de asignatura'],
+    ),
+    'AsignaturasCarrera': (
+        ['Codigo de asignatura', 'Nombre de asignatura', 'Carrera', 'Tipologia de asignatura'],
+        ['Codigo de asignatura', 'Nombre de asignatura', 'Carrera', 'Tipologia de asignatura'],
+    ),
+    'Horarios': (
+        ['Codigo de asignatura', 'Nombre de asignatura', 'Grupo', 'Profesor', 'Dia', 'Hora inicio', 'Hora fin', 'Salon'],
+        ['Codigo de asignatura', 'Grupo', 'Dia', 'Hora inicio', 'Hora fin'],
+    ),
+    'Prerrequisitos': (
+        ['Codigo asignatura', 'Nombre asignatura', 'Carrera', 'Prerrequisito', 'Grupo prerrequisito'],
+        ['Codigo asignatura', 'Carrera', 'Prerrequisito'],
+    ),
+}
+
+
+class AppendOnlyCsv:
+    """
+    Append-only CSV file with an in-memory index of its dedup keys.
+    The existing file is read once (lazily) to build the index; afterwards each
+    append writes only the rows whose key was not seen yet.
+    """
+
+    def __init__(self, path: str, columns, key_columns=None):
+        self.path = path
+        self.columns = list(columns)
+        self.key_columns = key_columns
+        self.index = set()
+        self.loaded = False
+        # append handle kept open between flushes (closed before compacting)
+        self.handle = None
+
+    def _key(self, row: dict):
+        return tuple('' if row.get(c) is None else str(row.get(c)) for c in self.key_columns)
+
+    def _read_rows(self):
+        with open(self.path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+            header = reader.fieldnames or []
+        return header, rows
+
+    def load(self):
+        """Builds the key index from the existing file and repairs a torn last line"""
+        self.loaded = True
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        # A crash in the middle of a write can leave a partial last row: truncate it
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+        header, rows = self._read_rows()
+        missing = [c for c in self.columns if c not in header] if header else []
+        if missing:
+            # File written with an older layout (e.g. Prerrequisitos without its group column):
+            # rewrite it once with the new header, leaving the new columns empty
+            header = self.columns + [c for c in header if c not in self.columns]
+            self._write_atomic(header, rows)
+            print(f"[writer] {self.path} migrado: columnas nuevas {missing}")
+        if header:
+            self.columns = header
+        if self.key_columns:
+            for row in rows:
+                self.index.add(self._key(row))
+
+    def append(self, rows) -> int:
+        """Appends the rows not already present; returns how many were written"""
+        if not self.loaded:
+            self.load()
+        new_rows = []
+        new_keys = set()
+        for row in rows:
+            if self.key_columns:
+                key = self._key(row)
+                if key in self.index or key in new_keys:
+                    continue
+                new_keys.add(key)
+            new_rows.append(row)
+        if not new_rows:
+            return 0
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=self.columns, extrasaction='ignore', lineterminator='\n')
+        if self.handle is None:
+            self.handle = open(self.path, 'a', newline='', encoding='utf-8')
+        size = self.handle.tell()
+        if size == 0:
+            writer.writeheader()
+        writer.writerows(new_rows)
+        try:
+            self.handle.write(buf.getvalue())
+            self.handle.flush()
+            os.fsync(self.handle.fileno())
+        except Exception:
+            # Drop whatever part of the write reached the file; the keys stay out of
+            # the index so that a retry (or the writer journal replay) writes them again
+            self.close()
+            try:
+                os.truncate(self.path, size)
+            except OSError:
+                pass
+            raise
+        # Only rows that are on disk count as present
+        self.index.update(new_keys)
+        return len(new_rows)
+
+    def close(self):
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+    def compact(self):
+        """Rewrites the file atomically keeping the first row of each key; returns True if rewritten"""
+        self.close()
+        if not self.key_columns or not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return False
+        header, rows = self._read_rows()
+        if self.key_columns:
+            seen = set()
+            unique = []
+            for row in rows:
+                key = self._key(row)
+                if key not in seen:
+                    seen.add(key)
+                    unique.append(row)
+            rows = unique
+        self._write_atomic(header or self.columns, rows)
+        return True
+
+    def _write_atomic(self, header, rows):
+        """Rewrites the whole file through a temp file + os.replace"""
+        tmp = tempfile.NamedTemporaryFile('w', delete=False, dir=os.path.dirname(self.path) or '.',
+                                          suffix='.csv', newline='', encoding='utf-8')
+        try:
+            writer = csv.DictWriter(tmp, fieldnames=header, extrasaction='ignore', lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(rows)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+            tmp.close()
+            os.replace(tmp.name, self.path)
+        finally:
+            try:
+                if os.path.exists(tmp.name):
+                    os.remove(tmp.name)
+            except Exception:
+                pass
+
+
+class WriterJournal:
+    """
+    Write-ahead journal of the subjects received but not yet committed: one JSON
+    line per subject with its output_dir and info.
+    """
+
+    def __init__(self, path: str = DEFAULT_WRITER_JOURNAL):
+        self.path = path
+        self.fd = None
+
+    def _open(self):
+        if self.fd is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def append(self, entries):
+        """Appends (output_dir, info) entries with a single write + fsync"""
+        if not entries:
+            return
+        self._open()
+        data = ''.join(json.dumps({'output_dir': out, 'info': info}, ensure_ascii=False, default=str) + '\n'
+                       for out, info in entries)
+        os.write(self.fd, data.encode('utf-8'))
+        os.fsync(self.fd)
+
+    def read(self):
+        """Entries left by a previous run (a torn last line is ignored)"""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                entries.append((record.get('output_dir') or 'Data', record.get('info') or {}))
+        return entries
+
+    def truncate(self):
+        """Called once the pending subjects are committed"""
+        self._open()
+        os.ftruncate(self.fd, 0)
+        os.fsync(self.fd)
+
+    def close(self, remove=False):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+BACKENDS = ('csv', 'sqlite')
+
+
 class CentralWriter:
-    def __init__(self, queue: multiprocessing.Queue, flush_interval=5):
+    def __init__(self, queue: multiprocessing.Queue, flush_interval=5, backend='csv', db_path=None,
+                 group_size=1, group_ms=0, journal_path=None, ack_queues=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend} (options: {BACKENDS})")
         self.queue = queue
         self.flush_interval = flush_interval
         self.running = True
-        # in-memory stores
-        self.asignaturas = []
-        self.asignaturas_carrera = []
-        self.horarios = []
-        self.prerrequisitos = []
+        self.backend = backend
+        # sqlite backend: one database for every output_dir
+        self.store = None
+        if backend == 'sqlite':
+            from src.sqlite_store import SqliteStore
+            self.store = SqliteStore(db_path or os.path.join('Data', 'sia.db'))
+        # in-memory rows by output_dir, then by table name
+        self.buffers = {}
+        # append-only files by path (each keeps its own dedup index and open handle)
+        self.tables = {}
         self.last_flush = time.time()
+        # group commit: (output_dir, info) received but not yet written
+        self.group_size = max(1, int(group_size))
+        self.group_ms = max(0, group_ms)
+        self.pending = []
+        self.pending_since = None
+        self.journal = WriterJournal(journal_path) if journal_path else None
+        # one queue per worker for the acks of its batches (src/ipc.py)
+        self.ack_queues = list(ack_queues or [])
 
     def _is_placeholder(self, text: str) -> bool:
         if not text:
@@ -33,21 +296,30 @@ class CentralWriter:
                 return True
         return False
 
-    def _ingest_asignatura(self, info: dict):
+    def _buffers(self, output_dir: str) -> dict:
+        output_dir = output_dir if output_dir and output_dir != '.' else 'Data'
+        buffers = self.buffers.get(output_dir)
+        if buffers is None:
+            buffers = {name: [] for name in TABLES}
+            self.buffers[output_dir] = buffers
+        return buffers
+
+    def _ingest_asignatura(self, info: dict, output_dir='Data'):
         # filter placeholder names or codes
         codigo = info.get('codigo', '')
         nombre = info.get('nombre', '')
         if self._is_placeholder(codigo) or self._is_placeholder(nombre):
             print(f"[writer] Omitiendo asignatura placeholder: {codigo} - {nombre}")
             return
+        buffers = self._buffers(output_dir)
         # Asignaturas
-        self.asignaturas.append({
+        buffers['Asignaturas'].append({
             'Codigo de asignatura': codigo,
             'Nombre de asignatura': nombre,
             'Numero de creditos': info.get('creditos', '')
         })
         # AsignaturasCarrera
-        self.asignaturas_carrera.append({
+        buffers['AsignaturasCarrera'].append({
             'Codigo de asignatura': codigo,
             'Nombre de asignatura': nombre,
             'Carrera': info.get('carrera', ''),
@@ -59,7 +331,7 @@ class CentralWriter:
                 dia = horario.get('dia', '')
                 if not dia:
                     continue
-                self.horarios.append({
+                buffers['Horarios'].append({
                     'Codigo de asignatura': codigo,
                     'Nombre de asignatura': nombre,
                     'Grupo': grupo.get('numero_grupo', ''),
@@ -70,110 +342,171 @@ class CentralWriter:
                     'Salon': horario.get('salon', '')
                 })
         # Prerrequisitos
-        for pr in info.get('prerrequisitos', []):
-            self.prerrequisitos.append(pr)
+        buffers['Prerrequisitos'].extend(info.get('prerrequisitos', []))
 
-    def _atomic_write(self, df: pd.DataFrame, path: str):
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        tmp = tempfile.NamedTemporaryFile(delete=False, dir=os.path.dirname(path), suffix='.csv')
-        try:
-            df.to_csv(tmp.name, index=False)
-            tmp.close()
-            os.replace(tmp.name, path)
-        finally:
+    def _table(self, output_dir: str, name: str) -> AppendOnlyCsv:
+        path = os.path.join(output_dir, f'{name}.csv')
+        table = self.tables.get(path)
+        if table is None:
+            columns, key_columns = TABLES[name]
+            table = AppendOnlyCsv(path, columns, key_columns)
+            self.tables[path] = table
+        return table
+
+    def flush(self, output_dir=None):
+        """
+        Appends the new rows buffered for output_dir (csv) or inserts them (sqlite);
+        every output_dir with buffered rows when output_dir is None. Returns False on error.
+        """
+        if output_dir is None:
+            output_dirs = list(self.buffers)
+        else:
+            output_dirs = [output_dir if output_dir != '.' else 'Data']
+        ok = True
+        for out in output_dirs:
+            ok = self._flush_dir(out) and ok
+        if self.store is not None:
+            # one transaction for every output_dir
             try:
-                if os.path.exists(tmp.name):
-                    os.remove(tmp.name)
-            except Exception:
-                pass
+                self.store.commit()
+            except Exception as e:
+                print(f"[writer] Error al flush: {e}")
+                ok = False
+        return ok
 
-    def flush(self, output_dir='Data'):
-        # dedupe and write
+    def _flush_dir(self, output_dir: str) -> bool:
+        buffers = self.buffers.get(output_dir)
+        if not buffers or not any(buffers.values()):
+            return True
         try:
-            output_dir = output_dir if output_dir and output_dir != '.' else 'Data'
-            os.makedirs(output_dir, exist_ok=True)
-            if self.asignaturas:
-                df = pd.DataFrame(self.asignaturas)
-                if 'Codigo de asignatura' in df.columns:
-                    df.drop_duplicates(subset=['Codigo de asignatura'], inplace=True)
-                path = os.path.join(output_dir, 'Asignaturas.csv')
-                if os.path.exists(path):
-                    existing = pd.read_csv(path, dtype=str)
-                    combined = pd.concat([existing, df], ignore_index=True)
-                    if 'Codigo de asignatura' in combined.columns:
-                        combined.drop_duplicates(subset=['Codigo de asignatura'], inplace=True)
-                    self._atomic_write(combined, path)
-                else:
-                    self._atomic_write(df, path)
-                print(f"[writer] Asignaturas.csv actualizado ({len(df)} nuevas)")
-                self.asignaturas.clear()
-
-            if self.asignaturas_carrera:
-                df = pd.DataFrame(self.asignaturas_carrera)
-                path = os.path.join(output_dir, 'AsignaturasCarrera.csv')
-                if os.path.exists(path):
-                    existing = pd.read_csv(path)
-                    combined = pd.concat([existing, df], ignore_index=True)
-                    self._atomic_write(combined, path)
-                else:
-                    self._atomic_write(df, path)
-                print(f"[writer] AsignaturasCarrera.csv actualizado ({len(df)} nuevas)")
-                self.asignaturas_carrera.clear()
-
-            if self.horarios:
-                df = pd.DataFrame(self.horarios)
-                path = os.path.join(output_dir, 'Horarios.csv')
-                if os.path.exists(path):
-                    existing = pd.read_csv(path, dtype=str)
-                    combined = pd.concat([existing, df], ignore_index=True)
-                    cols = ['Codigo de asignatura', 'Grupo', 'Dia', 'Hora inicio', 'Hora fin']
-                    available = [c for c in cols if c in combined.columns]
-                    if available:
-                        combined.drop_duplicates(subset=available, inplace=True)
-                    self._atomic_write(combined, path)
-                else:
-                    self._atomic_write(df, path)
-                print(f"[writer] Horarios.csv actualizado ({len(df)} nuevas)")
-                self.horarios.clear()
-
-            if self.prerrequisitos:
-                df = pd.DataFrame(self.prerrequisitos)
-                path = os.path.join(output_dir, 'Prerrequisitos.csv')
-                if os.path.exists(path):
-                    existing = pd.read_csv(path)
-                    combined = pd.concat([existing, df], ignore_index=True)
-                    combined.drop_duplicates(subset=['Codigo asignatura', 'Carrera', 'Prerrequisito'], inplace=True)
-                    self._atomic_write(combined, path)
+            if self.store is None:
+                os.makedirs(output_dir, exist_ok=True)
+            for name, buffer in buffers.items():
+                if not buffer:
+                    continue
+                if self.store is not None:
+                    written = self.store.insert_rows(output_dir, name, buffer)
+                    print(f"[writer] {name} ({output_dir}) actualizado en SQLite ({written} nuevas)")
                 else:
-                    self._atomic_write(df, path)
-                print(f"[writer] Prerrequisitos.csv actualizado ({len(df)} nuevas)")
-                self.prerrequisitos.clear()
+                    written = self._table(output_dir, name).append(buffer)
+                    print(f"[writer] {output_dir}/{name}.csv actualizado ({written} nuevas)")
+                buffer.clear()
+            return True
         except Exception as e:
-            print(f"[writer] Error al flush: {e}")
+            print(f"[writer] Error al flush de {output_dir}: {e}")
+            return False
+
+    def close(self):
+        """Compacts the CSV files, or closes the SQLite database"""
+        if self.store is not None:
+            self.store.close()
+        else:
+            self.compact()
+
+    def compact(self):
+        """Deduplicates and rewrites every file touched during the run"""
+        for path, table in self.tables.items():
+            try:
+                if table.compact():
+                    print(f"[writer] {path} compactado")
+            except Exception as e:
+                print(f"[writer] Error compactando {path}: {e}")
+
+    def _receive(self, entries):
+        # journal first, then queue for the next group commit
+        if not entries:
+            return
+        if self.journal is not None:
+            self.journal.append(entries)
+        self.pending.extend(entries)
+        if self.pending_since is None:
+            self.pending_since = time.monotonic()
+        if len(self.pending) >= self.group_size:
+            self.commit()
+
+    def _commit_due(self) -> bool:
+        return bool(self.pending) and (time.monotonic() - self.pending_since) * 1000 >= self.group_ms
+
+    def _time_to_commit(self) -> float:
+        """Seconds the run loop may block on the queue before the pending group is due"""
+        if not self.pending:
+            return self.flush_interval
+        remaining = self.group_ms / 1000 - (time.monotonic() - self.pending_since)
+        return max(0.0, min(self.flush_interval, remaining))
+
+    def commit(self) -> bool:
+        """Writes every pending subject and truncates the journal; raises OSError if a write failed"""
+        if not self.pending:
+            return True
+        entries, self.pending, self.pending_since = self.pending, [], None
+        for out, info in entries:
+            self._ingest_asignatura(info, out)
+        if not self.flush():
+            raise OSError(f"could not write {len(entries)} subjects; they stay in the journal")
+        if self.journal is not None:
+            self.journal.truncate()
+        return True
+
+    def replay(self):
+        """Commits the subjects a previous writer journaled but did not commit"""
+        if self.journal is None:
+            return
+        entries = self.journal.read()
+        if entries:
+            print(f"[writer] Recuperando {len(entries)} asignaturas del journal {self.journal.path}")
+            self.pending.extend(entries)
+            self.pending_since = time.monotonic()
+            self.commit()
+
+    def _ack(self, msg: dict):
+        # the subjects of msg are journaled: the worker may record them as done
+        ack = msg.get('ack')
+        if ack is None or not self.ack_queues:
+            return
+        slot, batch_id = ack
+        self.ack_queues[slot].put(batch_id)
+
+    def handle(self, msg: dict):
+        t = msg.get('type')
+        if t == 'asignatura':
+            self._receive([(msg.get('output_dir') or 'Data', msg.get('info'))])
+            self._ack(msg)
+        elif t == 'batch':
+            # several subjects sent together by a worker's BatchingSender (src/ipc.py)
+            self._receive([(m.get('output_dir') or 'Data', m.get('info')) for m in msg.get('messages') or []])
+            self._ack(msg)
+        elif t == 'flush':
+            self.commit()
+            self.flush(msg.get('output_dir'))
+        elif t == 'shutdown':
+            print('[writer] Shutdown received; flushing and exiting')
+            self.commit()
+            self.flush()
+            self.close()
+            if self.journal is not None:
+                self.journal.close(remove=True)
+            self.running = False
 
     def run(self):
         print('[writer] Writer iniciado')
+        self.replay()
         while self.running:
             try:
                 try:
-                    msg = self.queue.get(timeout=self.flush_interval)
-                except Exception:
+                    msg = self.queue.get(timeout=self._time_to_commit())
+                except queue.Empty:
                     msg = None
+                except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+                    print(f"[writer] Mensaje ilegible omitido: {e}")
+                    continue
+                if msg is not None and not isinstance(msg, dict):
+                    print(f"[writer] Mensaje desconocido omitido: {type(msg).__name__}")
+                    continue
                 if msg:
-                    t = msg.get('type')
-                    if t == 'asignatura':
-                        info = msg.get('info')
-                        out = msg.get('output_dir') or 'Data'
-                        self._ingest_asignatura(info)
-                        # flush per-message to minimize data loss
-                        self.flush(output_dir=out)
-                    elif t == 'flush':
-                        self.flush(msg.get('output_dir', 'Data'))
-                    elif t == 'shutdown':
-                        print('[writer] Shutdown received; flushing and exiting')
-                        self.flush(msg.get('output_dir', 'Data'))
-                        self.running = False
-                else:
+                    self.handle(msg)
+                if self._commit_due():
+                    self.commit()
+                if not msg:
                     # periodic flush
                     if time.time() - self.last_flush > self.flush_interval:
                         self.flush()
@@ -181,12 +514,23 @@ class CentralWriter:
             except KeyboardInterrupt:
                 break
             except Exception as e:
-                print(f"[writer] Error en loop: {e}")
+                # journal or table write failed: stop, exit non-zero and let the journal be replayed
+                print(f"[writer] Error fatal, el writer se detiene: {e}")
+                raise
         print('[writer] Writer terminado')
 
 
-def start_writer(queue: multiprocessing.Queue):
-    writer = CentralWriter(queue)
+def start_writer(queue: multiprocessing.Queue, backend='csv', db_path=None,
+                 group_size=DEFAULT_GROUP_SIZE, group_ms=DEFAULT_GROUP_MS, journal_path=DEFAULT_WRITER_JOURNAL,
+                 ack_queues=None):
+    # Ctrl+C reaches the whole process group: the writer keeps draining the batches the
+    # workers flush on their way out and stops on the 'shutdown' main.py sends after them
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for q in ack_queues or []:
+        # a worker that died never reads its acks: do not wait for them on exit
+        q.cancel_join_thread()
+    writer = CentralWriter(queue, backend=backend, db_path=db_path, group_size=group_size, group_ms=group_ms,
+                           journal_path=journal_path, ack_queues=ack_queues)
     writer.run()
 
 
@@ -0,0 +1,81 @@
+import itertools
+import unittest
+
+from src.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError('chrome not reachable')
+        return 1
+
+
+class FakeExtractor:
+    """Stands for an AsignaturaExtractor: a driver that answers until it is killed"""
+    ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(self.ids)
+        self.driver = FakeDriver()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class DriverPoolRefillTest(unittest.TestCase):
+    def setUp(self):
+        self.creadas = []
+
+        def factory():
+            extractor = FakeExtractor()
+            self.creadas.append(extractor)
+            return extractor
+        self.pool = DriverPool(factory, size=1, max_pages=2, max_rss_mb=0)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def spare(self):
+        # wait for the background refill started by the last acquire
+        if self.pool.refill_thread is not None:
+            self.pool.refill_thread.join(timeout=5)
+        return list(self.pool.idle)
+
+    def test_spare_is_refilled_after_every_acquire(self):
+        self.pool.warm()
+        primera = self.pool.ensure(None)
+        self.assertIs(primera, self.creadas[0])
+        self.assertEqual(self.spare(), [self.creadas[1]])
+
+        # recycled after max_pages: the warm spare takes over and a new one is made
+        self.pool.ensure(primera)
+        segunda = self.pool.ensure(primera)
+        self.assertIs(segunda, self.creadas[1])
+        self.assertTrue(primera.closed)
+        self.assertEqual(self.spare(), [self.creadas[2]])
+
+    def test_dead_session_is_replaced_by_the_spare(self):
+        self.pool.warm()
+        sesion = self.pool.ensure(None, count=False)
+        self.spare()
+        sesion.driver.alive = False
+        nueva = self.pool.ensure(sesion, count=False)
+        self.assertIs(nueva, self.creadas[1])
+        self.assertEqual(self.pool.stats['caidas'], 1)
+        self.assertEqual(self.spare(), [self.creadas[2]])
+
+    def test_close_discards_every_session(self):
+        self.pool.warm()
+        self.pool.ensure(None)
+        self.pool.close()
+        self.assertTrue(all(e.closed for e in self.creadas))
+        self.assertEqual(self.pool.idle, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import json
+import os
+import pathlib
+import unittest
+
+from src.parser import parse_asignatura_html, parse_asignatura_tree, parse_html, parse_resultados, \
+    prerrequisitos_from_textos
+
+# Saved pages of the local catalogue (src/standin.py, seed 2024), career
+# "3512 CIENCIA POLÍTICA", "TODAS MENOS LIBRE ELECCIÓN": three detail pages with
+# every group expanded (render_detalle_page, as `python -m src.standin --dump`
+# writes them) and the results table after Mostrar. esperado.json holds the
+# catalogue data behind them (the salon as the page spells it, "26 - 119"),
+# not parser output.
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+DETALLES = ['1000001-M', '3000011', '3000133']
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def esperado():
+    return json.loads(fixture('esperado.json'))
+
+
+class ParseAsignaturaTest(unittest.TestCase):
+    def test_detail_pages_match_the_catalogue(self):
+        for codigo in DETALLES:
+            with self.subTest(codigo=codigo):
+                info = parse_asignatura_tree(parse_html(fixture(f'detalle_{codigo}.html')))
+                self.assertEqual(info, esperado()['detalle'][codigo])
+
+    def test_omitir_horarios_keeps_everything_but_the_groups(self):
+        info = parse_asignatura_html(fixture('detalle_3000011.html'), omitir_horarios=True)
+        completo = esperado()['detalle']['3000011']
+        self.assertEqual(info['grupos'], [])
+        self.assertEqual(info['prerrequisitos'], completo['prerrequisitos'])
+        self.assertEqual(info['codigo'], '3000011')
+
+    def test_date_rows_are_not_schedules(self):
+        # every schedule row of the stand-in is followed by a dd/mm/yyyy row
+        info = parse_asignatura_html(fixture('detalle_1000001-M.html'))
+        for grupo in info['grupos']:
+            for horario in grupo['horarios']:
+                self.assertNotIn('/', horario['dia'])
+
+
+class ParseResultadosTest(unittest.TestCase):
+    def test_results_table_rows(self):
+        filas = parse_resultados(parse_html(fixture('resultados_3512.html')))
+        self.assertEqual(filas, esperado()['resultados'])
+        self.assertTrue(any(f['sin_programar'] for f in filas))
+
+    def test_page_without_table(self):
+        self.assertEqual(parse_resultados(parse_html(fixture('detalle_3000133.html'))), [])
+
+
+class PrerrequisitosFromTextosTest(unittest.TestCase):
+    info = {'codigo': '3000011', 'nombre': 'FÍSICA I', 'carrera': '3512 CIENCIA POLÍTICA'}
+
+    def test_panels_are_numbered(self):
+        paneles = [
+            ['1000001-M', 'CÁLCULO BÁSICO', '1000002', 'ÁLGEBRA BÁSICO'],
+            ['1000003', 'FÍSICA BÁSICO'],
+        ]
+        filas = prerrequisitos_from_textos(paneles, self.info)
+        self.assertEqual([(f['Prerrequisito'], f['Grupo prerrequisito']) for f in filas], [
+            ('1000001-M CÁLCULO BÁSICO', '1'),
+            ('1000002 ÁLGEBRA BÁSICO', '1'),
+            ('1000003 FÍSICA BÁSICO', '2'),
+        ])
+        self.assertTrue(all(f['Codigo asignatura'] == '3000011' for f in filas))
+
+    def test_empty_panels_do_not_take_a_group_number(self):
+        paneles = [['Todas las asignaturas'], ['1000002', 'ÁLGEBRA BÁSICO']]
+        filas = prerrequisitos_from_textos(paneles, self.info)
+        self.assertEqual([f['Grupo prerrequisito'] for f in filas], ['1'])
+
+    def test_code_without_name_is_skipped(self):
+        filas = prerrequisitos_from_textos([['1000002', '', '1000003', 'FÍSICA BÁSICO']], self.info)
+        self.assertEqual([f['Prerrequisito'] for f in filas], ['1000003 FÍSICA BÁSICO'])
+
+    def test_texts_that_are_not_codes_are_ignored(self):
+        filas = prerrequisitos_from_textos([['Al menos 1 de las asignaturas', '1000002', 'ÁLGEBRA BÁSICO']], self.info)
+        self.assertEqual([f['Prerrequisito'] for f in filas], ['1000002 ÁLGEBRA BÁSICO'])
+        self.assertNotIn('Condicion prerrequisito', filas[0])
+
+
+class ParseModesTest(unittest.TestCase):
+    """driver, html and js modes of AsignaturasScraper on the same saved pages (needs Chrome)"""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            from selenium import webdriver
+            from src.browser_profiles import chrome_options
+            cls.driver = webdriver.Chrome(options=chrome_options('default', True))
+        except Exception as e:
+            raise unittest.SkipTest(f'Chrome no disponible: {e}')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.driver.quit()
+
+    def test_modes_return_the_same_info(self):
+        from src.scraper import AsignaturasScraper
+        for codigo in DETALLES:
+            self.driver.get(pathlib.Path(FIXTURES, f'detalle_{codigo}.html').as_uri())
+            por_modo = {modo: AsignaturasScraper(parse_mode=modo).extract_asignatura_info_from_driver(self.driver)
+                        for modo in ('driver', 'html', 'js')}
+            with self.subTest(codigo=codigo):
+                self.assertEqual(por_modo['html'], por_modo['driver'])
+                self.assertEqual(por_modo['js'], por_modo['driver'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import queue
+import shutil
+import tempfile
+import unittest
+
+from src.ipc import BatchingSender
+from src.scraper import CodigoIndex, deliver_asignatura_info
+from src.writer import CentralWriter
+import src.scraper as scraper
+
+
+def asignatura(codigo, grupos=True):
+    return {
+        'codigo': codigo, 'nombre': f'ASIGNATURA {codigo}', 'creditos': 3,
+        'carrera': '3515 INGENIERÍA CIVIL', 'tipologia': 'DISCIPLINAR OBLIGATORIA',
+        'grupos': [{'numero_grupo': '1', 'profesor': 'PROFESOR',
+                    'horarios': [{'dia': 'LUNES', 'hora_inicio': '07:00', 'hora_fin': '09:00', 'salon': 'M8-101'}]}]
+        if grupos else [],
+        'prerrequisitos': [],
+    }
+
+
+class CodigoIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.out = os.path.join(self.root, 'Facultad_Minas')
+        self.journal = os.path.join(self.root, '.writer-journal.jsonl')
+        self.index = scraper.CODIGO_INDEX
+        scraper.CODIGO_INDEX = CodigoIndex()
+
+    def tearDown(self):
+        scraper.CODIGO_INDEX = self.index
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def write(self, *infos):
+        writer = CentralWriter(None, journal_path=self.journal)
+        writer._receive([(self.out, info) for info in infos])
+        writer.commit()
+        writer.close()
+        writer.journal.close(remove=True)
+
+    def test_subject_without_schedules_on_disk_is_not_skipped(self):
+        # 3007001 was stored without its groups (another bot had claimed them)
+        self.write(asignatura('3007001', grupos=False), asignatura('3007002'))
+        index = CodigoIndex()
+        self.assertFalse(index.contains(self.out, '3007001'))
+        self.assertTrue(index.contains(self.out, '3007002'))
+
+    def test_index_is_updated_on_the_writer_ack(self):
+        writer_queue, acks = queue.Queue(), queue.Queue()
+        writer = CentralWriter(writer_queue, group_size=100, journal_path=self.journal, ack_queues=[acks])
+        sender = BatchingSender(writer_queue, batch_size=2, put_timeout=1).with_acks(acks, 0)
+        deliver_asignatura_info(asignatura('3007002'), self.out, sender)
+        deliver_asignatura_info(asignatura('3007003', grupos=False), self.out, sender)
+        # the batch is in the writer's queue but not journaled yet
+        self.assertFalse(scraper.CODIGO_INDEX.contains(self.out, '3007002'))
+        writer.handle(writer_queue.get_nowait())
+        sender.flush()
+        self.assertTrue(scraper.CODIGO_INDEX.contains(self.out, '3007002'))
+        self.assertFalse(scraper.CODIGO_INDEX.contains(self.out, '3007003'))
+        writer.journal.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import csv
+import os
+import queue
+import shutil
+import tempfile
+import unittest
+
+from src.ipc import BatchingSender, after_delivery
+from src.writer import TABLES, CentralWriter
+
+
+class Crash(Exception):
+    """Stands for the writer process dying at a given point"""
+
+
+def asignatura(codigo, carrera='3515 INGENIERÍA CIVIL'):
+    return {
+        'codigo': codigo,
+        'nombre': f'ASIGNATURA {codigo}',
+        'creditos': 3,
+        'carrera': carrera,
+        'tipologia': 'DISCIPLINAR OBLIGATORIA',
+        'grupos': [{'numero_grupo': '1', 'profesor': 'PROFESOR',
+                    'horarios': [{'dia': 'LUNES', 'hora_inicio': '07:00', 'hora_fin': '09:00', 'salon': 'M8-101'}]}],
+        'prerrequisitos': [{'Codigo asignatura': codigo, 'Nombre asignatura': f'ASIGNATURA {codigo}',
+                            'Carrera': carrera, 'Prerrequisito': '1000001 CÁLCULO', 'Grupo prerrequisito': '1'}],
+    }
+
+
+class WriterJournalReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.out = os.path.join(self.root, 'Facultad_Minas')
+        self.journal = os.path.join(self.root, '.writer-journal.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def rows(self, name):
+        with open(os.path.join(self.out, f'{name}.csv'), newline='', encoding='utf-8') as f:
+            return [tuple(row) for row in csv.reader(f)][1:]
+
+    def test_replay_after_crash_between_flush_and_truncate_writes_no_duplicates(self):
+        writer = CentralWriter(None, group_size=2, journal_path=self.journal)
+
+        def crash():
+            raise Crash()
+        writer.journal.truncate = crash
+        writer._receive([(self.out, asignatura('3007001'))])
+        with self.assertRaises(Crash):
+            writer._receive([(self.out, asignatura('3007002'))])
+        # the rows are on disk but the journal still holds both subjects
+        antes = {name: self.rows(name) for name in TABLES}
+        self.assertEqual(len(antes['AsignaturasCarrera']), 2)
+        # the process dies: no shutdown, so no compaction
+        for table in writer.tables.values():
+            table.close()
+        writer.journal.close()
+
+        restarted = CentralWriter(None, group_size=2, journal_path=self.journal)
+        restarted.replay()
+
+        for name in TABLES:
+            rows = self.rows(name)
+            self.assertEqual(rows, antes[name], name)
+            self.assertEqual(len(rows), len(set(rows)), name)
+        self.assertEqual(restarted.journal.read(), [])
+
+
+class WriterAckTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.out = os.path.join(self.root, 'Facultad_Minas')
+        self.writer_queue = queue.Queue()
+        self.acks = queue.Queue()
+        self.writer = CentralWriter(self.writer_queue, group_size=100,
+                                    journal_path=os.path.join(self.root, '.writer-journal.jsonl'),
+                                    ack_queues=[self.acks])
+        self.sender = BatchingSender(self.writer_queue, batch_size=2, put_timeout=1).with_acks(self.acks, 0)
+
+    def tearDown(self):
+        self.writer.journal.close()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def deliver(self, codigo, hechas):
+        self.sender.put({'type': 'asignatura', 'info': asignatura(codigo), 'output_dir': self.out})
+        after_delivery(self.sender, lambda: hechas.append(codigo))
+
+    def test_subjects_are_done_only_after_the_writer_journals_their_batch(self):
+        hechas = []
+        self.deliver('3007001', hechas)
+        self.deliver('3007002', hechas)
+        # the batch is in the writer's queue, not yet journaled
+        self.assertEqual(hechas, [])
+        self.writer.handle(self.writer_queue.get_nowait())
+        self.assertEqual(len(self.writer.journal.read()), 2)
+        self.sender.flush()
+        self.assertEqual(hechas, ['3007001', '3007002'])
+
+    def test_batch_lost_by_the_writer_is_never_done(self):
+        hechas = []
+        self.deliver('3007001', hechas)
+        self.deliver('3007002', hechas)
+        self.writer_queue.get_nowait()  # the writer dies with the batch in its pipe
+        with self.assertRaises(TimeoutError):
+            self.sender.flush()
+        self.assertEqual(hechas, [])
+
+    def test_failed_table_write_raises_and_keeps_the_journal(self):
+        self.writer._flush_dir = lambda output_dir: False
+        self.writer.handle({'type': 'asignatura', 'info': asignatura('3007001'), 'output_dir': self.out})
+        with self.assertRaises(OSError):
+            self.writer.commit()
+        self.assertEqual(len(self.writer.journal.read()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()